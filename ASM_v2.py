@@ -22,6 +22,9 @@ def reg_val(r):
         raise ValueError(f"Registro fuera de rango (0-15): {r}")
     return val
 
+# Whole-file scanner: same tokens as TOKEN_SPEC plus explicit line breaks
+FILE_TOKEN_SPEC = {"NEWLINE": r"\r\n|\r|\n", **TOKEN_SPEC, "SPACE": r"[^\S\r\n]+"}
+
 def imm_val(s, m=255):
     val = int(s[1:], 0)
     if not (0 <= val <= m):
@@ -32,6 +35,8 @@ class ARM_Assembler:
     def __init__(self):
         pattern = "|".join(f"(?P<{name}>{regex})" for name, regex in TOKEN_SPEC.items())
         self.regex = re.compile(pattern, re.IGNORECASE)
+        pattern = "|".join(f"(?P<{name}>{regex})" for name, regex in FILE_TOKEN_SPEC.items())
+        self.file_regex = re.compile(pattern, re.IGNORECASE)
 
         #################################
         #                               #
@@ -87,6 +92,7 @@ class ARM_Assembler:
         }
 
         self.labels = {}
+        self.cache = None   # optional asm_cache.AssemblyCache
         self.valid_ops = (
             list(self.dp_instr.keys())
             + list(self.mem_instr.keys())
@@ -94,6 +100,17 @@ class ARM_Assembler:
             + list(self.spc_instr.keys())
         )
 
+        # Mnemonic index: every legal spelling (op x cond x S) -> (op, cond, S),
+        # filtered through the suffix scan so it accepts exactly what it accepted
+        valid = set(self.valid_ops)
+        self.mnemonics = {}
+        for op in self.valid_ops:
+            for suffix in [""] + list(self.conds):
+                for s in ("", "S"):
+                    decoded = self._scan_mnemonic(op + suffix + s)
+                    if decoded[0] in valid:
+                        self.mnemonics[op + suffix + s] = decoded
+
     # Only for tokenization purposes
     def tokenize_instruction(self, instr: str):
         tokens = []
@@ -105,14 +122,48 @@ class ARM_Assembler:
             if kind in ["SPACE", "COMMENT"]:
                 continue
 
-            if kind == "POINTER":
-                possible_instr, cond, S = self.decode_mnemonic(value)
-                if possible_instr in self.valid_ops and cond in self.conds:
-                    kind = "OP"
+            if kind == "POINTER" and value.upper() in self.mnemonics:
+                kind = "OP"
             tokens.append((kind, value))
         return tokens
 
+    # Tokenize the whole source with one regex pass, tracking line numbers
+    def scan_program(self, program: str):
+        """Yield (line_num, line, tokens) for every line that has tokens."""
+        mnemonics = self.mnemonics
+        line_num = 1
+        line_start = 0
+        tokens = []
+        for match in self.file_regex.finditer(program):
+            kind = match.lastgroup
+            if kind == "NEWLINE":
+                if tokens:
+                    line = program[line_start:match.start()].split('//', 1)[0].strip()
+                    yield line_num, line, tokens
+                    tokens = []
+                line_num += 1
+                line_start = match.end()
+                continue
+
+            # Filtrar espacios y comentarios
+            if kind == "SPACE" or kind == "COMMENT":
+                continue
+
+            value = match.group()
+            if kind == "POINTER" and value.upper() in mnemonics:
+                kind = "OP"
+            tokens.append((kind, value))
+
+        if tokens:
+            yield line_num, program[line_start:].split('//', 1)[0].strip(), tokens
+
     def decode_mnemonic(self, instr: str):
+        decoded = self.mnemonics.get(instr.upper())
+        if decoded is not None:
+            return decoded
+        return self._scan_mnemonic(instr)
+
+    def _scan_mnemonic(self, instr: str):
         instr = instr.upper()
         flags = instr.endswith("S")
         if flags:
@@ -319,21 +370,28 @@ class ARM_Assembler:
         
         raise RuntimeError(f"Instruction not implemented: {instr}")
 
+    def report_error(self, e, line_num, line):
+        # Override to keep going (e.g. batch mode raises instead of exiting)
+        print(f"\nERROR: {e}")
+        print(f"AT LINE: {line_num} | WITH: {line}")
+        print("FAILURE.")
+        sys.exit(1)
+
     def assemble_program(self, program: str) -> tuple[list[int], list[str]]:
-        lines = program.strip().splitlines()
-        lines = [(n+1, l) for n, l in enumerate(lines)]
-        lines = [(n, l.split('//', 1)[0].strip()) for n, l in lines]
-        lines = [(n, l) for n, l in lines if l != ""]
+        cache = self.cache
+        if cache is not None:
+            prog_key = cache.program_key(self, program)
+            hit = cache.get_program(prog_key)
+            if hit is not None:
+                result, extract, labels = hit
+                self.labels.update(labels)
+                return result, extract
 
         extract = []
         token_lines = []
         pc = 0  
         
-        for i, line in lines:
-            tokens = self.tokenize_instruction(line)
-            if not tokens:
-                continue
-
+        for i, line, tokens in self.scan_program(program.strip()):
             if tokens[0][0] == "LABEL":
                 label_name = tokens[0][1][:-1]
                 self.labels[label_name] = pc
@@ -348,8 +406,25 @@ class ARM_Assembler:
                 token_lines.append((i, pc, tokens))
                 pc += 1
 
+        # Label-free lines can reuse their cached encoding
+        keys = [None] * len(token_lines)
+        known = {}
+        new_lines = []
+        if cache is not None:
+            from asm_cache import label_free
+            for i, (_, _, tokens) in enumerate(token_lines):
+                if label_free(tokens):
+                    keys[i] = cache.line_key(tokens)
+            known = cache.get_lines(self, [k for k in keys if k is not None])
+
         result = []
         for i, (line_num, pc_val, tokens) in enumerate(token_lines):
+            key = keys[i]
+            if key in known:
+                instr_code = known[key]
+                if instr_code != -1:
+                    result.append(instr_code)
+                continue
             try:
                 # CHECK SYNTAX
                 kinds = [k for k, _ in tokens]
@@ -357,31 +432,138 @@ class ARM_Assembler:
                     raise RuntimeError("Bad instruction formation.")
                 
                 instr_code = self.assemble_instruction(tokens, pc_val)
+                if key is not None:
+                    new_lines.append((key, instr_code))
                 if instr_code == -1:
                     continue  # Skip empty lines
                 result.append(instr_code)
             except Exception as e:
-                print(f"\nERROR: {e}")
-                print(f"AT LINE: {line_num} | WITH: {extract[i]}")
-                print("FAILURE.")
-                sys.exit(1)
+                self.report_error(e, line_num, extract[i])
+
+        if cache is not None:
+            cache.put(self, prog_key, result, extract, self.labels, new_lines, known)
         
         return result, extract
 
+    #
+    # STREAMING ASSEMBLER (single pass)
+    #
+    def assemble_stream(self, lines, out) -> int:
+        """Assemble `lines` (any iterable, e.g. an open file) into `out`.
+
+        `out` must be a seekable binary file. Encodings are written as soon
+        as they are known; a forward B gets a placeholder and a fixup that is
+        patched in place when its label appears, so memory only grows with
+        the labels still unresolved. Returns the number of words written.
+        """
+        fixups = {}   # label -> [(line_num, pc, slot, tokens, line)]
+        pc = 0
+        slot = 0
+
+        fail = self.report_error
+
+        for line_num, raw in enumerate(lines, 1):
+            line = raw.split('//', 1)[0].strip()
+            if line == "":
+                continue
+            tokens = self.tokenize_instruction(line)
+            if not tokens:
+                continue
+
+            if tokens[0][0] == "LABEL":
+                label_name = tokens[0][1][:-1]
+                self.labels[label_name] = pc
+                pending = fixups.pop(label_name, ())
+                for f_num, f_pc, f_slot, f_tokens, f_line in pending:
+                    try:
+                        code = self.assemble_instruction(f_tokens, f_pc)
+                    except Exception as e:
+                        fail(e, f_num, f_line)
+                    out.seek(f_slot * 9)
+                    out.write(b"%08X\n" % code)
+                if pending:
+                    out.seek(0, 2)
+                tokens = tokens[1:]
+                if not tokens:
+                    continue
+
+            try:
+                # CHECK SYNTAX
+                kinds = [k for k, _ in tokens]
+                if "UNKNOWN" in kinds:
+                    raise RuntimeError("Bad instruction formation.")
+
+                op_token = next((v for (k, v) in tokens if k == "OP"), None)
+                label_tok = next((v for (k, v) in tokens if k == "POINTER"), None)
+                if (
+                    op_token is not None
+                    and self.decode_mnemonic(op_token)[0] in self.b_instr
+                    and label_tok is not None
+                    and label_tok not in self.labels
+                ):
+                    # Forward reference: patched when the label is defined
+                    fixups.setdefault(label_tok, []).append((line_num, pc, slot, tokens, line))
+                    instr_code = 0
+                else:
+                    instr_code = self.assemble_instruction(tokens, pc)
+            except Exception as e:
+                fail(e, line_num, line)
+
+            pc += 1
+            if instr_code == -1:
+                continue  # Skip empty lines
+            out.write(b"%08X\n" % instr_code)
+            slot += 1
+
+        for label_tok, pending in fixups.items():
+            f_num, _, _, _, f_line = pending[0]
+            fail(f"Label no definido: {label_tok}", f_num, f_line)
+
+        return slot
+
 
 #
 # main entrypoint, reads asm and writes to file
 #
 if __name__ == "__main__":
     print("ARMv7 - Simple assembler. (Arch - CS2201) - 2025 - v2.0")
-    if len(sys.argv) < 2:
-        print("Execute as: python asm.py <input file> [<output file>]")
+    args = sys.argv[1:]
+    stream = "--stream" in args
+    if stream:
+        args.remove("--stream")
+    use_cache = "--cache" in args
+    if use_cache:
+        args.remove("--cache")
+    # --format=hex|hexs|memb|bin|binbe|ihex (see memimage.py)
+    out_format = next((a.split("=", 1)[1] for a in args if a.startswith("--format=")), None)
+    args = [a for a in args if not a.startswith("--format=")]
+    if len(args) < 1:
+        print("Execute as: python asm.py [--stream] [--cache] [--format=<fmt>] <input file> [<output file>]")
+        sys.exit(1)
+    if stream and (use_cache or out_format not in (None, "hex")):
+        # assemble_stream escribe y parchea %08X en el sitio, sin caché
+        print("Error: --stream solo escribe hex y no usa la caché (quite --cache / --format)")
         sys.exit(1)
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "memfile.mem"
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else "memfile.mem"
 
     assembler = ARM_Assembler()
+    if use_cache:
+        # Persistent cache, $ASM_CACHE_DIR or ~/.cache/asm_v2
+        from asm_cache import AssemblyCache
+        assembler.cache = AssemblyCache()
+
+    if stream:
+        # Single pass, constant memory: no listing is printed
+        try:
+            with open(input_file, "r") as infile, open(output_file, "w+b") as outfile:
+                count = assembler.assemble_stream(infile, outfile)
+        except FileNotFoundError:
+            print(f"Error: No se pudo encontrar el archivo '{input_file}'")
+            sys.exit(1)
+        print(f"\nSUCCESS: {count} words written to {output_file}")
+        sys.exit(0)
     
     try:
         with open(input_file, "r") as infile:
@@ -399,9 +581,13 @@ if __name__ == "__main__":
                 text = extract[i].lstrip().ljust(18)
                 print(f"{i:02d} {text} : 0x{instr:08X}")
 
-        with open(output_file, "w") as f:
-            for instr in instrs:
-                f.write(f"{instr:08X}\n")
+        if out_format is not None:
+            from memimage import write_image
+            write_image(output_file, instrs, out_format)
+        else:
+            with open(output_file, "w") as f:
+                for instr in instrs:
+                    f.write(f"{instr:08X}\n")
 
         print(f"\nSUCCESS: Hex memory written to {output_file}")
     except Exception as e:
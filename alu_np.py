@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  alu_np.py – Modelo de referencia vectorizado (NumPy) de alu.v
+#  Todos los ALUControl 0000–1111 sobre arreglos uint32, con las
+#  mismas rarezas que el RTL:
+#    · zero mira Result y ResultHi
+#    · C y V se fuerzan a 0 para los códigos de is_logic; MOV low16,
+#      MOVT y MOVM no están en la lista y sacan C/V de la suma
+#    · SMUL multiplica valores absolutos y niega el producto de 64 bits
+#    · MOVT / MOVM enmascaran el puerto A y le suman ExtImm
+#    · DIV por cero da x en el RTL (aquí todos unos, como iss.alu)
+#  Además genera estímulos $readmemh para tb_alu.v, que se comprueba
+#  solo. Cada vector son 8 palabras:
+#      ALUControl  a  b  ExtImm  A  Result  ResultHi  ALUFlags
+#  DIV por cero se escribe con dígitos x, como lo deja el RTL.
+# ──────────────────────────────────────────────────────────────
+import sys
+import time
+
+import numpy as np
+
+import fpu_np
+from iss import LOGIC_CODES, MASK32
+
+U32 = np.uint32
+U64 = np.uint64
+
+_LOGIC = np.array([c in LOGIC_CODES for c in range(16)])
+FIELDS = ("ALUControl", "a", "b", "ExtImm", "A", "Result", "ResultHi", "ALUFlags")
+PER_FILE = 1 << 20              # vectores por archivo (MAX de tb_alu.v)
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  alu.v
+# ──────────────────────────────────────────────────────────────
+def alu_code(a, b, ctrl: int, ext_imm=0, A=0):
+    """(Result, ResultHi, ALUFlags) de alu.v para un único ALUControl."""
+    a = np.asarray(a, dtype=U32)
+    b = np.broadcast_to(np.asarray(b, dtype=U32), a.shape)
+    a64, b64 = a.astype(U64), b.astype(U64)
+    sub = ctrl & 1
+    total = a64 + ((b64 ^ MASK32) if sub else b64) + U64(sub)
+    hi = np.zeros(a.shape, dtype=U32)
+
+    if ctrl in (0b0000, 0b0001):
+        res = total.astype(U32)
+    elif ctrl == 0b0010:
+        res = a & b
+    elif ctrl == 0b0011:
+        res = a | b
+    elif ctrl == 0b0111:
+        res = (a64 * b64).astype(U32)
+    elif ctrl == 0b0100:
+        # en RTL a / 0 da x; igual que iss.alu se fija a todos unos
+        res = np.where(b == 0, U32(MASK32), a // np.maximum(b, 1)).astype(U32)
+    elif ctrl == 0b1011:
+        res = np.broadcast_to(np.asarray(ext_imm, dtype=U32), a.shape).copy()
+    elif ctrl == 0b1100:
+        res = (np.asarray(A, dtype=U32) & U32(0x000FFFFF)) | np.asarray(ext_imm, dtype=U32)
+    elif ctrl == 0b1101:
+        res = (np.asarray(A, dtype=U32) & U32(0xFF000FFF)) | np.asarray(ext_imm, dtype=U32)
+    elif ctrl == 0b1010:
+        res = b.copy()
+    elif ctrl == 0b0110:
+        neg_a, neg_b = a >> 31 == 1, b >> 31 == 1
+        abs_a = np.where(neg_a, -a64 & MASK32, a64)
+        abs_b = np.where(neg_b, -b64 & MASK32, b64)
+        prod = abs_a * abs_b
+        prod = np.where(neg_a ^ neg_b, -prod, prod)
+        res, hi = prod.astype(U32), (prod >> U64(32)).astype(U32)
+    elif ctrl == 0b0101:
+        prod = a64 * b64
+        res, hi = prod.astype(U32), (prod >> U64(32)).astype(U32)
+    elif ctrl == 0b1000:
+        res = fpu_np.fadd32(a, b)
+    elif ctrl == 0b1001:
+        res = fpu_np.fmul32(a, b)
+    elif ctrl == 0b1110:
+        res = fpu_np.fadd16(a, b)
+    else:
+        res = fpu_np.fmul16(a, b)
+    res = np.broadcast_to(res, a.shape)
+
+    neg = res >> 31
+    zero = ((res == 0) & (hi == 0)).astype(U32)
+    if _LOGIC[ctrl]:
+        carry = overflow = np.zeros(a.shape, dtype=U32)
+    else:
+        carry = (total >> U64(32) & U64(1)).astype(U32)
+        overflow = ~((a ^ b) >> 31 ^ U32(sub)) & ((a ^ total.astype(U32)) >> 31) & U32(1)
+    flags = (neg << 3) | (zero << 2) | (carry << 1) | overflow
+    return res, hi, flags.astype(np.uint8)
+
+
+def alu(a, b, ctrl, ext_imm=0, A=0):
+    """alu.v elemento a elemento; ctrl, ext_imm y A pueden ser arreglos."""
+    a = np.asarray(a, dtype=U32)
+    shape = np.broadcast_shapes(a.shape, np.shape(b), np.shape(ctrl), np.shape(ext_imm), np.shape(A))
+    a, b, ctrl, ext_imm, A = (np.broadcast_to(np.asarray(v, dtype=U32), shape)
+                              for v in (a, b, ctrl, ext_imm, A))
+    res = np.empty(shape, dtype=U32)
+    hi = np.empty(shape, dtype=U32)
+    flags = np.empty(shape, dtype=np.uint8)
+    for code in np.unique(ctrl & 0xF).tolist():
+        k = (ctrl & 0xF) == code
+        res[k], hi[k], flags[k] = alu_code(a[k], b[k], code, ext_imm[k], A[k])
+    return res, hi, flags
+
+
+def is_x(b, ctrl):
+    """Vectores cuyo Result el RTL deja en x (DIV por cero)."""
+    return (np.asarray(ctrl) & 0xF == 0b0100) & (np.asarray(b) == 0)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Estímulos para tb_alu.v
+# ──────────────────────────────────────────────────────────────
+EDGES = np.array([0, 1, 2, 0x7FFFFFFF, 0x80000000, 0x80000001, 0xFFFFFFFE, 0xFFFFFFFF,
+                  0x3F800000, 0xBF800000, 0x00003C00, 0x0000BC00], dtype=U32)
+
+
+def stimulus(n: int, rng, codes=range(16)):
+    """Arreglo (n, 8) con los campos de FIELDS; un cuarto son bordes."""
+    codes = np.asarray(list(codes), dtype=U32)
+    out = np.empty((n, len(FIELDS)), dtype=U32)
+    ctrl = codes[rng.integers(0, len(codes), n)]
+    ops = rng.integers(0, 1 << 32, (4, n), dtype=U64).astype(U32)
+    edge = rng.random((2, n)) < 0.25
+    ops[0][edge[0]] = EDGES[rng.integers(0, len(EDGES), int(edge[0].sum()))]
+    ops[1][edge[1]] = EDGES[rng.integers(0, len(EDGES), int(edge[1].sum()))]
+    # ExtImm con la forma que le da extend.v a MOV / MOVT / MOVM
+    imm12 = ops[2] & U32(0xFFF)
+    shaped = np.select([ctrl == 0b1011, ctrl == 0b1100, ctrl == 0b1101],
+                       [imm12, imm12 << 20, (imm12 & U32(0xFF)) << 12], ops[2])
+    ops[2] = np.where(rng.random(n) < 0.5, shaped, ops[2])
+
+    out[:, 0] = ctrl
+    out[:, 1:5] = ops.T
+    res, hi, flags = alu(ops[0], ops[1], ctrl, ops[2], ops[3])
+    out[:, 5], out[:, 6], out[:, 7] = res, hi, flags
+    return out
+
+
+def stimulus_text(vec) -> bytes:
+    """$readmemh de los vectores; DIV por cero lleva Result y N,Z en x."""
+    import memimage
+    text = np.frombuffer(memimage.hex_lines(vec.ravel()), dtype=np.uint8)
+    text = text.reshape(len(vec), len(FIELDS), 9).copy()
+    x = np.flatnonzero(is_x(vec[:, 2], vec[:, 0]))
+    if len(x):
+        text[x, 5, :8] = ord("X")
+        text[x, 7, 7] = ord("X")        # C = V = 0 pero N y Z son x
+    return text.tobytes()
+
+
+def write_stimulus(path: str, n: int, seed: int = 0, codes=range(16),
+                   per_file: int = PER_FILE, block: int = 1 << 18) -> list:
+    """Escribe n vectores por bloques; parte en varios archivos si no caben."""
+    rng = np.random.default_rng(seed)
+    parts = (n + per_file - 1) // per_file
+    paths = [path] if parts <= 1 else \
+        [path.replace(".mem", "") + f"_{i:03d}.mem" for i in range(parts)]
+    left = n
+    for p in paths:
+        with open(p, "wb") as f:
+            count = min(per_file, left)
+            for start in range(0, count, block):
+                f.write(stimulus_text(stimulus(min(block, count - start), rng, codes)))
+        left -= count
+    return paths
+
+
+def self_check(n: int, seed: int = 0) -> int:
+    """Modelo vectorizado contra iss.alu escalar."""
+    from iss import alu as alu_scalar
+    vec = stimulus(n, np.random.default_rng(seed))
+    bad = 0
+    for row in vec.tolist():
+        c, a, b, imm, A, res, hi, flags = row
+        ref = alu_scalar(a, b, c, imm, A)
+        if ref != (res, hi, flags):
+            bad += 1
+            if bad <= 10:
+                print(f"  ctrl={c:04b} a={a:08X} b={b:08X} imm={imm:08X} A={A:08X} "
+                      f"vec={res:08X}/{hi:08X}/{flags:04b} iss={ref[0]:08X}/{ref[1]:08X}/{ref[2]:04b}")
+    print(f"{n - bad}/{n} vectores coinciden con iss.alu")
+    return bad
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2 or args[0] not in ("gen", "self", "bench"):
+        print("Uso: python alu_np.py gen <n> [salida.mem] [--codes=0000,0110,...] [--seed=S] [--per-file=N]")
+        print("     python alu_np.py self <n>")
+        print("     python alu_np.py bench <n>")
+        sys.exit(1)
+    n = int(args[1])
+    seed = int(opts.get("seed", 0))
+    codes = [int(c, 2) for c in opts["codes"].split(",")] if "codes" in opts else range(16)
+
+    if args[0] == "gen":
+        t0 = time.perf_counter()
+        paths = write_stimulus(args[2] if len(args) > 2 else "alu_vectors.mem", n, seed, codes,
+                               int(opts.get("per-file", PER_FILE)))
+        print(f"{n} vectores en {len(paths)} archivo(s) ({time.perf_counter() - t0:.2f} s): "
+              f"{paths[0]}{' ...' if len(paths) > 1 else ''}")
+    elif args[0] == "self":
+        sys.exit(1 if self_check(n, seed) else 0)
+    else:
+        rng = np.random.default_rng(seed)
+        t0 = time.perf_counter()
+        stimulus(n, rng, codes)
+        dt = time.perf_counter() - t0
+        print(f"{n} vectores en {dt:.3f} s ({n / dt / 1e6:.1f} M/s)")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  asm_batch.py – Ensamblado en lote de muchos programas con ASM_v2.py
+#  Un pool de procesos con un ARM_Assembler ya construido por worker;
+#  cada archivo produce su .mem y una fila en el resumen (palabras,
+#  error con su línea, tiempo). Un error no detiene el lote.
+# ──────────────────────────────────────────────────────────────
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from ASM_v2 import ARM_Assembler
+
+
+class AssemblyError(RuntimeError):
+    def __init__(self, message, line_num, line):
+        super().__init__(f"{message} (línea {line_num}: {line})")
+        self.message = str(message)
+        self.line_num = line_num
+        self.line = line
+
+
+class BatchAssembler(ARM_Assembler):
+    """ARM_Assembler que lanza AssemblyError en vez de terminar el proceso."""
+
+    def report_error(self, e, line_num, line):
+        raise AssemblyError(e, line_num, line)
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Worker
+# ──────────────────────────────────────────────────────────────
+_asm = None
+
+
+_format = None
+
+
+def _init_worker(use_cache: bool, out_format: str = None) -> None:
+    global _asm, _format
+    _asm = BatchAssembler()
+    _format = out_format
+    if use_cache:
+        from asm_cache import AssemblyCache
+        _asm.cache = AssemblyCache()
+
+
+def assemble_file(job) -> dict:
+    """Ensambla (entrada, salida) y devuelve su fila del resumen."""
+    src, dst = job
+    entry = {"file": src, "output": dst, "words": 0, "error": None, "line": None}
+    t0 = time.perf_counter()
+    try:
+        with open(src, "r") as f:
+            program = f.read()
+        _asm.labels = {}            # cada programa empieza sin labels
+        words, _ = _asm.assemble_program(program)
+        if _format is None:
+            with open(dst, "w") as f:
+                f.write("".join(f"{w:08X}\n" for w in words))
+        else:
+            from memimage import write_image
+            write_image(dst, words, _format)
+        entry["words"] = len(words)
+    except AssemblyError as e:
+        entry["error"], entry["line"] = e.message, e.line_num
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = time.perf_counter() - t0
+    return entry
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Lote
+# ──────────────────────────────────────────────────────────────
+def expand_inputs(patterns) -> list:
+    """Archivos, directorios (todos sus .asm) o globs, sin duplicados."""
+    files = []
+    for p in patterns:
+        if os.path.isdir(p):
+            found = glob.glob(os.path.join(p, "**", "*.asm"), recursive=True)
+        else:
+            found = glob.glob(p, recursive=True) or [p]
+        files += sorted(found)
+    return list(dict.fromkeys(files))
+
+
+def output_paths(files, out_dir=None, ext=".mem") -> list:
+    """Salida .mem junto a cada entrada, o en out_dir con la misma estructura."""
+    if out_dir is None:
+        return [os.path.splitext(f)[0] + ext for f in files]
+    dirs = [os.path.dirname(os.path.abspath(f)) for f in files]
+    root = os.path.commonpath(dirs) if dirs else ""
+    outs = []
+    for f in files:
+        rel = os.path.relpath(os.path.abspath(f), root)
+        dst = os.path.join(out_dir, os.path.splitext(rel)[0] + ext)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        outs.append(dst)
+    return outs
+
+
+def assemble_batch(files, out_dir=None, jobs=None, use_cache=False, out_format=None) -> list:
+    """Ensambla `files` en paralelo; devuelve las filas en el orden de entrada."""
+    ext = {None: ".mem", "hex": ".mem", "hexs": ".mem", "memb": ".memb",
+           "bin": ".bin", "binbe": ".binbe", "ihex": ".hex"}[out_format]
+    work = list(zip(files, output_paths(files, out_dir, ext)))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(work) < 2:
+        _init_worker(use_cache, out_format)
+        return [assemble_file(w) for w in work]
+    chunk = max(1, len(work) // (jobs * 8))
+    with Pool(jobs, initializer=_init_worker, initargs=(use_cache, out_format)) as pool:
+        return pool.map(assemble_file, work, chunksize=chunk)
+
+
+def summary(rows, wall: float, only_errors: bool = False) -> str:
+    lines = [f"{'archivo':40s} {'palabras':>8s} {'ms':>8s}  estado"]
+    for r in rows:
+        if only_errors and r["error"] is None:
+            continue
+        state = "OK" if r["error"] is None else (
+            f"ERROR línea {r['line']}: {r['error']}" if r["line"] else f"ERROR: {r['error']}")
+        lines.append(f"{r['file']:40s} {r['words']:8d} {r['seconds'] * 1e3:8.2f}  {state}")
+    errors = sum(r["error"] is not None for r in rows)
+    words = sum(r["words"] for r in rows)
+    lines.append(f"\n{len(rows)} archivos, {errors} con errores, {words} palabras, {wall:.2f} s")
+    return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  main
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Ensamblado en lote con ASM_v2.py")
+    ap.add_argument("inputs", nargs="+", help="archivos .asm, directorios o globs")
+    ap.add_argument("-o", "--out-dir", help="directorio de salida (por defecto junto a cada .asm)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="procesos (por defecto, núcleos)")
+    ap.add_argument("--summary", help="escribe el resumen en JSON")
+    ap.add_argument("--cache", action="store_true", help="usa asm_cache.AssemblyCache")
+    ap.add_argument("--format", choices=("hex", "hexs", "memb", "bin", "binbe", "ihex"),
+                    help="formato de salida (memimage.py); por defecto hex")
+    ap.add_argument("-q", "--quiet", action="store_true", help="sólo muestra los errores")
+    args = ap.parse_args()
+
+    files = expand_inputs(args.inputs)
+    t0 = time.perf_counter()
+    rows = assemble_batch(files, args.out_dir, args.jobs, args.cache, args.format)
+    wall = time.perf_counter() - t0
+
+    print(summary(rows, wall, args.quiet))
+
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump({"files": rows, "seconds": wall}, f, indent=1)
+
+    sys.exit(1 if any(r["error"] is not None for r in rows) else 0)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  asm_cache.py – Caché persistente e incremental para ASM_v2.py
+#  Programas completos: clave = hash(fuente) + hash(tablas de
+#  codificación). Líneas sueltas: las que no usan labels reutilizan su
+#  palabra de 32 bits; sólo se vuelven a codificar las que dependen de
+#  labels (B). SQLite en modo WAL da seguridad entre procesos y la
+#  columna `used` permite expulsar por LRU con un límite de bytes.
+# ──────────────────────────────────────────────────────────────
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_DIR = os.environ.get(
+    "ASM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "asm_v2"))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+LINE_BYTES = 48         # tamaño estimado de una fila de `lines`
+_CHUNK = 500            # parámetros por consulta IN (...)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (key BLOB PRIMARY KEY, data TEXT, size INTEGER, used REAL);
+CREATE TABLE IF NOT EXISTS lines (th BLOB, key TEXT, code INTEGER, size INTEGER, used REAL,
+                                  PRIMARY KEY (th, key));
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INTEGER);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0);
+"""
+
+
+def _digest(*parts) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else p.encode())
+        h.update(b"\0")
+    return h.digest()
+
+
+def _encoder_source(cls) -> bytes:
+    try:
+        with open(inspect.getfile(cls), "rb") as f:
+            return f.read()
+    except (OSError, TypeError):
+        return b""
+
+
+def table_hash(assembler) -> bytes:
+    """Hash de las tablas de codificación y del código del ensamblador."""
+    tables = json.dumps(
+        [assembler.dp_instr, assembler.mem_instr, assembler.b_instr,
+         assembler.conds, assembler.spc_instr,
+         getattr(assembler, "mul_long_cmd", {})],
+        sort_keys=True)
+    return _digest(type(assembler).__qualname__, tables, _encoder_source(type(assembler)))
+
+
+def label_free(tokens) -> bool:
+    """True si la codificación no depende de labels ni del PC."""
+    return all(k != "POINTER" for k, _ in tokens)
+
+
+class AssemblyCache:
+    def __init__(self, path: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if not path.endswith(".sqlite"):
+            os.makedirs(path, exist_ok=True)
+            path = os.path.join(path, "cache.sqlite")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.line_hits = 0
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _table(self, assembler) -> bytes:
+        # el hash se guarda en la instancia; si se cambian sus tablas
+        # después de ensamblar hay que borrar assembler._table_hash
+        th = getattr(assembler, "_table_hash", None)
+        if th is None:
+            th = assembler._table_hash = table_hash(assembler)
+        return th
+
+    # ──────────────────── programas completos
+    def program_key(self, assembler, program: str) -> bytes:
+        return _digest(self._table(assembler), program)
+
+    def get_program(self, key: bytes):
+        """(result, extract, labels) o None."""
+        row = self.db.execute("SELECT data FROM programs WHERE key=?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE programs SET used=? WHERE key=?", (time.time(), key))
+        result, extract, labels = json.loads(row[0])
+        return result, extract, labels
+
+    # ──────────────────── líneas sueltas
+    @staticmethod
+    def line_key(tokens) -> str:
+        # los tipos de token se deducen del texto, basta con los valores
+        return "\x1f".join([v for _, v in tokens])
+
+    def get_lines(self, assembler, keys) -> dict:
+        """{clave: palabra} para las claves que ya están en la caché."""
+        th = self._table(assembler)
+        found = {}
+        keys = list(set(keys))
+        for i in range(0, len(keys), _CHUNK):
+            chunk = keys[i:i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            found.update(self.db.execute(
+                f"SELECT key, code FROM lines WHERE th=? AND key IN ({marks})", [th, *chunk]))
+        self.line_hits += len(found)
+        return found
+
+    # ──────────────────── escritura + LRU
+    def put(self, assembler, prog_key: bytes, result, extract, labels,
+            lines=(), used_lines=()) -> None:
+        """Guarda el programa y las líneas nuevas; refresca las reutilizadas."""
+        th = self._table(assembler)
+        data = json.dumps([result, extract, labels])
+        now = time.time()
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            old = db.execute("SELECT size FROM programs WHERE key=?", (prog_key,)).fetchone()
+            added -= old[0] if old else 0
+            db.execute("INSERT OR REPLACE INTO programs VALUES (?, ?, ?, ?)",
+                       (prog_key, data, len(data), now))
+            added += len(data)
+            for key, code in dict(lines).items():
+                cur = db.execute("INSERT OR IGNORE INTO lines VALUES (?, ?, ?, ?, ?)",
+                                 (th, key, code, LINE_BYTES + len(key), now))
+                added += (LINE_BYTES + len(key)) * cur.rowcount
+            used_lines = list(used_lines)
+            for i in range(0, len(used_lines), _CHUNK):
+                chunk = used_lines[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                db.execute(f"UPDATE lines SET used=? WHERE th=? AND key IN ({marks})",
+                           [now, th, *chunk])
+            db.execute("UPDATE meta SET v=v+? WHERE k='bytes'", (added,))
+            self._evict()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _evict(self) -> None:
+        total = self.db.execute("SELECT v FROM meta WHERE k='bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # se baja al 90 % para no expulsar en cada escritura
+        excess = total - self.max_bytes * 9 // 10
+        freed = 0
+        victims = self.db.execute(
+            "SELECT rowid, t, size FROM ("
+            " SELECT rowid, 'programs' AS t, size, used FROM programs UNION ALL"
+            " SELECT rowid, 'lines' AS t, size, used FROM lines) ORDER BY used")
+        doomed = {"programs": [], "lines": []}
+        for rowid, table, size in victims:
+            if freed >= excess:
+                break
+            doomed[table].append(rowid)
+            freed += size
+        for table, rowids in doomed.items():
+            for i in range(0, len(rowids), _CHUNK):
+                chunk = rowids[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                self.db.execute(f"DELETE FROM {table} WHERE rowid IN ({marks})", chunk)
+        self.db.execute("UPDATE meta SET v=v-? WHERE k='bytes'", (freed,))
+
+    def clear(self) -> None:
+        self.db.executescript(
+            "DELETE FROM programs; DELETE FROM lines; UPDATE meta SET v=0 WHERE k='bytes';")
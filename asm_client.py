@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  asm_client.py – Cliente ligero de asm_server.py
+#  Mismos argumentos y misma salida que ASM_v2.py; si el demonio no
+#  está corriendo se ejecuta ASM_v2.py en este mismo proceso.
+#  --run además simula el programa con iss.py (en el demonio, o aquí
+#  mismo si no hay demonio).
+# ──────────────────────────────────────────────────────────────
+import json
+import os
+import socket
+import sys
+
+SOCKET_PATH = os.environ.get("ASM_SOCKET", f"/tmp/asm_v2-{os.getuid()}.sock")
+
+
+def request(req: dict, path: str = SOCKET_PATH) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(req).encode() + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(1 << 16)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
+
+
+def _local(argv) -> int:
+    """Ejecuta ASM_v2.py aquí mismo; devuelve su código de salida."""
+    import runpy
+    sys.argv = ["ASM_v2.py"] + argv
+    try:
+        runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ASM_v2.py"),
+                       run_name="__main__")
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+def print_run(run: dict) -> None:
+    cpi = run["cycles"] / max(run["instret"], 1)
+    print(f"\nInstrucciones: {run['instret']}  Ciclos: {run['cycles']}  CPI: {cpi:.2f}")
+    if "error" in run:
+        print(f"ERROR: {run['error']}")
+    print("\n=== CONTENIDO FINAL DEL REGFILE ===")
+    print("\n".join(f"R{i}={v:08x}" for i, v in enumerate(run["regs"])))
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    # --format=hex|hexs|memb|bin|binbe|ihex (memimage.py), como en ASM_v2.py
+    out_format = next((a.split("=", 1)[1] for a in argv if a.startswith("--format=")), None)
+    args = [a for a in argv if a not in ("--stream", "--cache", "--run")
+            and not a.startswith("--format=")]
+    if len(args) < 1:
+        print("ARMv7 - Simple assembler. (Arch - CS2201) - 2025 - v2.0")
+        print("Execute as: python asm.py [--stream] [--cache] [--run] [--format=<fmt>] "
+              "<input file> [<output file>]")
+        sys.exit(1)
+    if "--stream" in argv and ("--cache" in argv or out_format not in (None, "hex")):
+        print("ARMv7 - Simple assembler. (Arch - CS2201) - 2025 - v2.0")
+        print("Error: --stream solo escribe hex y no usa la caché (quite --cache / --format)")
+        sys.exit(1)
+
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else "memfile.mem"
+
+    try:
+        with open(input_file, "r") as infile:
+            source_code = infile.read()
+    except FileNotFoundError:
+        print("ARMv7 - Simple assembler. (Arch - CS2201) - 2025 - v2.0")
+        print(f"Error: No se pudo encontrar el archivo '{input_file}'")
+        sys.exit(1)
+
+    try:
+        resp = request({"op": "assemble", "source": source_code,
+                        "run": "--run" in argv, "cache": "--cache" in argv})
+    except (OSError, ValueError):
+        # sin demonio: mismo comportamiento que ASM_v2.py, y --run con
+        # iss.py sobre la imagen que acaba de escribir
+        code = _local([a for a in argv if a != "--run"])
+        if code == 0 and "--run" in argv:
+            from asm_server import simulate
+            if out_format is None:
+                from iss import load_memfile
+                words = load_memfile(output_file)
+            else:
+                from memimage import load_image
+                words = [int(w) for w in load_image(output_file, out_format)]
+            print_run(simulate(words))
+        sys.exit(code)
+
+    print("ARMv7 - Simple assembler. (Arch - CS2201) - 2025 - v2.0")
+    if not resp["ok"]:
+        print(f"\nERROR: {resp['error']}")
+        if resp.get("line") is not None:
+            print(f"AT LINE: {resp['line']} | WITH: {resp['text']}")
+        print("FAILURE.")
+        sys.exit(1)
+
+    instrs, extract = resp["words"], resp["listing"]
+    if out_format is not None:
+        from memimage import write_image
+        write_image(output_file, instrs, out_format)
+    else:
+        with open(output_file, "w") as f:
+            f.write("".join(f"{instr:08X}\n" for instr in instrs))
+
+    if "--stream" in argv:
+        print(f"\nSUCCESS: {len(instrs)} words written to {output_file}")
+    else:
+        print("\n== Instructions ==")
+        for i, instr in enumerate(instrs):
+            if i < len(extract):
+                text = extract[i].lstrip().ljust(18)
+                print(f"{i:02d} {text} : 0x{instr:08X}")
+        print(f"\nSUCCESS: Hex memory written to {output_file}")
+
+    run = resp.get("run")
+    if run is not None:
+        print_run(run)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  asm_server.py – Demonio residente del ensamblador/simulador
+#  Escucha en un socket Unix (asyncio) y reparte las peticiones entre
+#  procesos que ya tienen un ARM_Assembler construido, así una petición
+#  pequeña no paga el arranque de Python ni la compilación de regex.
+#
+#  Protocolo: una línea JSON por petición y otra por respuesta.
+#    {"op": "assemble", "source": "...", "run": false, "max_cycles": N,
+#     "cache": false}
+#    → {"ok": true, "words": [...], "listing": [...], "run": {...}}
+#    → {"ok": false, "error": "...", "line": N, "text": "..."}
+#    {"op": "ping"} → {"ok": true, "pid": ...}
+# ──────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from asm_batch import AssemblyError, BatchAssembler
+from iss import TESTBENCH_CYCLES
+
+SOCKET_PATH = os.environ.get("ASM_SOCKET", f"/tmp/asm_v2-{os.getuid()}.sock")
+MAX_REQUEST = 64 * 1024 * 1024      # bytes por línea JSON
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Worker (un ensamblador caliente por proceso)
+# ──────────────────────────────────────────────────────────────
+_asm = None
+_cache = None
+
+
+def _init_worker() -> None:
+    global _asm
+    _asm = BatchAssembler()
+
+
+def assemble_request(req: dict) -> dict:
+    """Atiende una petición "assemble" dentro de un worker."""
+    global _cache
+    _asm.labels = {}                # tabla de labels limpia por petición
+    if req.get("cache"):
+        if _cache is None:
+            from asm_cache import AssemblyCache
+            _cache = AssemblyCache()
+        _asm.cache = _cache
+    else:
+        _asm.cache = None
+
+    try:
+        words, listing = _asm.assemble_program(req.get("source", ""))
+    except AssemblyError as e:
+        return {"ok": False, "error": e.message, "line": e.line_num, "text": e.line}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}", "line": None, "text": None}
+    resp = {"ok": True, "words": words, "listing": listing}
+
+    if req.get("run"):
+        resp["run"] = simulate(words, int(req.get("max_cycles", TESTBENCH_CYCLES)))
+    return resp
+
+
+def simulate(words, max_cycles: int = TESTBENCH_CYCLES) -> dict:
+    """Corre el programa en iss.py; es el campo "run" de la respuesta."""
+    from iss import ARM_Simulator
+    sim = ARM_Simulator(mem_words=max(64, len(words)))
+    sim.load(words)
+    run = {}
+    try:
+        sim.run(max_cycles)
+    except RuntimeError as e:
+        run["error"] = str(e)
+    run.update(regs=list(sim.regs), pc=sim.pc, flags=sim.flags,
+               cycles=sim.cycles, instret=sim.instret, halted=sim.halted)
+    return run
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Servidor asyncio
+# ──────────────────────────────────────────────────────────────
+class ASM_Server:
+    def __init__(self, path: str = SOCKET_PATH, workers: int = None) -> None:
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self.served = 0
+
+    async def handle(self, reader, writer) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    op = req.get("op", "assemble")
+                    if op == "ping":
+                        resp = {"ok": True, "pid": os.getpid(), "served": self.served}
+                    elif op == "assemble":
+                        resp = await loop.run_in_executor(self.pool, assemble_request, req)
+                    else:
+                        resp = {"ok": False, "error": f"Operación desconocida: {op}"}
+                except (ValueError, AttributeError) as e:
+                    resp = {"ok": False, "error": f"Petición inválida: {e}"}
+                self.served += 1
+                writer.write(json.dumps(resp).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _alive(self) -> bool:
+        """True si otro demonio acepta conexiones en self.path."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            try:
+                s.connect(self.path)
+            except OSError:
+                return False
+        return True
+
+    async def serve(self) -> None:
+        if os.path.exists(self.path):
+            if self._alive():
+                raise RuntimeError(f"Ya hay un demonio escuchando en {self.path}")
+            os.unlink(self.path)        # socket huérfano de un demonio muerto
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        # arrancar los workers ahora y no en la primera petición
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(self.pool, _init_worker)
+            for _ in range(self.workers)))
+        server = await asyncio.start_unix_server(self.handle, self.path, limit=MAX_REQUEST)
+        print(f"Escuchando en {self.path} con {self.workers} workers", flush=True)
+        # SIGTERM / Ctrl-C cierran el socket y los workers limpiamente
+        stop = asyncio.get_running_loop().create_future()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set_result, None)
+        try:
+            async with server:
+                await stop
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] in ("-h", "--help"):
+        print("Uso: python asm_server.py [socket] [workers]")
+        sys.exit(0)
+    path = args[0] if args else SOCKET_PATH
+    workers = int(args[1]) if len(args) > 1 else None
+    try:
+        asyncio.run(ASM_Server(path, workers).serve())
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  bench_asm.py – Benchmark del front-end de ASM_v2.py
+#  Genera un programa de N líneas y compara líneas/s del camino
+#  antiguo (una regex por línea + búsqueda lineal de sufijos) con el
+#  escáner de archivo completo + índice de mnemónicos. La salida de
+#  ambos caminos debe ser idéntica.
+# ──────────────────────────────────────────────────────────────
+import random
+import sys
+import time
+
+from ASM_v2 import ARM_Assembler
+
+BODY = [
+    "ADD R1, R2, #3", "SUBS R4, R5, R6", "ORR R1, R1, R2", "MOV R3, #7",
+    "MOVEQ R0, R1", "ANDNE R2, R2, #0xF", "MUL R7, R1, R2", "UMUL R0, R1, R2",
+    "LDR R1, R2, #4", "STR R3, R2, #8", "CMP R1, R2", "DIV R5, R6, R7",
+    "BNE L{l}", "BGT L{l}", "B L{l}",
+]
+
+
+class LegacyAssembler(ARM_Assembler):
+    """Front-end anterior: regex por línea y sufijos buscados token a token."""
+
+    def tokenize_instruction(self, instr: str):
+        tokens = []
+        for match in self.regex.finditer(instr):
+            kind = match.lastgroup
+            value = match.group()
+            if kind in ["SPACE", "COMMENT"]:
+                continue
+            if kind == "POINTER":
+                possible_instr, cond, S = self._scan_mnemonic(value)
+                if possible_instr in self.valid_ops and cond in self.conds:
+                    kind = "OP"
+            tokens.append((kind, value))
+        return tokens
+
+    def scan_program(self, program: str):
+        for n, line in enumerate(program.splitlines(), 1):
+            line = line.split('//', 1)[0].strip()
+            if line:
+                tokens = self.tokenize_instruction(line)
+                if tokens:
+                    yield n, line, tokens
+
+
+def gen_program(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    labels = max(1, n // 50)
+    lines = []
+    for i in range(n):
+        instr = rng.choice(BODY).format(l=rng.randrange(labels))
+        if i % 50 == 0:
+            instr = f"L{i // 50}: {instr}"
+        if i % 7 == 0:
+            instr += "   // comentario"
+        lines.append(instr)
+    return "\n".join(lines) + "\n"
+
+
+def bench(cls, program: str):
+    asm = cls()
+    t0 = time.perf_counter()
+    front = sum(len(toks) for _, _, toks in asm.scan_program(program.strip()))
+    t1 = time.perf_counter()
+    asm = cls()
+    out = asm.assemble_program(program)
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1, front, out
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    program = gen_program(n)
+    print(f"Programa: {n} líneas, {len(program) / 1e6:.1f} MB")
+
+    results = {}
+    for name, cls in (("antiguo", LegacyAssembler), ("índice", ARM_Assembler)):
+        t_scan, t_total, ntok, out = bench(cls, program)
+        results[name] = out
+        print(f"{name:8s}: tokenizar {n / t_scan:10,.0f} líneas/s   "
+              f"ensamblar {n / t_total:10,.0f} líneas/s   ({ntok} tokens)")
+
+    same = results["antiguo"] == results["índice"]
+    print("Salida idéntica" if same else "ERROR: las salidas difieren")
+    sys.exit(0 if same else 1)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  bench_memfile.py – Benchmark de memfile.py
+#  Genera una imagen $readmemh de N MB con el estilo de memfile.mem
+#  (palabra + comentario //, algunas @direcciones y líneas en blanco)
+#  y compara el lector vectorizado con el lector línea a línea que
+#  usaba iss.py. Ambos deben devolver las mismas palabras.
+# ──────────────────────────────────────────────────────────────
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import memfile
+
+LINES = [
+    "{w:08X}  //MOV R1, #0xFFFFFFFFF\n", "{w:08x}\n", "{w:08X}  //B ERROR\n",
+    "\n", "{w:08X} {v:08X}  // dos palabras\n",
+]
+
+
+def gen_image(path: str, mb: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    target = mb << 20
+    with open(path, "w") as f:
+        written = 0
+        while written < target:
+            block = []
+            for _ in range(4096):
+                tpl = rng.choice(LINES)
+                block.append(tpl.format(w=rng.getrandbits(32), v=rng.getrandbits(32)))
+            block.append(f"@{(written // 10) + 1:X}  // salto\n")
+            text = "".join(block)
+            f.write(text)
+            written += len(text)
+
+
+def legacy_load(path: str) -> dict:
+    """Lector línea a línea (iss.load_memfile anterior + @direcciones)."""
+    words, addr = {}, 0
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("//", 1)[0].strip()
+            for tok in line.split():
+                if tok[0] == "@":
+                    addr = int(tok[1:], 16)
+                    continue
+                words[addr] = int(tok, 16)
+                addr += 1
+    return words
+
+
+if __name__ == "__main__":
+    mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    path = sys.argv[2] if len(sys.argv) > 2 else f"/tmp/bench_{mb}mb.mem"
+    if not os.path.exists(path) or os.path.getsize(path) < mb << 20:
+        print(f"Generando {path} ({mb} MB)...")
+        gen_image(path, mb)
+    size = os.path.getsize(path) / (1 << 20)
+
+    t0 = time.perf_counter()
+    m = memfile.load(path)
+    t_new = time.perf_counter() - t0
+    print(f"memfile.py : {t_new:7.2f} s  {size / t_new:8.1f} MB/s  "
+          f"({len(m.addrs)} palabras, {'disperso' if m.sparse else 'denso'})")
+
+    t0 = time.perf_counter()
+    ref = legacy_load(path)
+    t_old = time.perf_counter() - t0
+    print(f"línea/línea: {t_old:7.2f} s  {size / t_old:8.1f} MB/s")
+
+    addrs = np.fromiter(ref.keys(), np.int64, len(ref))
+    values = np.fromiter(ref.values(), np.uint32, len(ref))
+    same = bool((m.words[addrs] == values).all()) and int(m.valid.sum()) == len(ref)
+    print(f"Aceleración x{t_old / t_new:.1f}; " + ("salida idéntica" if same else "ERROR: difieren"))
+    sys.exit(0 if same else 1)
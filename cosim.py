@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  cosim.py – Co-simulación diferencial RTL contra iss.py
+#  Recorre la traza del RTL (el log por ciclo de testbench.v o el
+#  dump.vcd) a la par con iss.py ejecutando el mismo memfile.mem, y se
+#  detiene en la primera diferencia arquitectónica.
+#
+#  La traza se lee por bloques (tblog.read_blocks para el log, ventanas
+#  de páginas del índice de vcd.py para el VCD), así que la memoria no
+#  crece con el tamaño del archivo. Cada bloque pasa a filas por flanco
+#  de subida con los valores de antes del flanco, y las filas se cortan
+#  en instrucciones en cada FETCH; la palabra y el PC de la instrucción
+#  salen de la fila de DECODE (IRWrite y PC+4 se cargan al final de
+#  FETCH). Los grupos sin DECODE son los ciclos de reset.
+#
+#  Por instrucción se compara:
+#    · PC e Instr
+#    · escrituras a memoria: (Adr, WriteData) de los ciclos con MemWrite
+#    · escrituras a registros: sólo en el VCD (rf.we3/wa3/wd3 y
+#      we4/wa4/wd4); el log no las trae y sólo se compara el volcado
+#      final R0..R14 contra iss.py
+#    · con --ciclos, también la duración contra PATHS de iss.py
+#  Al fallar imprime las últimas instrucciones que coincidieron y los
+#  ciclos de la instrucción que difiere.
+# ──────────────────────────────────────────────────────────────
+import sys
+from collections import deque
+
+import numpy as np
+
+from iss import MASK32, STATE_NAMES, ARM_Simulator, load_memfile
+from tblog import instr_class, read_blocks
+
+FETCH = STATE_NAMES.index("FETCH")
+DECODE = STATE_NAMES.index("DECODE")
+
+# campos de una fila; xz lleva un bit por campo en este orden
+FIELDS = ("STATE", "PC", "Instr", "MemWrite", "Adr", "WriteData",
+          "we3", "wa3", "wd3", "we4", "wa4", "wd4")
+ROW = np.dtype([("t", np.uint64), ("STATE", np.int8)] +
+               [(f, np.uint32) for f in FIELDS[1:]] + [("xz", np.uint16)])
+REG_FIELDS = FIELDS[6:]
+
+# señales del VCD por sufijo (jerarquía de testbench.v)
+VCD_SIGNALS = {
+    "clk": "dut.clk",
+    "STATE": "dut.arm.c.dec.fsm.state",
+    "PC": "dut.arm.dp.PC",
+    "Instr": "dut.arm.dp.Instr",
+    "MemWrite": "dut.MemWrite",
+    "Adr": "dut.Adr",
+    "WriteData": "dut.WriteData",
+    "we3": "dut.arm.dp.rf.we3", "wa3": "dut.arm.dp.rf.wa3", "wd3": "dut.arm.dp.rf.wd3",
+    "we4": "dut.arm.dp.rf.we4", "wa4": "dut.arm.dp.rf.wa4", "wd4": "dut.arm.dp.rf.wd4",
+}
+VCD_PAGES = 64                  # páginas del índice por ventana
+
+
+def _bit(name: str) -> int:
+    return 1 << FIELDS.index(name)
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Filas por ciclo
+# ──────────────────────────────────────────────────────────────
+def log_rows(path: str, final: dict):
+    """Bloques de filas del log de testbench.v; `final` recibe el
+    volcado R0..R15 a medida que aparece."""
+    for rows, layout, regs in read_blocks(path):
+        final.update(regs)
+        out = np.zeros(len(rows), dtype=ROW)
+        out["t"], out["STATE"] = rows["t"], rows["STATE"]
+        xz = (rows["xz"] & 1).astype(np.uint16)
+        names = [f[0] for f in layout.fields]
+        for i, name in enumerate(FIELDS[1:], 1):
+            if name in names:
+                k = names.index(name)
+                out[name] = rows[name]
+                xz |= ((rows["xz"] >> (k + 1)) & 1).astype(np.uint16) << i
+            else:
+                xz |= np.uint16(1 << i)
+        out["xz"] = xz
+        yield out
+
+
+def vcd_rows(vcd, pages: int = VCD_PAGES):
+    """Bloques de filas del VCD: una fila por flanco de subida de clk con
+    los valores vigentes justo antes del flanco. Las ventanas comparten
+    el instante del borde; un flanco cuenta en la ventana que lo cierra."""
+    names = {}
+    for key, suffix in VCD_SIGNALS.items():
+        try:
+            names[key] = vcd.find(suffix)[0]
+        except RuntimeError:
+            if key not in REG_FIELDS:
+                raise
+    if not len(vcd.times):
+        return
+    bounds = [int(vcd.times[vcd.page_ts[p]]) for p in range(0, len(vcd.page_ts), pages)]
+    bounds = sorted(set([int(vcd.times[0])] + bounds + [int(vcd.times[-1])]))
+    for ta, tb in zip(bounds, bounds[1:]):
+        ch = vcd.changes(list(names.values()), ta, tb)
+        ct, cv, cx = ch[names["clk"]]
+        rise = (cv[1:] == 1) & (cv[:-1] == 0) & ~cx[1:] & ~cx[:-1] & (ct[1:] > ta)
+        edges = ct[1:][rise]
+        out = np.zeros(len(edges), dtype=ROW)
+        out["t"] = edges
+        xz = np.zeros(len(edges), dtype=np.uint16)
+        for i, key in enumerate(FIELDS):
+            if key not in names:
+                xz |= np.uint16(1 << i)
+                continue
+            t, v, x = ch[names[key]]
+            k = np.searchsorted(t, edges, "left") - 1
+            have = k >= 0
+            val = np.where(have, v[np.maximum(k, 0)], 0) if len(t) else np.zeros(len(edges), np.uint64)
+            bad = ~have | x[np.maximum(k, 0)] if len(t) else np.ones(len(edges), bool)
+            out[key] = np.where(bad, -1, val) if key == "STATE" else val
+            xz |= bad.astype(np.uint16) << i
+        out["xz"] = xz
+        yield out
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Instrucciones
+# ──────────────────────────────────────────────────────────────
+def _instruction(rows, cut: bool):
+    dec = np.flatnonzero(rows["STATE"] == DECODE)
+    if not len(dec):
+        return None                       # ciclos de reset
+    r = rows[dec[0]]
+    return {"t": int(rows["t"][0]), "pc": (int(r["PC"]) - 4) & MASK32, "instr": int(r["Instr"]),
+            "x": bool(r["xz"] & (_bit("Instr") | _bit("PC"))), "cycles": len(rows),
+            "rows": rows, "cut": cut}
+
+
+def instructions(blocks):
+    """Genera una instrucción por cada FETCH de los bloques de filas; la
+    que queda abierta al final del bloque pasa al siguiente."""
+    carry, first = None, True
+    for rows in blocks:
+        if carry is not None and len(carry):
+            rows = np.concatenate((carry, rows))
+        st = rows["STATE"]
+        starts = np.flatnonzero(st == FETCH)
+        if first and len(rows) and st[0] != FETCH:
+            starts = np.concatenate(([0], starts))      # traza que empieza a mitad
+        first = first and not len(rows)
+        if not len(starts):
+            carry = rows
+            continue
+        for a, b in zip(starts[:-1], starts[1:]):
+            ins = _instruction(rows[a:b], False)
+            if ins is not None:
+                yield ins
+        carry = rows[starts[-1]:].copy()
+    if carry is not None and len(carry):
+        ins = _instruction(carry, True)
+        if ins is not None:
+            yield ins
+
+
+def mem_writes(rows) -> list:
+    """[(Adr, WriteData)] de los ciclos con MemWrite=1 (None si x)."""
+    x = rows["xz"]
+    sel = (rows["MemWrite"] == 1) | (x & _bit("MemWrite") != 0)
+    out = []
+    for r in rows[sel]:
+        adr = None if r["xz"] & _bit("Adr") else int(r["Adr"])
+        data = None if r["xz"] & _bit("WriteData") else int(r["WriteData"])
+        out.append((adr, data))
+    return out
+
+
+def reg_writes(rows) -> list:
+    """[(registro, valor)] de los puertos we3/we4 del banco (None si x)."""
+    out = []
+    for we, wa, wd in (("we3", "wa3", "wd3"), ("we4", "wa4", "wd4")):
+        sel = ((rows["xz"] & _bit(we)) == 0) & (rows[we] == 1)
+        for r in rows[sel]:
+            if r["xz"] & _bit(wa):
+                out.append((None, None))
+            else:
+                out.append((int(r[wa]), None if r["xz"] & _bit(wd) else int(r[wd])))
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Referencia
+# ──────────────────────────────────────────────────────────────
+class _Reference(ARM_Simulator):
+    def __init__(self, mem_words: int = 64) -> None:
+        super().__init__(mem_words)
+        self.stores = []
+
+    def write_word(self, addr: int, value: int) -> None:
+        self.stores.append((addr, value))
+        super().write_word(addr, value)
+
+
+def reference(words):
+    """Genera por instrucción de iss.py: pc, palabra (None si x: se
+    detiene sin ejecutarla), ciclos, escrituras a memoria, registros
+    antes/después y halt (True en el "end: B end" final, que sí se
+    ejecuta y se compara)."""
+    sim = _Reference(max(64, len(words)))
+    sim.load(words)
+    while True:
+        pc = sim.pc
+        idx = pc >> 2
+        word = sim.mem[idx] if idx < len(sim.mem) else None
+        before = list(sim.regs)
+        if word is None:
+            yield {"pc": pc, "instr": None, "cycles": 0, "stores": [], "before": before,
+                   "regs": before, "halt": True}
+            return
+        sim.stores = []
+        cycles = sim.step()
+        yield {"pc": pc, "instr": word, "cycles": cycles, "stores": sim.stores,
+               "before": before, "regs": list(sim.regs), "halt": sim.halted}
+        if sim.halted:
+            return
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Comparación
+# ──────────────────────────────────────────────────────────────
+def _hex(v) -> str:
+    return "xxxxxxxx" if v is None else f"{v:08x}"
+
+
+def compare(rtl, ref, regs: bool = False, cycles: bool = False, context: int = 5) -> dict:
+    """Avanza las dos secuencias hasta la primera diferencia.
+
+    Devuelve {'n': instrucciones iguales, 'fallo': (tipo, detalle) o
+    None, 'rtl'/'iss': la instrucción que difiere, 'contexto': las
+    últimas iguales, 'fin': por qué terminó, 'ultima': la última
+    referencia (para el volcado final)}.
+    """
+    shadow = [None] * 15                  # banco del RTL visto por we3/we4
+    recent = deque(maxlen=context)
+    out = {"n": 0, "fallo": None, "rtl": None, "iss": None, "contexto": recent,
+           "fin": "la traza del RTL terminó", "ultima": None}
+    for a in rtl:
+        b = next(ref, None)
+        if b is None:
+            out["fin"] = "iss.py terminó"
+            break
+        out["rtl"], out["iss"] = a, b
+        if b["instr"] is None:
+            out["fin"] = f"iss.py se detiene en PC=0x{b['pc']:08x} (palabra x)"
+            break
+        out["ultima"] = b
+        fail = None
+        if a["x"]:
+            fail = ("instr", "PC o Instr en x")
+        elif a["pc"] != b["pc"]:
+            fail = ("pc", f"PC RTL=0x{a['pc']:08x}  iss=0x{b['pc']:08x}")
+        elif a["instr"] != b["instr"]:
+            fail = ("instr", f"Instr RTL=0x{a['instr']:08x}  iss=0x{b['instr']:08x}")
+        elif not a["cut"]:
+            got, want = mem_writes(a["rows"]), b["stores"]
+            if got != want:
+                fail = ("memoria", "escrituras RTL=[" + ", ".join(f"{_hex(p)}<-{_hex(v)}" for p, v in got) +
+                        "]  iss=[" + ", ".join(f"{p:08x}<-{v:08x}" for p, v in want) + "]")
+            elif regs:
+                written = set()
+                for r, v in reg_writes(a["rows"]):
+                    if r is None:
+                        fail = ("registro", "escritura con wa en x")
+                        break
+                    if r < 15:
+                        shadow[r] = v
+                        written.add(r)
+                if fail is None:
+                    touched = written | {r for r in range(15) if b["regs"][r] != b["before"][r]}
+                    bad = [r for r in sorted(touched) if shadow[r] != b["regs"][r]]
+                    if bad:
+                        fail = ("registro", "  ".join(f"R{r} RTL={_hex(shadow[r])} iss={b['regs'][r]:08x}"
+                                                      for r in bad))
+            if fail is None and cycles and a["cycles"] != b["cycles"]:
+                fail = ("ciclos", f"ciclos RTL={a['cycles']}  iss={b['cycles']}")
+        if fail is not None:
+            out["fallo"] = fail
+            return out
+        out["n"] += 1
+        recent.append((a, b))
+        if b["halt"]:
+            # el RTL sigue dando vueltas en el mismo B; ya se comparó una
+            out["fin"] = f"iss.py se detiene en el bucle final (B a sí mismo) en PC=0x{b['pc']:08x}"
+            break
+    out["rtl"] = out["iss"] = None
+    return out
+
+
+def final_regs(dump: dict, last) -> list:
+    """[(r, volcado, iss)] de R0..R14 que no coinciden con iss.py ni
+    antes ni después de la última instrucción (la puede cortar el $finish)."""
+    if last is None:
+        return []
+    bad = []
+    for r in range(15):
+        if r in dump and dump[r] not in (last["before"][r], last["regs"][r]):
+            bad.append((r, dump[r], last["regs"][r]))
+    return bad
+
+
+def _line(k: int, a: dict) -> str:
+    cls = instr_class([a["instr"]])[0]
+    return (f"{k:>8}  t={a['t']:<10} PC=0x{a['pc']:08x}  Instr=0x{a['instr']:08x} {cls:3}  "
+            f"ciclos={a['cycles']}" + ("  (cortada)" if a["cut"] else ""))
+
+
+def report(res: dict, regs: bool) -> str:
+    lines = []
+    n = res["n"]
+    if res["fallo"] is None:
+        lines.append(f"{n} instrucciones coinciden; {res['fin']}")
+        return "\n".join(lines)
+    kind, detail = res["fallo"]
+    lines.append(f"DIFERENCIA ({kind}) en la instrucción {n}: {detail}")
+    lines.append("\n== Contexto ==")
+    for i, (a, _) in enumerate(res["contexto"]):
+        lines.append(_line(n - len(res["contexto"]) + i, a))
+    a, b = res["rtl"], res["iss"]
+    lines.append(_line(n, a) + "   <== RTL")
+    lines.append(f"{'':8}  iss.py:      PC=0x{b['pc']:08x}  Instr=0x{b['instr']:08x}      ciclos={b['cycles']}")
+    lines.append("\n== Ciclos de la instrucción (valores antes del flanco) ==")
+    cols = ["MemWrite", "Adr", "WriteData"] + (["we3", "wa3", "wd3", "we4", "wa4", "wd4"] if regs else [])
+    for r in a["rows"]:
+        st = int(r["STATE"])
+        name = STATE_NAMES[st] if 0 <= st < len(STATE_NAMES) else "x"
+        vals = []
+        for c in cols:
+            x = r["xz"] & _bit(c)
+            width = 8 if c in ("Adr", "WriteData", "wd3", "wd4") else 1
+            vals.append(f"{c}=" + ("x" * width if x else f"{int(r[c]):0{width}x}"))
+        lines.append(f"  t={int(r['t']):<10} {name:9} PC=0x{int(r['PC']):08x}  "
+                     f"Instr=0x{_hex(None if r['xz'] & _bit('Instr') else int(r['Instr']))}  " + "  ".join(vals))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        print("Uso: python cosim.py <testbench.log|dump.vcd> <memfile.mem> [--contexto=5] "
+              "[--ciclos] [--rebuild]")
+        sys.exit(1)
+
+    try:
+        words = load_memfile(args[1])
+        dump = {}
+        if args[0].endswith(".vcd"):
+            from vcd import VCD
+            vcd = VCD(args[0], rebuild="--rebuild" in sys.argv)
+            regs = all(any(n.endswith("." + VCD_SIGNALS[k]) for n in vcd.signals) for k in REG_FIELDS)
+            blocks = vcd_rows(vcd)
+        else:
+            regs = False
+            blocks = log_rows(args[0], dump)
+        res = compare(instructions(blocks), reference(words), regs, "--ciclos" in sys.argv,
+                      int(opts.get("contexto", 5)))
+        print(report(res, regs))
+        bad = res["fallo"] is not None
+        if not bad and not regs:
+            wrong = final_regs(dump, res["ultima"])
+            for r, got, want in wrong:
+                print(f"  volcado final R{r}={_hex(got)}  iss={want:08x}")
+            bad = bool(wrong)
+        sys.exit(1 if bad else 0)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
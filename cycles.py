@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  cycles.py – Estimador estático de ciclos y CPI
+#  Arma el grafo de control del programa ensamblado (bloques básicos
+#  cortados en los B<cond> y sus destinos) y le pone a cada
+#  instrucción el costo de su camino en mainfsm.v:
+#      DP  FETCH DECODE EXECUTE ALUWB        4
+#      LDR FETCH DECODE MEMADR MEMRD MEMWB   5
+#      STR FETCH DECODE MEMADR MEMWR         4
+#      B   FETCH DECODE BRANCH               3
+#  El camino no depende de la condición: una instrucción que no se
+#  ejecuta cuesta lo mismo, así el costo de un bloque es fijo.
+#  Los bucles (aristas de retorno a un bloque que domina al origen) se
+#  expresan como polinomios en sus cantidades de iteraciones n1, n2...
+#  Con valores para cada n se estima el total, el CPI y los bloques
+#  más calientes, mostrados junto a sus líneas fuente.
+#
+#  Convenciones:
+#    · n = pasadas completas del cuerpo. En un bucle con la prueba
+#      arriba el tramo hasta la salida se ejecuta n + 1 veces.
+#    · Un if/else fuera de bucles cuenta ambos lados (cota superior).
+#    · "B end" sobre sí mismo es el fin del programa, como en iss.py.
+# ──────────────────────────────────────────────────────────────
+import sys
+
+from iss import CYCLES, _exec_b, _exec_dp, _exec_ldr, predecode
+
+DEFAULT_ITERS = 10
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Instrucciones
+# ──────────────────────────────────────────────────────────────
+def classify(word, pc: int):
+    """(clase, ciclos, sucesores) de la palabra en el índice `pc`.
+
+    sucesores es una lista de índices; None en ella marca un salto
+    indirecto (escritura a R15) cuyo destino no se conoce y "fin" el
+    "B end" que detiene el programa.
+    """
+    if word is None:
+        return None
+    try:
+        rec = predecode(word, pc << 2)
+    except RuntimeError:
+        return None
+    handler, cond = rec[0], rec[1]
+    if handler is _exec_b:
+        if rec[3]:
+            return "B", CYCLES["B"], ["fin"] if cond == 0b1110 else ["fin", pc + 1]
+        target = pc + 2 + (rec[2] >> 2)
+        return "B", CYCLES["B"], [target] if cond == 0b1110 else [target, pc + 1]
+    if handler is _exec_dp:
+        succ = [None] if rec[12] and not rec[11] else [pc + 1]
+        if succ == [None] and cond != 0b1110:
+            succ.append(pc + 1)
+        return "DP", rec[-1], succ
+    if handler is _exec_ldr:
+        succ = [None] if rec[3] == 15 else [pc + 1]
+        if succ == [None] and cond != 0b1110:
+            succ.append(pc + 1)
+        return "LDR", CYCLES["LDR"], succ
+    return "STR", CYCLES["STR"], [pc + 1]
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Grafo de control
+# ──────────────────────────────────────────────────────────────
+class Block:
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.end = start            # exclusivo
+        self.cycles = 0
+        self.kinds: dict = {}
+        self.succ: list = []        # índices de bloque
+        self.exits: list = []       # "fin", "indirecto", "x"
+        self.idom = None
+        self.loops: list = []       # bucles que lo contienen, de afuera hacia adentro
+
+
+class CFG:
+    def __init__(self, words) -> None:
+        self.words = list(words)
+        n = len(self.words)
+        info = [None] * n
+        # instrucciones alcanzables desde 0 y líderes de bloque
+        leaders, seen, todo = {0}, set(), [0]
+        while todo:
+            pc = todo.pop()
+            if pc in seen or not 0 <= pc < n:
+                continue
+            seen.add(pc)
+            info[pc] = classify(self.words[pc], pc)
+            if info[pc] is None:
+                continue
+            kind, _, succ = info[pc]
+            ends = kind == "B" or None in succ
+            for s in succ:
+                if s is None or s == "fin":
+                    continue
+                if ends:
+                    leaders.add(s)
+                todo.append(s)
+
+        self.info = info
+        self.blocks: list = []
+        self.block_of: dict = {}
+        for start in sorted(p for p in leaders if p in seen and info[p] is not None):
+            b = Block(start)
+            pc = start
+            while True:
+                kind, cyc, succ = info[pc]
+                b.cycles += cyc
+                b.kinds[kind] = b.kinds.get(kind, 0) + 1
+                self.block_of[pc] = len(self.blocks)
+                pc += 1
+                if kind == "B" or None in succ or pc in leaders or pc >= n or info[pc] is None:
+                    break
+            b.end = pc
+            self.blocks.append(b)
+
+        for b in self.blocks:
+            for s in info[b.end - 1][2]:
+                if s is None:
+                    b.exits.append("indirecto")
+                elif s == "fin":
+                    b.exits.append("fin")
+                elif s in self.block_of:
+                    b.succ.append(self.block_of[s])
+                else:
+                    b.exits.append("x")
+        self._dominators()
+        self._loops()
+
+    # ─── dominadores (algoritmo iterativo de Cooper, Harvey y Kennedy)
+    def _dominators(self) -> None:
+        order, seen = [], set()
+
+        def dfs(i):
+            stack = [(i, iter(self.blocks[i].succ))]
+            seen.add(i)
+            while stack:
+                node, it = stack[-1]
+                nxt = next((s for s in it if s not in seen), None)
+                if nxt is None:
+                    order.append(node)
+                    stack.pop()
+                else:
+                    seen.add(nxt)
+                    stack.append((nxt, iter(self.blocks[nxt].succ)))
+
+        if not self.blocks:
+            self.rpo = []
+            return
+        dfs(0)
+        self.rpo = order[::-1]
+        rank = {b: i for i, b in enumerate(self.rpo)}
+        preds = {b: [] for b in self.rpo}
+        for b in self.rpo:
+            for s in self.blocks[b].succ:
+                preds[s].append(b)
+        idom = {0: 0}
+        changed = True
+        while changed:
+            changed = False
+            for b in self.rpo[1:]:
+                done = [p for p in preds[b] if p in idom]
+                new = done[0]
+                for p in done[1:]:
+                    x, y = p, new
+                    while x != y:
+                        while rank[x] > rank[y]:
+                            x = idom[x]
+                        while rank[y] > rank[x]:
+                            y = idom[y]
+                    new = x
+                if idom.get(b) != new:
+                    idom[b] = new
+                    changed = True
+        self.preds = preds
+        for b, d in idom.items():
+            self.blocks[b].idom = d
+
+    def dominates(self, a: int, b: int) -> bool:
+        while True:
+            if a == b:
+                return True
+            if b == 0:
+                return False
+            b = self.blocks[b].idom
+
+    # ─── bucles naturales
+    def _loops(self) -> None:
+        by_header: dict = {}
+        for t in self.rpo:
+            for h in self.blocks[t].succ:
+                if self.dominates(h, t):
+                    body = by_header.setdefault(h, {"header": h, "body": {h}, "latches": []})
+                    body["latches"].append(t)
+                    todo = [t]
+                    while todo:
+                        x = todo.pop()
+                        if x not in body["body"]:
+                            body["body"].add(x)
+                            todo.extend(self.preds[x])
+        # de afuera hacia adentro: los cuerpos más grandes primero
+        self.loops = sorted(by_header.values(), key=lambda l: (-len(l["body"]), l["header"]))
+        for i, loop in enumerate(self.loops):
+            loop["var"] = f"n{i + 1}"
+            loop["exits"] = [b for b in loop["body"]
+                             if any(s not in loop["body"] for s in self.blocks[b].succ)
+                             or self.blocks[b].exits]
+            # la salida que se prueba en toda pasada, la más cercana a la cabecera
+            must = [e for e in loop["exits"] if all(self.dominates(e, t) for t in loop["latches"])]
+            must.sort(key=lambda e: sum(self.dominates(o, e) for o in must))
+            loop["test"] = must[0] if must else None
+            for b in loop["body"]:
+                self.blocks[b].loops.append(i)
+        self.loop_order = sorted(range(len(self.loops)),
+                                         key=lambda i: self.blocks[self.loops[i]["header"]].start)
+
+    def count(self, b: int, skip=()) -> dict:
+        """Veces que se ejecuta el bloque, como polinomio en las n.
+
+        Los bucles de `skip` no aportan factor (se mira una sola entrada).
+        """
+        poly = {(): 1}
+        for i in self.blocks[b].loops:
+            if i in skip:
+                continue
+            loop = self.loops[i]
+            test = loop["test"]
+            # con la prueba arriba el tramo cabecera..prueba corre n + 1 veces
+            extra = test is not None and test not in loop["latches"] and \
+                not (test != b and self.dominates(test, b))
+            poly = poly_mul(poly, {(i,): 1, (): 1} if extra else {(i,): 1})
+        return poly
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Polinomios {(i, j, ...): coeficiente} en las n de los bucles
+# ──────────────────────────────────────────────────────────────
+def poly_mul(p: dict, q: dict) -> dict:
+    out: dict = {}
+    for mp, cp in p.items():
+        for mq, cq in q.items():
+            m = tuple(sorted(mp + mq))
+            out[m] = out.get(m, 0) + cp * cq
+    return out
+
+
+def poly_add(p: dict, q: dict, k: int = 1) -> dict:
+    out = dict(p)
+    for m, c in q.items():
+        out[m] = out.get(m, 0) + k * c
+    return {m: c for m, c in out.items() if c}
+
+
+def poly_eval(p: dict, values) -> int:
+    total = 0
+    for m, c in p.items():
+        for i in m:
+            c *= values[i]
+        total += c
+    return total
+
+
+def poly_str(p: dict, names) -> str:
+    """'15·n1·n2 + 18·n1 + 23' (los conteos nunca dan coeficientes negativos)."""
+    terms = []
+    for m in sorted(p, key=lambda m: (-len(m), m)):
+        var = "·".join(names[i] for i in m)
+        terms.append(str(p[m]) if not var else var if p[m] == 1 else f"{p[m]}·{var}")
+    return " + ".join(terms) or "0"
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Programa: palabras + líneas fuente
+# ──────────────────────────────────────────────────────────────
+def load_program(path: str, dialect: str = "sc"):
+    """(palabras, fuente[pc] = (línea, texto), etiquetas {pc: nombre})."""
+    if path.endswith(".asm"):
+        from disasm import load_assembler
+        text = open(path).read()
+        asm = load_assembler(dialect)
+        words, lines = asm.assemble_program(text)
+        source = []
+        if getattr(asm, "line_numbers", None) is not None:
+            # scpython: una entrada por palabra (MOV32 / mirilla incluidas)
+            for ln, line in zip(asm.line_numbers, lines):
+                source.append((ln, line.split(":", 1)[1].strip() if ":" in line.split()[0] else line))
+        else:
+            # los otros forks no guardan la línea de cada palabra: se vuelve
+            # a codificar cada línea con su propio ensamblador (etiquetas ya
+            # resueltas) y solo quedan las que emiten palabra (no las -1)
+            pc = 0
+            for ln, line, toks in asm.scan_program(text):
+                if toks[0][0] == "LABEL":
+                    toks = toks[1:]
+                    line = line.split(":", 1)[1].strip() if ":" in line else line
+                if toks:
+                    if asm.assemble_instruction(toks, pc) != -1:
+                        source.append((ln, line))
+                    pc += 1
+        labels = {pc: name for name, pc in asm.labels.items()}
+        return words, source[:len(words)], labels
+
+    from disasm import disassemble
+    from memfile import load_words
+    words = load_words(path)
+    while words and words[-1] is None:
+        words.pop()
+    lines, _ = disassemble([0 if w is None else w for w in words])
+    source, labels = [], {}
+    for pc, line in enumerate(lines[:len(words)]):
+        if line.startswith("L") and ": " in line:
+            name, line = line.split(": ", 1)
+            labels[pc] = name
+        source.append((None, "x" if words[pc] is None else line))
+    return words, source, labels
+
+
+# ──────────────────────────────────────────────────────────────
+# 5.  Informe
+# ──────────────────────────────────────────────────────────────
+def estimate(cfg: CFG, iters: dict = None, default: int = DEFAULT_ITERS) -> dict:
+    """Polinomios de ciclos/instrucciones y su valor con las n pedidas."""
+    values = [(iters or {}).get(l["var"], default) for l in cfg.loops]
+    cyc, ins, per_block = {}, {}, []
+    for b, blk in enumerate(cfg.blocks):
+        count = cfg.count(b)
+        cyc = poly_add(cyc, count, blk.cycles)
+        ins = poly_add(ins, count, blk.end - blk.start)
+        per_block.append(poly_eval(count, values))
+    return {"cycles": cyc, "instrs": ins, "values": values, "counts": per_block}
+
+
+def loop_cost(cfg: CFG, i: int) -> dict:
+    """Ciclos de una entrada al bucle i (sus n y las de los bucles internos)."""
+    outer = set(cfg.blocks[cfg.loops[i]["header"]].loops) - {i}
+    poly = {}
+    for b in cfg.loops[i]["body"]:
+        poly = poly_add(poly, cfg.count(b, outer), cfg.blocks[b].cycles)
+    return poly
+
+
+def source_of(source, labels, pc: int) -> str:
+    ln, text = source[pc] if pc < len(source) else (None, "?")
+    where = f"{ln:4d}" if ln is not None else "   -"
+    label = f"{labels[pc]}: " if pc in labels else ""
+    return f"{where}  0x{pc << 2:04X}  {label}{text}"
+
+
+def report(cfg: CFG, source, labels, iters: dict = None, default: int = DEFAULT_ITERS,
+           top: int = 5, listing: bool = False) -> dict:
+    est = estimate(cfg, iters, default)
+    names = [l["var"] for l in cfg.loops]
+    values = est["values"]
+    total_c = poly_eval(est["cycles"], values)
+    total_i = poly_eval(est["instrs"], values)
+
+    print(f"== {len(cfg.blocks)} bloques, {len(cfg.loops)} bucles ==")
+    for b, blk in enumerate(cfg.blocks):
+        succ = ", ".join([f"B{s}" for s in blk.succ] + blk.exits) or "-"
+        mix = " ".join(f"{k}×{v}" for k, v in sorted(blk.kinds.items()))
+        print(f"B{b:<3} 0x{blk.start << 2:04X}-0x{(blk.end - 1) << 2:04X}  {blk.cycles:4d} ciclos"
+              f"  {mix:24} -> {succ}")
+
+    if cfg.loops:
+        print("\n== Bucles (ciclos por entrada) ==")
+        for i in cfg.loop_order:
+            loop = cfg.loops[i]
+            head = cfg.blocks[loop["header"]].start
+            name = labels.get(head, f"0x{head << 2:04X}")
+            depth = len(cfg.blocks[loop["header"]].loops) - 1
+            kind = "prueba arriba" if loop["test"] is not None and loop["test"] not in loop["latches"] \
+                else "prueba abajo" if loop["test"] is not None else "sin salida fija"
+            print(f"{'  ' * depth}{loop['var']} = {name} ({kind}, {len(loop['body'])} bloques):"
+                  f"  {poly_str(loop_cost(cfg, i), names)}")
+
+    print("\n== Total ==")
+    print(f"ciclos        = {poly_str(est['cycles'], names)}")
+    print(f"instrucciones = {poly_str(est['instrs'], names)}")
+    if names:
+        print("con " + ", ".join(f"{n}={v}" for n, v in zip(names, values)) + ":")
+    print(f"  {total_c} ciclos, {total_i} instrucciones, CPI {total_c / max(total_i, 1):.3f}")
+
+    hot = sorted(range(len(cfg.blocks)), key=lambda b: -cfg.blocks[b].cycles * est["counts"][b])
+    print(f"\n== Bloques más calientes ==")
+    for b in hot[:top]:
+        blk = cfg.blocks[b]
+        share = blk.cycles * est["counts"][b]
+        print(f"B{b}: {est['counts'][b]} veces × {blk.cycles} = {share} ciclos "
+              f"({100 * share / max(total_c, 1):.1f} %)")
+        for pc in range(blk.start, blk.end):
+            print(f"  {cfg.info[pc][1]}c  {source_of(source, labels, pc)}")
+
+    if listing:
+        print("\n== Listado ==")
+        for pc in range(len(cfg.words)):
+            b = cfg.block_of.get(pc)
+            if b is None:
+                print(f"{'':>10}      {source_of(source, labels, pc)}")
+                continue
+            n = est["counts"][b]
+            print(f"{n:>10}× {cfg.info[pc][1]}c  {source_of(source, labels, pc)}")
+    return {"cycles": total_c, "instrs": total_i}
+
+
+def parse_iters(spec: str, cfg: CFG, labels) -> dict:
+    """'n1=100,bucle=8' -> {'n1': 100, 'n2': 8}; acepta la etiqueta de la cabecera."""
+    by_label = {labels[cfg.blocks[l["header"]].start]: l["var"]
+                for l in cfg.loops if cfg.blocks[l["header"]].start in labels}
+    out = {}
+    for item in filter(None, spec.split(",")):
+        name, _, value = item.partition("=")
+        var = by_label.get(name, name)
+        if var not in {l["var"] for l in cfg.loops}:
+            raise RuntimeError(f"Bucle desconocido: {name}")
+        out[var] = int(value)
+    return out
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python cycles.py <programa.asm|memfile.mem> [--iters=n1=100,bucle=8] "
+              "[--n=10] [--top=5] [--dialect=sc|gen|v2] [--listing]")
+        sys.exit(1)
+    try:
+        words, source, labels = load_program(args[0], opts.get("dialect", "sc"))
+        cfg = CFG(words)
+        report(cfg, source, labels, parse_iters(opts.get("iters", ""), cfg, labels),
+               int(opts.get("n", DEFAULT_ITERS)), int(opts.get("top", 5)), "--listing" in sys.argv)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  disasm.py – Desensamblador de imágenes de memoria
+#  Las tablas de decodificación salen del propio ensamblador (dp_instr,
+#  mul_long_cmd, mem_instr, conds, spc_instr y el índice de mnemónicos),
+#  así cada fork se desensambla con sus códigos:
+#    sc   scpython.py                      (por defecto, el de out.memfile)
+#    gen  script_smul_umul_generator.py
+#    v2   ASM_v2.py
+#  Los campos de toda la imagen se extraen y clasifican de una vez con
+#  máscaras de NumPy; el texto se arma al final, forma por forma y una
+#  sola vez por cada valor distinto (salvo los B, que dependen del pc).
+#  Cada forma exige exactamente los bits que pone assemble_instruction,
+#  de modo que reensamblar la salida devuelve la misma imagen. Lo que
+#  el ensamblador no puede generar queda como comentario "// ???".
+# ──────────────────────────────────────────────────────────────
+import importlib
+import sys
+
+import numpy as np
+
+DIALECTS = {
+    "sc": "scpython",
+    "gen": "script_smul_umul_generator",
+    "v2": "ASM_v2",
+}
+DEFAULT_DIALECT = "sc"
+
+# Instrucciones cuyo encoding ignora el bit S del mnemónico
+S_FREE = ("MOV", "MOVM", "MOVT", "B", "STR", "LDR", "STRB", "LDRB")
+
+
+def load_assembler(dialect: str = DEFAULT_DIALECT):
+    if dialect not in DIALECTS:
+        raise RuntimeError(f"Dialecto desconocido: {dialect} (use {', '.join(DIALECTS)})")
+    return importlib.import_module(DIALECTS[dialect]).ARM_Assembler()
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Tablas
+# ──────────────────────────────────────────────────────────────
+def spellings(asm) -> dict:
+    """(op, cond, S) -> mnemónico más corto que el ensamblador acepta.
+
+    Sale del índice de mnemónicos, así que respeta sus rarezas: p. ej.
+    ADDCS se lee como ADDC + S y no existe, pero ADDCSS sí (CS con S=1).
+    """
+    out = {}
+    for text, (op, cond, s) in asm.mnemonics.items():
+        key = (op, asm.conds[cond], int(s))
+        if key not in out or len(text) < len(out[key]):
+            out[key] = text
+    return out
+
+
+def _mnemonic_table(spell: dict, op: str):
+    """Arreglo de 32 entradas (cond << 1 | S) con el mnemónico o None."""
+    table = np.empty(32, dtype=object)
+    for cond in range(16):
+        for s in (0, 1):
+            text = spell.get((op, cond, s))
+            if text is None and op in S_FREE:
+                text = spell.get((op, cond, 1 - s))
+            table[cond << 1 | s] = text
+    return table
+
+
+class Form:
+    """Una forma de instrucción: máscara sobre los campos y plantilla."""
+
+    def __init__(self, op, match, template, cols, s_field=True):
+        self.op = op
+        self.match = match          # f(campos) -> máscara booleana
+        self.template = template    # "%s R%d, ..." (el primer %s es el mnemónico)
+        self.cols = cols            # nombres de campos para la plantilla
+        self.s_field = s_field      # False: el bit 20 no es S (MEM, SPC)
+
+
+def build_forms(asm) -> list:
+    """Formas en el mismo orden de prioridad que assemble_instruction."""
+    dp = asm.dp_instr
+    forms = []
+
+    # SMUL / UMUL multiply-long: 27-24 = 0000, cmd en 23-21, patrón 1001
+    for op, cmd in getattr(asm, "mul_long_cmd", {}).items():
+        forms.append(Form(op, lambda f, c=cmd: (f["w"] & 0x0F0000F0 == 0x90) & (f["cmd3"] == c),
+                          "%s R%d, R%d, R%d, R%d", ("Rn", "Rm0", "Rm8", "Rd")))
+
+    def dp_op(cmd):
+        return lambda f: (f["op"] == 0) & (f["cmd"] == cmd)
+
+    def reg_op2(f):
+        return (f["I"] == 0) & (f["op2"] < 16)
+
+    # FADD / FMUL: siempre reg-reg, FMUL con el bit 4 de operand2
+    for op, bit in (("FADD", 0), ("FMUL", 0x10)):
+        if op in dp:
+            is_dp = dp_op(dp[op])
+            forms.append(Form(op, lambda f, d=is_dp, b=bit: d(f) & (f["I"] == 0)
+                              & (f["op2"] & 0xFEF < 16) & (f["op2"] & 0x10 == b),
+                              "%s R%d, R%d, R%d", ("Rd", "Rn", "Rm0")))
+
+    if "MOV" in dp:
+        is_mov = dp_op(dp["MOV"])
+        # S se fuerza a 0 y Rn se codifica en cero
+        forms.append(Form("MOV", lambda f: is_mov(f) & (f["S"] == 0) & (f["Rn"] == 0) & (f["I"] == 1),
+                          "%s R%d, #%d", ("Rd", "op2")))
+        forms.append(Form("MOV", lambda f: is_mov(f) & (f["S"] == 0) & (f["Rn"] == 0) & reg_op2(f),
+                          "%s R%d, R%d", ("Rd", "op2")))
+
+    # MOVM #imm8 / MOVT #imm12 (scpython, las usa MOV32): igual que MOV #imm
+    for op, top in (("MOVM", 0xFF), ("MOVT", 0xFFF)):
+        if op in dp:
+            is_mv = dp_op(dp[op])
+            forms.append(Form(op, lambda f, d=is_mv, t=top: d(f) & (f["S"] == 0) & (f["Rn"] == 0)
+                              & (f["I"] == 1) & (f["op2"] <= t),
+                              "%s R%d, #%d", ("Rd", "op2")))
+
+    # LSL / LSR: operand2 = shift_imm << 7 | tipo << 5 | Rm, Rn = 0
+    for op, kind in (("LSL", 0), ("LSR", 1)):
+        if op in dp:
+            is_sh = dp_op(dp[op])
+            forms.append(Form(op, lambda f, d=is_sh, k=kind: d(f) & (f["I"] == 0) & (f["Rn"] == 0)
+                              & (f["op2"] & 0x70 == k << 5),
+                              "%s R%d, R%d, #%d", ("Rd", "Rm0", "sh")))
+
+    # MUL / DIV (y SMUL / UMUL en ASM_v2): Rd, Rm, Rs con Rm en el campo Rn
+    special = {"MOV", "MOVM", "MOVT", "LSL", "LSR", "FADD", "FMUL"}
+    three = [op for op in ("MUL", "SMUL", "UMUL", "DIV") if op in dp]
+    for op in three:
+        is_op = dp_op(dp[op])
+        forms.append(Form(op, lambda f, d=is_op: d(f) & reg_op2(f),
+                          "%s R%d, R%d, R%d", ("Rd", "Rn", "op2")))
+
+    # Resto de DP: reg,reg,reg o reg,reg,#imm
+    for op, cmd in dp.items():
+        if op in special or op in three:
+            continue
+        is_op = dp_op(cmd)
+        forms.append(Form(op, lambda f, d=is_op: d(f) & reg_op2(f),
+                          "%s R%d, R%d, R%d", ("Rd", "Rn", "op2")))
+        forms.append(Form(op, lambda f, d=is_op: d(f) & (f["I"] == 1),
+                          "%s R%d, R%d, #%d", ("Rd", "Rn", "op2")))
+
+    # Memoria: P=1, U=1, W=0; I=1 es registro (al revés que en ARM)
+    for op, code in asm.mem_instr.items():
+        bits = 0b01 << 26 | 1 << 24 | 1 << 23 | (code >> 1 & 1) << 22 | (code & 1) << 20
+        is_mem = lambda f, b=bits: f["w"] & 0x0DF00000 == b
+        forms.append(Form(op, lambda f, m=is_mem: m(f) & (f["I"] == 1) & (f["op2"] < 16),
+                          "%s R%d, [R%d, R%d]", ("Rd", "Rn", "op2"), s_field=False))
+        forms.append(Form(op, lambda f, m=is_mem: m(f) & (f["I"] == 0),
+                          "%s R%d, [R%d, #%d]", ("Rd", "Rn", "op2"), s_field=False))
+
+    # B: destino = pc + 2 + offset, solo si cae dentro de la imagen
+    for op in asm.b_instr:
+        forms.append(Form(op, lambda f: is_branch(f["w"]) & f["target_ok"],
+                          "%s L%d", ("target",), s_field=False))
+
+    # Especiales (solo ASM_v2 las codifica): 11 | valor << 20 | 4 registros
+    if asm.spc_instr and "ADDLNG" in asm.spc_instr:
+        for op, val in asm.spc_instr.items():
+            forms.append(Form(op, lambda f, v=val: (f["w"] >> 20 & 0xFF == 0b11 << 6 | v)
+                              & (f["w"] & 0xF == 0),
+                              "%s R%d, R%d, R%d, R%d", ("Rn", "Rd", "Rm8", "Rm4"), s_field=False))
+
+    # El fork tiene que aceptar la forma (script_smul_umul_generator no
+    # ensambla MOV Rd, Rm; esas palabras salen como LSL Rd, Rm, #0)
+    return [form for form in forms if _accepts(asm, form)]
+
+
+def _accepts(asm, form) -> bool:
+    if form.cols == ("target",):
+        return True
+    text = form.template % ((form.op,) + tuple(range(1, len(form.cols) + 1)))
+    try:
+        asm.assemble_instruction(asm.tokenize_instruction(text), 0)
+    except Exception:
+        return False
+    return True
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Decodificación vectorizada
+# ──────────────────────────────────────────────────────────────
+def fields(words, pc=None, n: int = 0) -> dict:
+    """Campos de todas las palabras; pc/n solo hacen falta para los B."""
+    w = np.asarray(words, dtype=np.uint32)
+    f = {
+        "w": w,
+        "cond": w >> 28,
+        "op": w >> 26 & 3,
+        "I": w >> 25 & 1,
+        "cmd": w >> 21 & 0xF,
+        "cmd3": w >> 21 & 7,
+        "S": w >> 20 & 1,
+        "Rn": w >> 16 & 0xF,
+        "Rd": w >> 12 & 0xF,
+        "op2": w & 0xFFF,
+        "Rm8": w >> 8 & 0xF,
+        "Rm4": w >> 4 & 0xF,
+        "Rm0": w & 0xF,
+        "sh": w >> 7 & 0x1F,
+    }
+    if pc is None:
+        f["target"] = np.zeros(len(w), dtype=np.int64)
+        f["target_ok"] = np.zeros(len(w), dtype=bool)
+        return f
+    # offset de 24 bits con signo; la etiqueta puede ir justo tras la última
+    offset = (w & 0xFFFFFF).astype(np.int64)
+    offset -= (offset & 0x800000) << 1
+    target = np.asarray(pc, dtype=np.int64) + 2 + offset
+    f["target"] = target
+    f["target_ok"] = (target >= 0) & (target <= n)
+    return f
+
+
+def is_branch(w):
+    return w & 0x0F000000 == 0b101 << 25
+
+
+class Disassembler:
+    def __init__(self, asm=None) -> None:
+        self.asm = asm if asm is not None else load_assembler()
+        spell = spellings(self.asm)
+        self.forms = build_forms(self.asm)
+        self.tables = [_mnemonic_table(spell, form.op) for form in self.forms]
+
+    def classify(self, f: dict):
+        """Índice de forma por palabra (-1 = no representable) y mnemónicos."""
+        n = len(f["w"])
+        kind = np.full(n, -1, dtype=np.int16)
+        mnem = np.empty(n, dtype=object)
+        sel_s = f["cond"] << 1 | f["S"]
+        sel_free = f["cond"] << 1
+        for k, (form, table) in enumerate(zip(self.forms, self.tables)):
+            free = kind < 0
+            if not free.any():
+                break
+            hit = free & form.match(f)
+            if not hit.any():
+                continue
+            idx = np.flatnonzero(hit)
+            names = table[(sel_s if form.s_field else sel_free)[idx]]
+            ok = names != None        # noqa: E711  (comparación elemento a elemento)
+            idx = idx[ok]
+            kind[idx] = k
+            mnem[idx] = names[ok]
+        return kind, mnem
+
+    def render(self, f: dict):
+        """Texto de cada palabra (None si no es representable)."""
+        kind, mnem = self.classify(f)
+        lines = np.empty(len(kind), dtype=object)
+        for k, form in enumerate(self.forms):
+            idx = np.flatnonzero(kind == k)
+            if not len(idx):
+                continue
+            # un solo % por forma: plantilla repetida y columnas intercaladas
+            args = np.empty((len(idx), len(form.cols) + 1), dtype=object)
+            args[:, 0] = mnem[idx]
+            for j, c in enumerate(form.cols, 1):
+                args[:, j] = f[c][idx].tolist()
+            text = (form.template + "\n") * len(idx) % tuple(args.ravel().tolist())
+            lines[idx] = text.split("\n")[:-1]
+        return lines
+
+    def disassemble(self, words) -> tuple[list[str], list[int]]:
+        """Líneas de ensamblador y direcciones que no se pudieron representar."""
+        w = np.asarray(words, dtype=np.uint32)
+        n = len(w)
+        lines = np.empty(n, dtype=object)
+
+        # Fuera de los B el texto solo depende de la palabra: se decodifica
+        # cada valor distinto una vez (un programa repite mucho sus palabras)
+        br = is_branch(w)
+        rest = np.flatnonzero(~br)
+        uniq, inv = np.unique(w[rest], return_inverse=True)
+        lines[rest] = self.render(fields(uniq))[inv]
+
+        pcs = np.flatnonzero(br)
+        fb = fields(w[pcs], pcs, n)
+        text = self.render(fb)
+        lines[pcs] = text
+        targets = fb["target"][text != None]     # noqa: E711
+
+        bad = np.flatnonzero(lines == None)     # noqa: E711
+        if len(bad):
+            text = "// ??? 0x%08X\n" * len(bad) % tuple(w[bad].tolist())
+            lines[bad] = text.split("\n")[:-1]
+        lines, bad = lines.tolist(), bad.tolist()
+
+        # etiquetas de los saltos que sí se desensamblaron
+        for t in np.unique(targets).tolist():
+            if t < n:
+                lines[t] = f"L{t}: {lines[t]}"
+            else:
+                lines.append(f"L{t}:")
+        return lines, bad
+
+
+def disassemble(words, dialect: str = DEFAULT_DIALECT):
+    return Disassembler(load_assembler(dialect)).disassemble(words)
+
+
+def reassemble_check(lines, words, dialect: str = DEFAULT_DIALECT) -> int:
+    """Reensambla con el fork original; devuelve la primera diferencia o -1."""
+    codes, _ = load_assembler(dialect).assemble_program("\n".join(lines) + "\n")
+    words = np.asarray(words, dtype=np.uint32)
+    if len(codes) == len(words) and (np.asarray(codes, dtype=np.uint32) == words).all():
+        return -1
+    diff = np.flatnonzero(np.asarray(codes[:len(words)], dtype=np.uint32) != words[:len(codes)])
+    return int(diff[0]) if len(diff) else min(len(codes), len(words))
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  main
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python disasm.py [--dialect=sc|gen|v2] [--format=<fmt>] [--listing] [--check] "
+              "<imagen> [salida.asm]")
+        sys.exit(1)
+    opts = dict(a[2:].split("=", 1) for a in flags if "=" in a)
+    dialect = opts.get("dialect", DEFAULT_DIALECT)
+
+    import memimage
+    words = memimage.load_image(args[0], opts.get("format"))
+    lines, bad = disassemble(words, dialect)
+
+    out = lines
+    if "--listing" in flags:
+        # dirección y palabra como comentario: el ensamblador los ignora
+        out = list(lines)
+        for i, w in enumerate(np.asarray(words, dtype=np.uint32).tolist()):
+            if not out[i].startswith("// ???"):
+                out[i] = f"{out[i]:32}// {i:04X}: {w:08X}"
+
+    text = "\n".join(out) + "\n"
+    if len(args) > 1:
+        with open(args[1], "w") as fh:
+            fh.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if bad:
+        print(f"AVISO: {len(bad)} palabras sin codificación en {dialect} "
+              f"(primera en {bad[0]:04X}); la salida no reensambla igual", file=sys.stderr)
+    if "--check" in flags:
+        first = reassemble_check(lines, words, dialect)
+        if first >= 0:
+            print(f"ERROR: el reensamblado difiere en la palabra {first:04X}", file=sys.stderr)
+            sys.exit(1)
+        print(f"OK: {len(words)} palabras reensambladas idénticas", file=sys.stderr)
+    sys.exit(1 if bad else 0)
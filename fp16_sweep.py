@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  fp16_sweep.py – Barrido exhaustivo de fadd16.v / fmul16.v
+#  Las 2^32 parejas (a, b) de 16 bits se parten en fragmentos de
+#  SHARD_A valores de a por 65536 de b. Cada fragmento se calcula con
+#  el modelo bit a bit de fpu_np.py y se compara contra binary16
+#  IEEE 754 con redondeo al par, para caracterizar en qué difiere el
+#  RTL del estándar (que el modelo es el RTL lo verifican tb_fpu.v y
+#  fpu_vectors.py).
+#  Los fragmentos terminados se guardan como .npz en el directorio de
+#  salida (escritura atómica) con la referencia usada, así un barrido
+#  interrumpido se reanuda donde quedó y un fragmento de otra
+#  referencia se rehace en vez de sumarse. El informe suma conteos
+#  por clase de entrada (NaN, inf, denormal, cero, normal) y tipo de
+#  diferencia, con algunos ejemplos.
+# ──────────────────────────────────────────────────────────────
+import glob
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+import fpu_np
+
+OPS = {"fadd16": fpu_np.fadd16, "fmul16": fpu_np.fmul16}
+SHARD_A = 64                    # valores de a por fragmento (4M parejas)
+BLOCK_A = 16                    # valores de a por bloque en memoria (1M)
+SHARDS = 65536 // SHARD_A
+EXAMPLES = 4                    # ejemplos guardados por celda y fragmento
+REFERENCE = "ieee"              # se guarda en cada fragmento
+
+INPUT_CLASSES = ("normal", "zero", "denormal", "inf", "nan")
+DIFF_KINDS = ("match", "ulp", "overflow", "underflow", "nan", "sign", "other")
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Clases y referencia IEEE
+# ──────────────────────────────────────────────────────────────
+def half_class(h):
+    """Índice en INPUT_CLASSES de cada patrón de 16 bits."""
+    h = np.asarray(h, dtype=np.uint32)
+    exp, mant = h >> 10 & 0x1F, h & 0x3FF
+    cls = np.zeros(h.shape, dtype=np.uint8)
+    cls[(exp == 0) & (mant == 0)] = 1
+    cls[(exp == 0) & (mant != 0)] = 2
+    cls[(exp == 31) & (mant == 0)] = 3
+    cls[(exp == 31) & (mant != 0)] = 4
+    return cls
+
+
+_CLASS16 = half_class(np.arange(65536))
+# binary16 -> float64 exacto; en float64 la suma y el producto de dos
+# half son exactos, así el único redondeo es el de vuelta a float16
+_VALUE16 = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float64)
+
+
+def ieee16(op: str, a, b):
+    x, y = _VALUE16[a], _VALUE16[b]
+    with np.errstate(all="ignore"):
+        r = x + y if op == "fadd16" else x * y
+    return r.astype(np.float16).view(np.uint16).astype(np.uint32)
+
+
+def diff_kind(got, ref):
+    """Índice en DIFF_KINDS de cada par (modelo, referencia)."""
+    got_cls, ref_cls = _CLASS16[got], _CLASS16[ref]
+    kind = np.full(got.shape, DIFF_KINDS.index("other"), dtype=np.uint8)
+    # distancia en el orden de las magnitudes (mismo signo)
+    same_sign = (got ^ ref) >> 15 == 0
+    near = same_sign & (np.abs((got & 0x7FFF).astype(np.int32) - (ref & 0x7FFF).astype(np.int32)) <= 1)
+    kind[near] = DIFF_KINDS.index("ulp")
+    kind[(got & 0x7FFF) == (ref & 0x7FFF)] = DIFF_KINDS.index("sign")
+    kind[(ref_cls == 1) | (ref_cls == 2)] = DIFF_KINDS.index("underflow")
+    kind[ref_cls == 3] = DIFF_KINDS.index("overflow")
+    kind[ref_cls == 4] = DIFF_KINDS.index("nan")
+    # bits iguales, o ambos NaN (cualquier carga útil), cuentan como iguales
+    kind[(got == ref) | ((got_cls == 4) & (ref_cls == 4))] = DIFF_KINDS.index("match")
+    return kind
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Fragmentos
+# ──────────────────────────────────────────────────────────────
+def shard_path(out_dir: str, op: str, shard: int) -> str:
+    return os.path.join(out_dir, f"{op}_{shard:04d}.npz")
+
+
+def run_shard(job) -> tuple:
+    """Calcula y guarda un fragmento; devuelve (fragmento, segundos)."""
+    op, shard, out_dir = job
+    t0 = time.perf_counter()
+    model = OPS[op]
+    counts = np.zeros((len(INPUT_CLASSES), len(DIFF_KINDS)), dtype=np.int64)
+    examples = []
+    seen = set()
+
+    b_all = np.arange(65536, dtype=np.uint32)
+    for blk in range(0, SHARD_A, BLOCK_A):
+        a0 = shard * SHARD_A + blk
+        a = np.repeat(np.arange(a0, a0 + BLOCK_A, dtype=np.uint32), 65536)
+        b = np.tile(b_all, BLOCK_A)
+        got = model(a, b)
+        ref = ieee16(op, a, b)
+        kind = diff_kind(got, ref)
+        # la clase de la pareja es la más "especial" de sus dos entradas
+        cls = np.maximum(_CLASS16[a], _CLASS16[b])
+        counts += np.bincount(cls.astype(np.intp) * len(DIFF_KINDS) + kind,
+                              minlength=counts.size).reshape(counts.shape)
+
+        bad = np.flatnonzero(kind != 0)
+        if len(bad):
+            # primeros ejemplos de cada celda (clase, tipo) sin recorrer todo
+            cell = cls[bad].astype(np.intp) * len(DIFF_KINDS) + kind[bad]
+            cells, first = np.unique(cell, return_index=True)
+            for c, i in zip(cells.tolist(), first.tolist()):
+                if c in seen:
+                    continue
+                seen.add(c)
+                pick = bad[cell == c][:EXAMPLES]
+                for j in pick.tolist():
+                    examples.append((c // len(DIFF_KINDS), c % len(DIFF_KINDS),
+                                     int(a[j]), int(b[j]), int(got[j]), int(ref[j])))
+
+    path = shard_path(out_dir, op, shard)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, counts=counts, examples=np.array(examples, dtype=np.uint32).reshape(-1, 6),
+             against=np.array(REFERENCE))
+    os.replace(tmp, path)
+    return shard, time.perf_counter() - t0
+
+
+def _reference(path: str):
+    """Referencia guardada en un fragmento, o None si falta o no se lee."""
+    try:
+        with np.load(path) as z:
+            return str(z["against"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def pending(out_dir: str, op: str, shards) -> list:
+    """Fragmentos por hacer: los que faltan y los de otra referencia."""
+    return [s for s in shards if _reference(shard_path(out_dir, op, s)) != REFERENCE]
+
+
+def sweep(op: str, out_dir: str, jobs: int = None, shards=None) -> None:
+    if op not in OPS:
+        raise RuntimeError(f"Operación desconocida: {op} (use {', '.join(OPS)})")
+    os.makedirs(out_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(out_dir, "*.tmp.npz")):
+        os.unlink(stale)
+    todo = pending(out_dir, op, range(SHARDS) if shards is None else shards)
+    total = SHARDS if shards is None else len(shards)
+    print(f"{op}: {total - len(todo)}/{total} fragmentos ya hechos, faltan {len(todo)}")
+    if not todo:
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    done = 0
+    with Pool(jobs) as pool:
+        for shard, secs in pool.imap_unordered(run_shard, [(op, s, out_dir) for s in todo]):
+            done += 1
+            wall = time.perf_counter() - t0
+            eta = wall / done * (len(todo) - done)
+            print(f"\r  {done}/{len(todo)} fragmentos  {done * (SHARD_A << 16) / wall / 1e6:6.1f} M/s"
+                  f"  quedan ~{eta / 60:.0f} min", end="", flush=True)
+    print()
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Informe
+# ──────────────────────────────────────────────────────────────
+def report(out_dir: str, op: str, show: int = 2) -> int:
+    """Suma los fragmentos guardados; devuelve el número de diferencias."""
+    files = sorted(glob.glob(os.path.join(out_dir, f"{op}_[0-9][0-9][0-9][0-9].npz")))
+    counts = np.zeros((len(INPUT_CLASSES), len(DIFF_KINDS)), dtype=np.int64)
+    examples = {}
+    against = set()
+    for path in files:
+        with np.load(path) as z:
+            counts += z["counts"]
+            against.add(str(z["against"]))
+            for cls, kind, a, b, got, ref in z["examples"].tolist():
+                examples.setdefault((cls, kind), [])
+                if len(examples[(cls, kind)]) < show:
+                    examples[(cls, kind)].append((a, b, got, ref))
+
+    if len(against) > 1:
+        raise RuntimeError(f"{out_dir}: fragmentos contra referencias distintas "
+                           f"({', '.join(sorted(against))}); rehaga el barrido con 'run'")
+    total = int(counts.sum())
+    bad = total - int(counts[:, 0].sum())
+    ref_name = against.pop() if against else "-"
+    print(f"== {op} contra {ref_name}: {len(files)}/{SHARDS} fragmentos, "
+          f"{total} parejas, {bad} diferencias ({100 * bad / max(total, 1):.2f} %) ==")
+    print(f"{'entrada':9}" + "".join(f"{k:>13}" for k in DIFF_KINDS))
+    for i, name in enumerate(INPUT_CLASSES):
+        print(f"{name:9}" + "".join(f"{int(v):13d}" for v in counts[i]))
+    for (cls, kind), rows in sorted(examples.items()):
+        for a, b, got, ref in rows:
+            print(f"  {INPUT_CLASSES[cls]:8} {DIFF_KINDS[kind]:9} a={a:04X} b={b:04X} "
+                  f"rtl={got:04X} ref={ref:04X}")
+    return bad
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2 or args[0] not in ("run", "report"):
+        print("Uso: python fp16_sweep.py run <fadd16|fmul16> [salida] [--jobs=N] [--shards=I:J]")
+        print("     python fp16_sweep.py report <fadd16|fmul16> [salida]")
+        sys.exit(1)
+    cmd, op = args[0], args[1]
+    out_dir = args[2] if len(args) > 2 else f"sweep_{op}"
+
+    try:
+        if cmd == "run":
+            shards = None
+            if "shards" in opts:
+                lo, hi = opts["shards"].split(":")
+                shards = range(int(lo), int(hi))
+            sweep(op, out_dir, int(opts["jobs"]) if "jobs" in opts else None, shards)
+        report(out_dir, op)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,84 @@
+# ──────────────────────────────────────────────────────────────
+#  fpu.py – Modelo en Python de fadd.v / fmul.v / fadd16.v / fmul16.v
+#  Reproduce el RTL bit a bit (sin redondeo, sin casos especiales,
+#  normalización sólo por carry), NO el estándar IEEE 754.
+# ──────────────────────────────────────────────────────────────
+
+
+def _fadd(a, b, exp_bits, mant_bits):
+    sign_shift = exp_bits + mant_bits
+    exp_mask = (1 << exp_bits) - 1
+    mant_mask = (1 << mant_bits) - 1
+    hidden = 1 << mant_bits
+    full_mask = (hidden << 1) - 1          # ancho de norm_mant / aligned_mant
+
+    sign_a, exp_a, mant_a = a >> sign_shift & 1, a >> mant_bits & exp_mask, a & mant_mask
+    sign_b, exp_b, mant_b = b >> sign_shift & 1, b >> mant_bits & exp_mask, b & mant_mask
+    norm_a = hidden | mant_a
+    norm_b = hidden | mant_b
+
+    # Paso 3-5: alinear la mantisa del exponente menor y sumar/restar
+    if exp_a >= exp_b:
+        big, aligned = norm_a, norm_b >> (exp_a - exp_b)
+        pre_norm_exp, result_sign = exp_a, sign_a
+    else:
+        big, aligned = norm_b, norm_a >> (exp_b - exp_a)
+        pre_norm_exp, result_sign = exp_b, sign_b
+    if sign_a == sign_b:
+        add_result = big + aligned
+    else:
+        add_result = big - aligned
+    add_result &= (full_mask << 1) | 1     # add_result tiene un bit más
+
+    # Paso 6: sólo se normaliza cuando hay carry
+    if add_result >> (mant_bits + 1):
+        exp = (pre_norm_exp + 1) & exp_mask
+        mant = (add_result >> 1) & mant_mask
+    else:
+        exp = pre_norm_exp
+        mant = add_result & mant_mask
+    return (result_sign << sign_shift) | (exp << mant_bits) | mant
+
+
+def _fmul(a, b, exp_bits, mant_bits, bias):
+    sign_shift = exp_bits + mant_bits
+    exp_mask = (1 << exp_bits) - 1
+    mant_mask = (1 << mant_bits) - 1
+    hidden = 1 << mant_bits
+    mag_mask = (1 << sign_shift) - 1
+
+    result_sign = (a ^ b) >> sign_shift & 1
+    if not (a & mag_mask) or not (b & mag_mask):
+        return result_sign << sign_shift
+
+    exp_a, exp_b = a >> mant_bits & exp_mask, b >> mant_bits & exp_mask
+    pre_norm_exp = (exp_a + exp_b - bias) & exp_mask
+    mult = (hidden | (a & mant_mask)) * (hidden | (b & mant_mask))
+
+    if mult >> (2 * mant_bits + 1):
+        exp = (pre_norm_exp + 1) & exp_mask
+        mant = (mult >> (mant_bits + 1)) & mant_mask
+    else:
+        exp = pre_norm_exp
+        mant = (mult >> mant_bits) & mant_mask
+    return (result_sign << sign_shift) | (exp << mant_bits) | mant
+
+
+def fadd32(a: int, b: int) -> int:
+    """FADDS tal como lo calcula fadd.v."""
+    return _fadd(a, b, 8, 23)
+
+
+def fmul32(a: int, b: int) -> int:
+    """FMULS tal como lo calcula fmul.v."""
+    return _fmul(a, b, 8, 23, 127)
+
+
+def fadd16(a: int, b: int) -> int:
+    """FADDH tal como lo calcula fadd16.v (16 bits bajos)."""
+    return _fadd(a & 0xFFFF, b & 0xFFFF, 5, 10)
+
+
+def fmul16(a: int, b: int) -> int:
+    """FMULH tal como lo calcula fmul16.v (16 bits bajos)."""
+    return _fmul(a & 0xFFFF, b & 0xFFFF, 5, 10, 15)
@@ -0,0 +1,86 @@
+# ──────────────────────────────────────────────────────────────
+#  fpu_np.py – Versión vectorizada (NumPy) de fpu.py
+#  Mismo comportamiento bit a bit que fadd.v / fmul.v / fadd16.v /
+#  fmul16.v, pero sobre arreglos uint32 completos.
+# ──────────────────────────────────────────────────────────────
+import numpy as np
+
+
+def _fadd(a, b, exp_bits, mant_bits):
+    sign_shift = exp_bits + mant_bits
+    exp_mask = np.uint32((1 << exp_bits) - 1)
+    mant_mask = np.uint32((1 << mant_bits) - 1)
+    hidden = np.uint32(1 << mant_bits)
+    a = np.asarray(a, dtype=np.uint32)
+    b = np.asarray(b, dtype=np.uint32)
+
+    # Paso 3-4: el operando de exponente mayor (o igual: gana a) da signo
+    # y pre_norm_exp; el otro se alinea con exp_diff de 8 bits completo
+    exp_a = a >> mant_bits & exp_mask
+    exp_b = b >> mant_bits & exp_mask
+    swap = exp_b > exp_a
+    hi = np.where(swap, b, a)
+    lo = np.where(swap, a, b)
+    pre_norm_exp = np.where(swap, exp_b, exp_a)
+    exp_diff = pre_norm_exp - np.where(swap, exp_a, exp_b)
+    # >> de Verilog con exp_diff >= ancho deja 0; en NumPy hay que acotarlo
+    exp_diff = np.minimum(exp_diff, np.uint32(mant_bits + 1))
+    aligned_mant = (lo & mant_mask | hidden) >> exp_diff
+
+    # Paso 5: suma o resta en add_result (un bit más que la mantisa
+    # normalizada); la resta con la mantisa alineada mayor da la vuelta
+    # y aparece como carry, igual que en el RTL
+    sub = (a ^ b) >> sign_shift & 1
+    add_result = (hi & mant_mask | hidden) + (aligned_mant ^ (np.uint32(0) - sub)) + sub
+    add_result &= (hidden << 2) - 1
+
+    # Paso 6: sólo se normaliza cuando hay carry; normalized_mant_full
+    # (add_result >> 1 o add_result[mant:0]) se trunca a mant_bits
+    carry = add_result >> (mant_bits + 1)
+    normalized_exp = (pre_norm_exp + carry) & exp_mask
+    normalized_mant = (add_result >> carry) & mant_mask
+    return hi >> sign_shift << sign_shift | normalized_exp << mant_bits | normalized_mant
+
+
+def _fmul(a, b, exp_bits, mant_bits, bias):
+    sign_shift = exp_bits + mant_bits
+    exp_mask = np.uint32((1 << exp_bits) - 1)
+    mant_mask = (1 << mant_bits) - 1
+    mag_mask = np.uint32((1 << sign_shift) - 1)
+    a = np.asarray(a, dtype=np.uint32)
+    b = np.asarray(b, dtype=np.uint32)
+
+    result_sign = (a ^ b) >> sign_shift << sign_shift
+    is_result_zero = ((a & mag_mask) == 0) | ((b & mag_mask) == 0)
+
+    # exponente en exp_bits bits: la suma menos el sesgo da la vuelta
+    pre_norm_exp = ((a >> mant_bits & exp_mask) + (b >> mant_bits & exp_mask)
+                    - np.uint32(bias)) & exp_mask
+    hidden = np.uint64(1 << mant_bits)
+    mult = ((a & mant_mask).astype(np.uint64) | hidden) * ((b & mant_mask).astype(np.uint64) | hidden)
+    needs_norm = (mult >> (2 * mant_bits + 1)).astype(np.uint32)
+
+    normalized_exp = (pre_norm_exp + needs_norm) & exp_mask
+    normalized_mant = (mult >> (needs_norm.astype(np.uint64) + mant_bits)).astype(np.uint32) & mant_mask
+    result = np.where(is_result_zero, np.uint32(0), normalized_exp << mant_bits | normalized_mant)
+    return result | result_sign
+
+
+def fadd32(a, b):
+    """FADDS de fadd.v sobre arreglos."""
+    return _fadd(a, b, 8, 23)
+
+
+def fmul32(a, b):
+    """FMULS de fmul.v sobre arreglos."""
+    return _fmul(a, b, 8, 23, 127)
+
+
+def fadd16(a, b):
+    """FADDH de fadd16.v sobre los 16 bits bajos."""
+    return _fadd(np.asarray(a) & 0xFFFF, np.asarray(b) & 0xFFFF, 5, 10)
+
+
+def fmul16(a, b):
+    """FMULH de fmul16.v sobre los 16 bits bajos."""
+    return _fmul(np.asarray(a) & 0xFFFF, np.asarray(b) & 0xFFFF, 5, 10, 15)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  fpu_vectors.py – Vectores de regresión para FADDS/FMULS de alu.v
+#  El resultado esperado sale de fpu_np.py (fadd.v / fmul.v bit a bit,
+#  no IEEE 754), así que sirve para verificar el RTL por millones.
+#  Cada vector son 4 palabras en un $readmemh:
+#      a  b  Result  ALUFlags(NZCV)
+#  tb_fpu.v los lee, los pasa por alu.v y vuelca Result/ALUFlags con
+#  $writememh; "check" compara ese volcado contra los vectores.
+#
+#  Los operandos no son sólo aleatorios: se mezclan clases que tocan
+#  los caminos delicados del RTL (mismo exponente, cancelación, resta
+#  con exp_diff grande, ceros, exponentes 0/máximo, vuelta del
+#  exponente en fmul).
+# ──────────────────────────────────────────────────────────────
+import sys
+import time
+
+import numpy as np
+
+import fpu_np
+
+# nombre -> (ALUControl, modelo, bits de exponente, bits de mantisa)
+OPS = {
+    "fadds": (0b1000, fpu_np.fadd32, 8, 23),
+    "fmuls": (0b1001, fpu_np.fmul32, 8, 23),
+    "faddh": (0b1110, fpu_np.fadd16, 5, 10),
+    "fmulh": (0b1111, fpu_np.fmul16, 5, 10),
+}
+CLASSES = ("random", "same_exp", "near_exp", "cancel", "far_exp", "zero", "extreme", "exp_wrap")
+WORDS = 4
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Operandos
+# ──────────────────────────────────────────────────────────────
+def operands(n: int, exp_bits: int = 8, mant_bits: int = 23, seed: int = 0):
+    """(a, b, clase) con n pares repartidos entre CLASSES."""
+    rng = np.random.default_rng(seed)
+    width = 1 + exp_bits + mant_bits
+    word_mask = (1 << width) - 1
+    exp_max = (1 << exp_bits) - 1
+    bias = exp_max >> 1
+    mant_mask = np.uint32((1 << mant_bits) - 1)
+
+    a = (rng.integers(0, 1 << 32, n, dtype=np.uint64) & word_mask).astype(np.uint32)
+    b = (rng.integers(0, 1 << 32, n, dtype=np.uint64) & word_mask).astype(np.uint32)
+    cls = rng.integers(0, len(CLASSES), n).astype(np.uint8)
+    exp_a = (a >> mant_bits).astype(np.int64) & exp_max
+    sign_b = b >> (width - 1) << (width - 1)
+
+    def with_exp(sel, exp, mant=None):
+        exp = (np.asarray(exp, dtype=np.int64) % (exp_max + 1)).astype(np.uint32)
+        mant = b[sel] & mant_mask if mant is None else mant
+        b[sel] = sign_b[sel] | exp << mant_bits | mant
+
+    k = cls == CLASSES.index("same_exp")
+    with_exp(k, exp_a[k])
+    k = cls == CLASSES.index("near_exp")
+    with_exp(k, exp_a[k] + rng.integers(-(mant_bits + 2), mant_bits + 3, int(k.sum())))
+    # misma magnitud salvo los bits bajos y signo opuesto: add_result chico
+    k = cls == CLASSES.index("cancel")
+    flip = rng.integers(0, 1 << min(8, mant_bits), int(k.sum())).astype(np.uint32)
+    b[k] = (a[k] ^ np.uint32(1 << (width - 1))) ^ flip
+    k = cls == CLASSES.index("far_exp")
+    with_exp(k, exp_a[k] + rng.choice([-1, 1], int(k.sum())) * rng.integers(mant_bits, exp_max, int(k.sum())))
+    k = np.flatnonzero(cls == CLASSES.index("zero"))
+    a[k[::2]] &= np.uint32(1 << (width - 1))           # ±0
+    b[k[1::2]] &= np.uint32(1 << (width - 1))
+    k = cls == CLASSES.index("extreme")
+    with_exp(k, rng.choice([0, exp_max], int(k.sum())))
+    # exp_a + exp_b - sesgo fuera de [0, exp_max]: el RTL da la vuelta
+    k = cls == CLASSES.index("exp_wrap")
+    hi = rng.integers(0, 2, int(k.sum()))
+    with_exp(k, np.where(hi == 1, exp_max - exp_a[k] + bias + rng.integers(0, 4, len(hi)),
+                         bias - exp_a[k] - rng.integers(0, 4, len(hi))))
+    return a, b, cls
+
+
+def alu_flags(result):
+    """ALUFlags de alu.v para FADD/FMUL: N = Result[31], Z, C = V = 0."""
+    result = np.asarray(result, dtype=np.uint32)
+    return (result >> 31 << 3 | (result == 0) << 2).astype(np.uint32)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Vectores
+# ──────────────────────────────────────────────────────────────
+def vectors(op: str, n: int, seed: int = 0):
+    """Arreglo (n, 4) uint32: a, b, Result, ALUFlags; y la clase de cada par."""
+    if op not in OPS:
+        raise RuntimeError(f"Operación desconocida: {op} (use {', '.join(OPS)})")
+    _, model, exp_bits, mant_bits = OPS[op]
+    a, b, cls = operands(n, exp_bits, mant_bits, seed)
+    out = np.empty((n, WORDS), dtype=np.uint32)
+    out[:, 0] = a
+    out[:, 1] = b
+    out[:, 2] = model(a, b)
+    out[:, 3] = alu_flags(out[:, 2])
+    return out, cls
+
+
+def operand_class(a, b, exp_bits: int = 8, mant_bits: int = 23):
+    """Clase aproximada de pares ya escritos (para agrupar diferencias)."""
+    exp_max = (1 << exp_bits) - 1
+    mag = np.uint32((1 << (exp_bits + mant_bits)) - 1)
+    exp_a = (a >> mant_bits).astype(np.int64) & exp_max
+    exp_b = (b >> mant_bits).astype(np.int64) & exp_max
+    diff = np.abs(exp_a - exp_b)
+    cls = np.full(len(a), CLASSES.index("random"), dtype=np.uint8)
+    cls[diff > mant_bits] = CLASSES.index("far_exp")
+    cls[(diff > 0) & (diff <= mant_bits)] = CLASSES.index("near_exp")
+    cls[diff == 0] = CLASSES.index("same_exp")
+    cls[(diff == 0) & ((a ^ b) >> (exp_bits + mant_bits) == 1)] = CLASSES.index("cancel")
+    cls[(exp_a == 0) | (exp_a == exp_max) | (exp_b == 0) | (exp_b == exp_max)] = CLASSES.index("extreme")
+    cls[((a & mag) == 0) | ((b & mag) == 0)] = CLASSES.index("zero")
+    return cls
+
+
+def check(vec, got, op: str = "fadds", show: int = 10) -> int:
+    """Compara el volcado de tb_fpu.v (Result, ALUFlags por vector)."""
+    vec = np.asarray(vec, dtype=np.uint32).reshape(-1, WORDS)
+    got = np.asarray(got, dtype=np.uint32).reshape(-1, 2)
+    if len(got) != len(vec):
+        raise RuntimeError(f"{len(vec)} vectores pero {len(got)} resultados")
+    bad = np.flatnonzero((got[:, 0] != vec[:, 2]) | ((got[:, 1] & 0xF) != vec[:, 3]))
+    print(f"{op}: {len(vec) - len(bad)}/{len(vec)} vectores coinciden")
+    if len(bad):
+        _, _, exp_bits, mant_bits = OPS[op]
+        cls = operand_class(vec[bad, 0], vec[bad, 1], exp_bits, mant_bits)
+        for c, count in zip(*np.unique(cls, return_counts=True)):
+            print(f"  {CLASSES[c]:9} {count}")
+        for i in bad[:show].tolist():
+            a, b, r, f = vec[i].tolist()
+            print(f"  #{i}: a={a:08X} b={b:08X} esperado={r:08X}/{f:04b} "
+                  f"obtenido={int(got[i, 0]):08X}/{int(got[i, 1]) & 0xF:04b}")
+    return len(bad)
+
+
+def self_check(op: str, n: int, seed: int = 0) -> int:
+    """fpu_np contra el modelo escalar fpu.py sobre n vectores."""
+    import fpu
+    scalar = getattr(fpu, OPS[op][1].__name__)
+    vec, _ = vectors(op, n, seed)
+    ref = [scalar(a, b) for a, b in vec[:, :2].tolist()]
+    return check(vec, np.stack([ref, alu_flags(ref)], axis=1), op)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  main
+# ──────────────────────────────────────────────────────────────
+USAGE = """Uso: python fpu_vectors.py gen <op> <n> [salida.mem] [--seed=S]
+       python fpu_vectors.py check <op> <vectores.mem> <resultados.mem>
+       python fpu_vectors.py self <op> <n>
+       python fpu_vectors.py bench <op> <n>
+op: """ + ", ".join(OPS)
+
+if __name__ == "__main__":
+    seed = next((int(a[7:]) for a in sys.argv if a.startswith("--seed=")), 0)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 3:
+        print(USAGE)
+        sys.exit(1)
+    cmd, op = args[0], args[1]
+
+    if cmd == "gen":
+        import memimage
+        n = int(args[2])
+        out = args[3] if len(args) > 3 else f"{op}.mem"
+        vec, cls = vectors(op, n, seed)
+        memimage.write_image(out, vec.ravel(), "hex")
+        print(f"{n} vectores {op} (ALUControl={OPS[op][0]:04b}) escritos en {out}")
+        print("  " + "  ".join(f"{CLASSES[c]}={k}" for c, k in zip(*np.unique(cls, return_counts=True))))
+    elif cmd == "check" and len(args) > 3:
+        import memimage
+        sys.exit(1 if check(memimage.load_image(args[2]), memimage.load_image(args[3]), op) else 0)
+    elif cmd == "self":
+        sys.exit(1 if self_check(op, int(args[2]), seed) else 0)
+    elif cmd == "bench":
+        n = int(args[2])
+        a, b, _ = operands(n, *OPS[op][2:], seed=seed)
+        t0 = time.perf_counter()
+        OPS[op][1](a, b)
+        dt = time.perf_counter() - t0
+        print(f"{op}: {n} resultados en {dt:.3f} s ({n / dt / 1e6:.1f} M/s)")
+    else:
+        print(USAGE)
+        sys.exit(1)
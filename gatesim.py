@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  gatesim.py – Simulador a nivel de compuertas de netlist/top.json
+#  Simula el `top` sintetizado sin Icarus. El netlist (netlist.py) se
+#  aplana desde top con nets globales, elaborando de paso las
+#  instancias parametrizadas que `proc` deja con el WIDTH por defecto
+#  (flopr #(32) sobre un flopr de 8 bits: cada bus de 8 pasa a 32).
+#
+#  Cada net es una fila de palabras uint64: el bit j de la palabra k
+#  es el carril 64·k + j, así que una pasada simula 64 estímulos
+#  independientes por palabra (y NumPy lleva las filas de varias
+#  palabras a la vez). Dos estados: x/z valen 0 y la división por cero
+#  da todo unos, como en iss.py.
+#
+#  Las celdas combinacionales se nivelan en un orden topológico y se
+#  compilan por nivel y tipo en operaciones fusionadas con índices:
+#    · $and/$or/$xor/$xnor/$not y $mux, bit a bit sobre las filas
+#    · $eq/$ne/$reduce_*/$logic_*, con reduceat por celda
+#    · $pmux, bit a bit con la selección one-hot
+#    · aritmética ($add, $sub, $mul, $div, $shr, $ge, …) transpuesta a
+#      enteros por carril con unpackbits/packbits
+#    · $memrd asíncrono: lectura por carril de la memoria
+#  El flanco de reloj copia D→Q de todos los $dff/$adff a la vez y
+#  escribe los $memwr_v2 con los valores de antes del flanco; el reset
+#  asíncrono de $adff se aplica antes de evaluar.
+# ──────────────────────────────────────────────────────────────
+import sys
+import time
+
+import numpy as np
+
+from netlist import DEFAULT_JSON, SEQUENTIAL, X, Netlist
+
+U64 = np.uint64
+ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+BITWISE = {"$and", "$or", "$xor", "$xnor", "$not", "$pos"}
+REDUCE = {"$eq", "$ne", "$reduce_or", "$reduce_bool", "$reduce_and",
+          "$logic_not", "$logic_and", "$logic_or"}
+ARITH = {"$add", "$sub", "$mul", "$div", "$mod", "$shr", "$shl", "$sshr",
+         "$lt", "$le", "$gt", "$ge", "$neg"}
+FLOPS = {"$dff", "$adff"}
+WIDTH_PARAMS = ("WIDTH", "A_WIDTH", "B_WIDTH", "Y_WIDTH")
+
+REGFILE = "arm.dp.rf.rf"
+RAM = "mem.RAM"
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Aplanado y elaboración
+# ──────────────────────────────────────────────────────────────
+class Design:
+    """Netlist plano: celdas con nets globales (0/1 constantes)."""
+
+    def __init__(self) -> None:
+        self.n_nets = 2
+        self.cells = []             # (tipo, parámetros, {pin: nets}, nombre)
+        self.memories = {}          # ruta -> (ancho, palabras)
+        self.names = {}             # ruta.net -> nets
+        self.ports = {}             # puerto de top -> (dirección, nets)
+
+    def fresh(self, n: int = 1) -> np.ndarray:
+        out = np.arange(self.n_nets, self.n_nets + n, dtype=np.int64)
+        self.n_nets += n
+        return out
+
+
+def _resizer(mod, params: dict):
+    """Función que lleva los vectores de WIDTH por defecto al WIDTH de la
+    instancia, o None si la instancia no cambia el ancho."""
+    if not len(mod.default_names):
+        return None, None
+    base = int(mod.default_int[0])
+    want = params.get(str(mod.default_names[0]), params.get("$1", base))
+    if not isinstance(want, int) or want == base:
+        return None, None
+    buses = {}
+    nxt = [mod.n_nets]
+
+    def resize(bits):
+        if len(bits) != base:
+            return bits
+        if (bits <= 1).all():
+            if len(set(bits.tolist())) != 1:
+                raise RuntimeError(f"{mod.name}: constante de {base} bits no uniforme")
+            return np.full(want, bits[0], dtype=bits.dtype)
+        if (bits <= 1).any():
+            raise RuntimeError(f"{mod.name}: bus de {base} bits mezclado con constantes")
+        key = tuple(bits.tolist())
+        if key not in buses:
+            buses[key] = np.arange(nxt[0], nxt[0] + want)
+            nxt[0] += want
+        return buses[key]
+
+    def fix(p: dict) -> dict:
+        p = dict(p)
+        for k in WIDTH_PARAMS:
+            if p.get(k) == base:
+                p[k] = want
+        if "ARST_VALUE" in p:
+            v = p["ARST_VALUE"]
+            if v not in (0, (1 << base) - 1):
+                raise RuntimeError(f"{mod.name}: ARST_VALUE {v:#x} no se puede escalar")
+            p["ARST_VALUE"] = 0 if v == 0 else (1 << want) - 1
+        return p
+
+    return resize, fix
+
+
+def _expand(net: Netlist, d: Design, kind: str, path: str, bind: dict, params: dict) -> None:
+    mod = net[kind]
+    resize, fix = _resizer(mod, params)
+    resize = resize or (lambda b: b)
+    fix = fix or (lambda p: p)
+    local = {}
+
+    def g(bits, out: bool = False) -> np.ndarray:
+        bits = resize(np.asarray(bits))
+        res = np.empty(len(bits), dtype=np.int64)
+        for i, n in enumerate(bits.tolist()):
+            if n == X:
+                res[i] = d.fresh()[0] if out else 0
+            elif n <= 1:
+                res[i] = n
+            else:
+                if n not in local:
+                    local[n] = d.fresh()[0]
+                res[i] = local[n]
+        return res
+
+    # puertos: las entradas primero, para que un puerto de salida que es
+    # el mismo net que una entrada quede como buffer hacia el padre
+    order = sorted(range(len(mod.port_names)), key=lambda p: mod.port_dir[p] == 1)
+    for p in order:
+        name = str(mod.port_names[p])
+        if name not in bind:
+            continue
+        child = resize(mod.port(name))
+        parent, is_out = bind[name], mod.port_dir[p] == 1
+        if len(child) != len(parent):
+            raise RuntimeError(f"{path or kind}: el puerto {name} tiene {len(child)} bits "
+                               f"y la conexión {len(parent)}")
+        for c, gnet in zip(child.tolist(), parent.tolist()):
+            if c <= 1 or (is_out and gnet <= 1):
+                continue
+            if c not in local:
+                local[c] = gnet
+            elif local[c] != gnet and is_out:
+                d.cells.append(("$pos", {"A_WIDTH": 1, "Y_WIDTH": 1},
+                                {"A": np.array([local[c]]), "Y": np.array([gnet])}, f"{path}{name}"))
+
+    for c, cname in enumerate(mod.cell_names):
+        t = str(mod.cell_types[c])
+        pins = {pin: g(bits, out) for pin, (out, bits) in mod.pins[c].items()}
+        if not t.startswith("$"):
+            _expand(net, d, t, f"{path}{cname}.", pins, mod.params[c])
+            continue
+        p = fix(mod.params[c])
+        if "MEMID" in p:
+            p["MEMID"] = path + str(p["MEMID"]).lstrip("\\")
+        d.cells.append((t, p, pins, f"{path}{cname}"))
+    for i, mname in enumerate(mod.mem_names):
+        d.memories[path + str(mname)] = (int(mod.mem_width[i]), int(mod.mem_size[i]))
+    for i, nname in enumerate(mod.net_names):
+        if not str(nname).startswith("$"):
+            d.names[path + str(nname)] = g(mod.net_bits[mod.net_ptr[i]:mod.net_ptr[i + 1]], True)
+
+
+def flatten(net: Netlist, top: str = None) -> Design:
+    top = top or net.top()
+    mod = net[top]
+    d = Design()
+    bind = {}
+    for p, name in enumerate(mod.port_names):
+        bind[str(name)] = d.fresh(len(mod.port(str(name))))
+        d.ports[str(name)] = (int(mod.port_dir[p]), bind[str(name)])
+    _expand(net, d, top, "", bind, {})
+    return d
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Transposición filas <-> enteros por carril
+# ──────────────────────────────────────────────────────────────
+def to_ints(rows: np.ndarray) -> np.ndarray:
+    """(w, L) uint64 bit a bit -> (64·L,) uint64 con el valor de cada carril."""
+    w, L = rows.shape
+    bits = np.unpackbits(rows.astype("<u8", copy=False).view(np.uint8), axis=1, bitorder="little")
+    full = np.zeros((64, 64 * L), dtype=np.uint8)
+    full[:w] = bits
+    return np.ascontiguousarray(np.packbits(full, axis=0, bitorder="little").T).view("<u8").ravel()
+
+
+def from_ints(values: np.ndarray, w: int) -> np.ndarray:
+    """(64·L,) enteros -> (w, L) filas bit a bit con los w bits bajos."""
+    n = len(values)
+    bits = np.unpackbits(values.astype("<u8").view(np.uint8).reshape(n, 8), axis=1, bitorder="little")
+    rows = np.packbits(np.ascontiguousarray(bits[:, :w].T), axis=1, bitorder="little")
+    return rows.view("<u8").astype(U64, copy=False)
+
+
+def _signed(v: np.ndarray, w: int) -> np.ndarray:
+    if w >= 64:
+        return v.view(np.int64)
+    m = U64(1 << (w - 1))
+    return ((v ^ m) - m).view(np.int64)
+
+
+def arith(kind: str, p: dict, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Y por carril de una celda aritmética (enteros uint64, módulo 2**64)."""
+    sa, sb = p.get("A_SIGNED") == 1, p.get("B_SIGNED") == 1
+    wa, wb = p.get("A_WIDTH", 64), p.get("B_WIDTH", 64)
+    signed = sa and sb
+    if sa:
+        a = _signed(a, wa).view(U64)
+    if sb and kind not in ("$shr", "$shl", "$sshr"):
+        b = _signed(b, wb).view(U64)
+    with np.errstate(over="ignore"):
+        if kind == "$add":
+            return a + b
+        if kind == "$sub":
+            return a - b
+        if kind == "$neg":
+            return U64(0) - a
+        if kind == "$mul":
+            return a * b
+        if kind in ("$div", "$mod"):
+            zero = b == 0
+            safe = np.where(zero, U64(1), b)
+            if signed:
+                x, y = a.view(np.int64), safe.view(np.int64)
+                q = np.abs(x) // np.abs(y) * np.where((x < 0) != (y < 0), -1, 1)
+                r = x - q * y
+                out = (q if kind == "$div" else r).view(U64)
+            else:
+                out = a // safe if kind == "$div" else a % safe
+            return np.where(zero, ONES, out)
+        if kind in ("$shr", "$shl", "$sshr"):
+            big = b >= 64
+            s = np.where(big, U64(0), b)
+            if kind == "$shl":
+                return np.where(big, U64(0), a << s)
+            if kind == "$sshr" and sa:
+                x = a.view(np.int64)
+                return (x >> np.minimum(b, U64(63)).astype(np.int64)).view(U64)
+            return np.where(big, U64(0), a >> s)
+        if signed:
+            a, b = a.view(np.int64), b.view(np.int64)
+        r = {"$lt": a < b, "$le": a <= b, "$gt": a > b, "$ge": a >= b}[kind]
+        return r.astype(U64)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Planificación
+# ──────────────────────────────────────────────────────────────
+def _is_comb(kind: str, p: dict) -> bool:
+    if kind in ("$memrd", "$memrd_v2"):
+        return not p.get("CLK_ENABLE", 0)
+    return kind not in SEQUENTIAL
+
+
+def levelize(d: Design) -> list:
+    """Nivel de cada celda combinacional (-1 las secuenciales); las
+    entradas de top, las Q y las memorias son el nivel 0."""
+    driver = np.full(d.n_nets, -1, dtype=np.int64)
+    comb = [_is_comb(t, p) for t, p, _, _ in d.cells]
+    for c, (t, p, pins, name) in enumerate(d.cells):
+        for pin, bits in pins.items():
+            if pin in ("Y", "Q", "DATA") and (pin != "DATA" or t.startswith("$memrd")):
+                if (bits <= 1).any():
+                    raise RuntimeError(f"{name}: la salida {pin} maneja una constante")
+                if (driver[bits] >= 0).any():
+                    other = d.cells[int(driver[bits][driver[bits] >= 0][0])][3]
+                    raise RuntimeError(f"{name}: net con dos manejadores (también {other})")
+                driver[bits] = c
+    deps = []
+    for c, (t, p, pins, name) in enumerate(d.cells):
+        if not comb[c]:
+            deps.append(())
+            continue
+        ins = [b for pin, b in pins.items() if pin not in ("Y", "DATA") or
+               (pin == "DATA" and not t.startswith("$memrd"))]
+        src = driver[np.concatenate(ins)] if ins else np.zeros(0, dtype=np.int64)
+        deps.append(tuple(s for s in set(src[src >= 0].tolist()) if comb[s] and s != c))
+    users = [[] for _ in d.cells]
+    for c, ds in enumerate(deps):
+        for s in ds:
+            users[s].append(c)
+    pending = [len(ds) for ds in deps]
+    level = [-1] * len(d.cells)
+    ready = [c for c in range(len(d.cells)) if comb[c] and not pending[c]]
+    for c in ready:
+        level[c] = 0
+    while ready:
+        c = ready.pop()
+        for u in users[c]:
+            level[u] = max(level[u], level[c] + 1)
+            pending[u] -= 1
+            if not pending[u]:
+                ready.append(u)
+    loop = [d.cells[c][3] for c in range(len(d.cells)) if comb[c] and pending[c]]
+    if loop:
+        raise RuntimeError(f"lazo combinacional en {', '.join(loop[:5])}")
+    return level
+
+
+def _fit(bits: np.ndarray, w: int, signed: bool) -> np.ndarray:
+    """Extiende (con 0 o el bit de signo) o corta un vector de nets a w."""
+    if len(bits) >= w:
+        return bits[:w]
+    fill = bits[-1] if signed and len(bits) else 0
+    return np.concatenate([bits, np.full(w - len(bits), fill, dtype=np.int64)])
+
+
+def compile_schedule(d: Design, level: list) -> list:
+    """Pasos de evaluación en orden de nivel: cada paso es una tupla
+    (clase, datos) con los índices ya resueltos."""
+    groups = {}
+    for c, lv in enumerate(level):
+        if lv < 0:
+            continue
+        t = d.cells[c][0]
+        cls = ("bit", t) if t in BITWISE else ("red", t) if t in REDUCE else \
+              ("mux", t) if t == "$mux" else ("one", t)
+        groups.setdefault((lv, cls), []).append(c)
+    steps = []
+    for (lv, (cls, t)), cells in sorted(groups.items(), key=lambda kv: kv[0][0]):
+        if cls == "one":
+            for c in cells:
+                steps.append(_compile_one(d, c))
+            continue
+        A, B, S, Y, seg_a, seg_b = [], [], [], [], [0], [0]
+        for c in cells:
+            _, p, pins, _ = d.cells[c]
+            sa, sb = p.get("A_SIGNED") == 1, p.get("B_SIGNED") == 1
+            if cls == "bit":
+                w = len(pins["Y"])
+                A.append(_fit(pins["A"], w, sa))
+                B.append(_fit(pins["B"], w, sb) if "B" in pins else _fit(pins["A"], w, sa))
+                Y.append(pins["Y"])
+            elif cls == "mux":
+                w = len(pins["Y"])
+                A.append(pins["A"])
+                B.append(pins["B"])
+                S.append(np.repeat(pins["S"], w))
+                Y.append(pins["Y"])
+            else:
+                a = pins["A"]
+                b = pins.get("B", np.zeros(0, dtype=np.int64))
+                if t in ("$eq", "$ne"):
+                    w = max(len(a), len(b))
+                    a, b = _fit(a, w, sa), _fit(b, w, sb)
+                A.append(a)
+                B.append(b)
+                seg_a.append(seg_a[-1] + len(a))
+                seg_b.append(seg_b[-1] + len(b))
+                Y.append(pins["Y"][:1])
+        cat = [np.concatenate(v).astype(np.intp) if v else None for v in (A, B, S, Y)]
+        if cls == "red":
+            steps.append(("red", (t, cat[0], cat[1], np.array(seg_a[:-1]), np.array(seg_b[:-1]), cat[3])))
+        else:
+            steps.append((cls, (t, cat[0], cat[1], cat[2], cat[3])))
+    return steps
+
+
+def _compile_one(d: Design, c: int):
+    t, p, pins, name = d.cells[c]
+    ix = {k: v.astype(np.intp) for k, v in pins.items()}
+    if t == "$pmux":
+        w = len(pins["Y"])
+        return ("pmux", (ix["A"], ix["B"].reshape(-1, w), ix["S"], ix["Y"]))
+    if t in ARITH:
+        return ("arith", (t, p, ix["A"], ix.get("B"), ix["Y"]))
+    if t in ("$memrd", "$memrd_v2"):
+        return ("memrd", (p["MEMID"], ix["ADDR"], ix["DATA"]))
+    raise RuntimeError(f"{name}: celda {t} no soportada")
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Simulador
+# ──────────────────────────────────────────────────────────────
+class GateSim:
+    def __init__(self, net: Netlist = None, lanes: int = 64, top: str = None) -> None:
+        net = net or Netlist()
+        self.design = d = flatten(net, top)
+        self.words = max(1, -(-lanes // 64))
+        self.lanes = 64 * self.words
+        self.level = levelize(d)
+        self.steps = compile_schedule(d, self.level)
+        self.V = np.zeros((d.n_nets, self.words), dtype=U64)
+        self.V[1] = ONES
+        self.mem = {m: np.zeros((size, self.lanes), dtype=U64) for m, (_, size) in d.memories.items()}
+        self._lane = np.arange(self.lanes)
+        self._sequential(d)
+
+    def _sequential(self, d: Design) -> None:
+        clocks = set()
+        D, Q, arst_bits, arst_q, arst_val, arst_inv = [], [], [], [], [], []
+        self.writes = []
+        for t, p, pins, name in d.cells:
+            if "CLK" in pins and p.get("CLK_ENABLE", 1) and t not in ("$memrd", "$memrd_v2"):
+                if p.get("CLK_POLARITY", 1) != 1:
+                    raise RuntimeError(f"{name}: reloj por flanco de bajada no soportado")
+                clocks.add(int(pins["CLK"][0]))
+            if t in FLOPS:
+                D.append(pins["D"])
+                Q.append(pins["Q"])
+                if t == "$adff":
+                    w = len(pins["Q"])
+                    arst_bits.append(np.repeat(pins["ARST"], w))
+                    arst_q.append(pins["Q"])
+                    rv = p.get("ARST_VALUE", 0)
+                    arst_val.append([ONES if rv >> i & 1 else U64(0) for i in range(w)])
+                    arst_inv.append(np.full(w, p.get("ARST_POLARITY", 1) != 1))
+            elif t in ("$memwr", "$memwr_v2"):
+                self.writes.append((p.get("PORTID", 0), p["MEMID"], pins["ADDR"].astype(np.intp),
+                                    pins["DATA"].astype(np.intp), pins["EN"].astype(np.intp)))
+            elif t in ("$meminit", "$meminit_v2"):
+                self._meminit(p, pins)
+            elif not _is_comb(t, p):
+                raise RuntimeError(f"{name}: celda {t} no soportada")
+        if len(clocks) > 1:
+            raise RuntimeError(f"{len(clocks)} relojes distintos; sólo se simula uno")
+        self.writes.sort(key=lambda w: w[0])
+
+        def cat(v, dt=np.intp):
+            return np.concatenate(v).astype(dt) if v else np.zeros(0, dtype=dt)
+        self.D, self.Q = cat(D), cat(Q)
+        self.arst, self.arst_q = cat(arst_bits), cat(arst_q)
+        self.arst_val = cat(arst_val, U64)[:, None]
+        self.arst_inv = cat(arst_inv, bool)
+
+    def _meminit(self, p: dict, pins: dict) -> None:
+        mem = self.mem[p["MEMID"]]
+        w, words = p["WIDTH"], p["WORDS"]
+        addr = int(sum(1 << i for i, b in enumerate(pins["ADDR"].tolist()) if b == 1))
+        data = pins["DATA"].tolist()
+        en = pins.get("EN")
+        mask = ((1 << w) - 1) if en is None else sum(1 << i for i, b in enumerate(en.tolist()) if b == 1)
+        for k in range(words):
+            if 0 <= addr + k < len(mem):
+                v = sum(1 << i for i, b in enumerate(data[k * w:(k + 1) * w]) if b == 1)
+                old = int(mem[addr + k, 0])
+                mem[addr + k] = (old & ~mask) | (v & mask)
+
+    # ─── entradas y salidas
+    def _lanes(self, values) -> np.ndarray:
+        v = np.asarray(values, dtype=np.int64).astype(U64)
+        return np.broadcast_to(v, (self.lanes,)) if v.ndim == 0 else v
+
+    def poke(self, name: str, values) -> None:
+        """Fija una entrada de top (un valor o uno por carril)."""
+        bits = self._bits(name)
+        self.V[bits] = from_ints(np.ascontiguousarray(self._lanes(values)), len(bits))
+
+    def peek(self, name: str) -> np.ndarray:
+        """Valor por carril de un puerto de top o de un net 'ruta.nombre'."""
+        bits = self._bits(name)
+        return to_ints(self.V[bits])
+
+    def _bits(self, name: str) -> np.ndarray:
+        if name in self.design.ports:
+            return self.design.ports[name][1]
+        if name in self.design.names:
+            return self.design.names[name]
+        raise RuntimeError(f"Net no encontrado: {name}")
+
+    def load(self, words, memory: str = RAM, lanes=None) -> None:
+        """Carga una imagen (None = x = 0) en los carriles dados (todos por defecto)."""
+        mem = self.mem[memory]
+        v = np.array([0 if w is None else w for w in words][:len(mem)], dtype=np.int64).astype(U64)
+        sel = self._lane if lanes is None else np.atleast_1d(lanes)
+        mem[:, sel] = 0
+        mem[np.arange(len(v))[:, None], sel] = v[:, None]
+
+    # ─── evaluación
+    def settle(self) -> None:
+        V = self.V
+        if len(self.arst):
+            a = V[self.arst]
+            a[self.arst_inv] = ~a[self.arst_inv]
+            V[self.arst_q] = (V[self.arst_q] & ~a) | (self.arst_val & a)
+        for cls, data in self.steps:
+            if cls == "bit":
+                t, A, B, _, Y = data
+                a = V[A]
+                if t == "$and":
+                    V[Y] = a & V[B]
+                elif t == "$or":
+                    V[Y] = a | V[B]
+                elif t == "$xor":
+                    V[Y] = a ^ V[B]
+                elif t == "$xnor":
+                    V[Y] = ~(a ^ V[B])
+                elif t == "$not":
+                    V[Y] = ~a
+                else:
+                    V[Y] = a
+            elif cls == "mux":
+                _, A, B, S, Y = data
+                a = V[A]
+                V[Y] = a ^ ((a ^ V[B]) & V[S])
+            elif cls == "red":
+                self._reduce(*data)
+            elif cls == "pmux":
+                A, B, S, Y = data
+                s = V[S]
+                hit = np.bitwise_or.reduce(V[B] & s[:, None, :], axis=0)
+                V[Y] = (V[A] & ~np.bitwise_or.reduce(s, axis=0)) | hit
+            elif cls == "arith":
+                t, p, A, B, Y = data
+                b = to_ints(V[B]) if B is not None else None
+                V[Y] = from_ints(arith(t, p, to_ints(V[A]), b), len(Y))
+            else:
+                memid, A, Y = data
+                mem = self.mem[memid]
+                addr = to_ints(V[A])
+                ok = addr < U64(len(mem))
+                val = mem[np.where(ok, addr, 0).astype(np.intp), self._lane]
+                V[Y] = from_ints(np.where(ok, val, U64(0)), len(Y))
+
+    def _reduce(self, t, A, B, seg_a, seg_b, Y) -> None:
+        V = self.V
+        if t in ("$eq", "$ne"):
+            r = np.bitwise_or.reduceat(V[A] ^ V[B], seg_a, axis=0)
+            V[Y] = ~r if t == "$eq" else r
+        elif t == "$reduce_and":
+            V[Y] = np.bitwise_and.reduceat(V[A], seg_a, axis=0)
+        else:
+            r = np.bitwise_or.reduceat(V[A], seg_a, axis=0)
+            if t == "$logic_not":
+                r = ~r
+            elif t == "$logic_and":
+                r = r & np.bitwise_or.reduceat(V[B], seg_b, axis=0)
+            elif t == "$logic_or":
+                r = r | np.bitwise_or.reduceat(V[B], seg_b, axis=0)
+            V[Y] = r
+
+    def clock(self) -> None:
+        """Flanco de subida: memorias y registros con los valores previos."""
+        V = self.V
+        for _, memid, A, Dt, E in self.writes:
+            mem = self.mem[memid]
+            en = to_ints(V[E])
+            addr = to_ints(V[A])
+            live = np.flatnonzero((en != 0) & (addr < U64(len(mem))))
+            if len(live):
+                a = addr[live].astype(np.intp)
+                data, en = to_ints(V[Dt])[live], en[live]
+                mem[a, live] = (mem[a, live] & ~en) | (data & en)
+        V[self.Q] = V[self.D]
+        self.settle()
+
+    # ─── testbench.v
+    def reset(self, cycles: int = 2) -> None:
+        """reset = 1 durante los primeros flancos (testbench.v lo suelta en t=22)."""
+        self.poke("reset", 1)
+        self.settle()
+        for _ in range(cycles):
+            self.clock()
+        self.poke("reset", 0)
+        self.settle()
+
+    def run(self, cycles: int) -> None:
+        for _ in range(cycles):
+            self.clock()
+
+    def regs(self) -> np.ndarray:
+        """(15, carriles) con R0..R14 del banco de registros."""
+        return self.mem[REGFILE][:15]
+
+
+# ──────────────────────────────────────────────────────────────
+# 5.  Regresión contra iss.py
+# ──────────────────────────────────────────────────────────────
+def regress(sim: GateSim, programs: list, cycles: int = None) -> list:
+    """Corre cada imagen en su carril y compara R0..R14 con iss.py
+    en el mismo ciclo. Devuelve [(ciclos, [(r, iss, netlist)])] por programa."""
+    from iss import ARM_Simulator, TESTBENCH_CYCLES
+    if len(programs) > sim.lanes:
+        raise RuntimeError(f"{len(programs)} programas y sólo {sim.lanes} carriles")
+    ref = []
+    for words in programs:
+        iss = ARM_Simulator(max(64, len(words)))
+        iss.load(words)
+        iss.run(cycles or TESTBENCH_CYCLES)
+        ref.append(iss)
+        sim.load(words, lanes=len(ref) - 1)
+    # cada carril se compara al ciclo en que iss.py terminó
+    stop = {}
+    for i, iss in enumerate(ref):
+        stop.setdefault(iss.cycles, []).append(i)
+    sim.reset()
+    snap = {}
+    done = 0
+    for k in sorted(stop):
+        sim.run(k - done)
+        done = k
+        for i in stop[k]:
+            snap[i] = sim.regs()[:, i].copy()
+    out = []
+    for i, iss in enumerate(ref):
+        diff = [(r, iss.regs[r], int(snap[i][r])) for r in range(15) if iss.regs[r] != int(snap[i][r])]
+        out.append((iss.cycles, diff))
+    return out
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python gatesim.py <memfile.mem> [más.mem ...] [--json=netlist/top.json] "
+              "[--cycles=N] [--lanes=64]")
+        sys.exit(1)
+
+    from iss import load_memfile
+    try:
+        t0 = time.perf_counter()
+        net = Netlist(opts.get("json", DEFAULT_JSON))
+        sim = GateSim(net, max(int(opts.get("lanes", 64)), len(args)))
+        t1 = time.perf_counter()
+        d = sim.design
+        print(f"{len(d.cells)} celdas, {d.n_nets} nets, {max(sim.level) + 1} niveles, "
+              f"{len(sim.steps)} pasos, {sim.lanes} carriles  ({1000 * (t1 - t0):.0f} ms)")
+        programs = [load_memfile(a) for a in args]
+        res = regress(sim, programs, int(opts["cycles"]) if "cycles" in opts else None)
+        t2 = time.perf_counter()
+        total = max(c for c, _ in res) + 2
+        print(f"{total} ciclos x {sim.lanes} carriles en {t2 - t1:.2f} s  "
+              f"({total * sim.lanes / (t2 - t1):,.0f} ciclos-carril/s)")
+        bad = 0
+        for path, (cyc, diff) in zip(args, res):
+            if not diff:
+                print(f"  {path}: coincide con iss.py ({cyc} ciclos)")
+                continue
+            bad += 1
+            print(f"  {path}: difiere de iss.py al ciclo {cyc}")
+            for r, want, got in diff:
+                print(f"      R{r}: iss={want:08x}  netlist={got:08x}")
+        stale = net.stale()
+        if bad and stale:
+            print("aviso: el netlist es anterior al RTL (" +
+                  ", ".join(f"{m}: {', '.join(i for i, _ in v)}" for m, v in stale.items()) + ")")
+        sys.exit(1 if bad else 0)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
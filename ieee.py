@@ -1,10 +1,261 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  ieee.py – Conversor IEEE 754 por lotes para datos de FADD/FMUL
+#  Convierte entre decimal, hex float32 y hex float16 en ambos
+#  sentidos, con NumPy, leyendo archivos o stdin por bloques y
+#  escribiendo directamente en formato memfile (una palabra %08X por
+#  línea; los float16 van en los 16 bits bajos, como los lee FADDH).
+#  Modos de redondeo: rne (al par), rtz (a cero), rup (a +inf),
+#  rdn (a -inf). El decimal se redondea una sola vez: los casos en que
+#  pasar por float64 podría cambiar el resultado se deciden con el
+#  texto exacto.
+#  Sin argumentos y en una terminal se comporta como antes: pregunta
+#  un número y muestra su hex de 32 bits.
+# ──────────────────────────────────────────────────────────────
+import re
 import struct
+import sys
+from decimal import Decimal
 
-# Solicita al usuario un número decimal y lo convierte a float
-numero = float(input("Ingresa un número decimal: "))
+import numpy as np
 
-# Convierte el número a formato IEEE 754 de 32 bits y lo muestra en hexadecimal
-hex_ieee = hex(struct.unpack('>I', struct.pack('>f', numero))[0])
-print(f"Representación IEEE 754 en hexadecimal: {hex_ieee}")
+FORMATS = ("dec", "f32", "f16")
+ROUNDING = ("rne", "rtz", "rup", "rdn")
+CHUNK = 8 << 20                       # bytes por bloque de entrada
+_DTYPE = {"f32": np.float32, "f16": np.float16}
+_BITS = {"f32": np.uint32, "f16": np.uint16}
+_COMMENT = re.compile(rb"//[^\n]*")
 
 
+# ──────────────────────────────────────────────────────────────
+# 1.  Redondeo
+# ──────────────────────────────────────────────────────────────
+def round_to(x, fmt: str, mode: str = "rne"):
+    """float64 -> float32/float16 con el modo pedido (x exacto)."""
+    if mode not in ROUNDING:
+        raise RuntimeError(f"Modo de redondeo desconocido: {mode} (use {', '.join(ROUNDING)})")
+    x = np.asarray(x, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        r = x.astype(_DTYPE[fmt])              # al par
+    if mode == "rne":
+        return r
+    wide = r.astype(np.float64)
+    if mode == "rtz":
+        fix = np.abs(wide) > np.abs(x)
+        toward = np.zeros(1, dtype=r.dtype)
+    elif mode == "rup":
+        fix = wide < x
+        toward = np.array([np.inf], dtype=r.dtype)
+    else:
+        fix = wide > x
+        toward = np.array([-np.inf], dtype=r.dtype)
+    with np.errstate(over="ignore"):
+        r[fix] = np.nextafter(r[fix], toward)
+    return r
+
+
+def _exact_side(tokens, x, fmt: str):
+    """Corrige x (float64 del texto) donde el redondeo doble importa.
+
+    Sólo si x cae justo en un valor del formato destino o en el punto
+    medio entre dos, la diferencia entre el decimal y x decide: se mira
+    el texto con Decimal y x se mueve un ulp de float64 hacia él.
+    """
+    with np.errstate(invalid="ignore", over="ignore"):
+        r = x.astype(_DTYPE[fmt])
+        wide = r.astype(np.float64)
+        other = np.nextafter(r, np.where(x > wide, np.inf, -np.inf).astype(r.dtype)).astype(np.float64)
+        suspect = np.isfinite(x) & ((wide == x) | ((wide + other) / 2 == x))
+    for i in np.flatnonzero(suspect).tolist():
+        side = Decimal(tokens[i].decode()).compare(Decimal(float(x[i])))
+        if side:
+            x[i] = np.nextafter(x[i], np.inf if side > 0 else -np.inf)
+    return x
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Conversión de bloques
+# ──────────────────────────────────────────────────────────────
+def parse_decimal(data: bytes):
+    """Tokens decimales (// comentarios fuera) y sus valores float64."""
+    tokens = _COMMENT.sub(b"", data).split()
+    try:
+        return tokens, np.array(tokens, dtype=np.float64)
+    except ValueError:
+        bad = next(t for t in tokens if not _is_float(t))
+        raise RuntimeError(f"Número decimal inválido: {bad.decode(errors='replace')}")
+
+
+def _is_float(tok: bytes) -> bool:
+    try:
+        float(tok)
+        return True
+    except ValueError:
+        return False
+
+
+def convert(src: str, dst: str, values, tokens=None, mode: str = "rne"):
+    """Convierte un bloque. values: float64 (dec) o patrones de bits (hex).
+
+    Devuelve patrones uint32 para f32/f16 o float64 para dec.
+    """
+    if src == "dec":
+        x = np.asarray(values, dtype=np.float64)
+        if dst == "dec":
+            return x
+        if tokens is not None:
+            x = _exact_side(tokens, x.copy(), dst)
+    else:
+        bits = np.asarray(values, dtype=np.uint32).astype(_BITS[src])
+        x = bits.view(_DTYPE[src]).astype(np.float64)      # exacto
+        if dst == "dec":
+            return x
+        if dst == src:
+            return bits.astype(np.uint32)
+    return round_to(x, dst, mode).view(_BITS[dst]).astype(np.uint32)
+
+
+def format_block(out, dst: str, annotate=None) -> bytes:
+    """Texto memfile (o decimal) de un bloque convertido."""
+    if dst == "dec":
+        return ("%.9g\n" * len(out) % tuple(out.tolist())).encode()
+    if annotate is None:
+        import memimage
+        return memimage.hex_lines(out)
+    # comentario con el valor original, como en memfile.mem
+    args = np.empty((len(out), 2), dtype=object)
+    args[:, 0] = out.tolist()
+    args[:, 1] = annotate
+    return ("%08X  // %s\n" * len(out) % tuple(args.ravel().tolist())).encode()
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Flujo: archivos / stdin -> memfile
+# ──────────────────────────────────────────────────────────────
+def _blocks(stream):
+    """Bloques de ~CHUNK bytes cortados en un salto de línea."""
+    rest = b""
+    while True:
+        data = stream.read(CHUNK)
+        if not data:
+            break
+        data = rest + data
+        cut = data.rfind(b"\n") + 1 or len(data)
+        if cut == len(data) and not data[-1:].isspace():
+            cut = max(data.rfind(b" "), data.rfind(b"\t")) + 1 or 0
+        rest = data[cut:]
+        if cut:
+            yield data[:cut]
+    if rest:
+        yield rest
+
+
+def parse_hex(data: bytes):
+    """Tramos de un bloque hex: ('@', dirección) por cada @dirección y
+    (None, patrones uint32) entre ellas. Las palabras x se rechazan."""
+    out, words = [], []
+
+    def flush():
+        if words:
+            try:
+                raw = bytes.fromhex(b"".join(w.rjust(8, b"0") for w in words).decode())
+            except ValueError:
+                bad = next(w for w in words if re.search(rb"[^0-9a-fA-F]", w))
+                raise RuntimeError(f"Palabra hex inválida o x: {bad.decode(errors='replace')}") from None
+            out.append((None, np.frombuffer(raw, dtype=">u4").astype(np.uint32)))
+            words.clear()
+
+    for tok in _COMMENT.sub(b"", data).split():
+        tok = tok.replace(b"_", b"")
+        if tok.startswith(b"@"):
+            flush()
+            try:
+                out.append(("@", int(tok[1:], 16)))
+            except ValueError:
+                raise RuntimeError(f"Dirección inválida: {tok.decode(errors='replace')}") from None
+        elif len(tok) > 8:
+            raise RuntimeError(f"Palabra de más de 32 bits: {tok.decode(errors='replace')}")
+        else:
+            words.append(tok)
+    flush()
+    return out
+
+
+def convert_stream(stream, out, src: str = "dec", dst: str = "f32",
+                   mode: str = "rne", annotate: bool = False) -> int:
+    """Convierte todo `stream` (binario) a `out`; devuelve cuántos valores.
+
+    Las @dirección de una entrada hex pasan tal cual a la salida (como
+    comentario si la salida es decimal): los huecos no se rellenan.
+    """
+    if src not in FORMATS or dst not in FORMATS:
+        raise RuntimeError(f"Formato desconocido (use {', '.join(FORMATS)})")
+    count = 0
+    if src != "dec":
+        parts = (p for block in _blocks(stream) for p in parse_hex(block))
+        blocks = ((None, v) if at is None else (at, v) for at, v in parts)
+    else:
+        blocks = (parse_decimal(block) for block in _blocks(stream))
+    for tokens, values in blocks:
+        if tokens == "@":
+            out.write((b"// " if dst == "dec" else b"") + b"@%X\n" % values)
+            continue
+        if not len(values):
+            continue
+        res = convert(src, dst, values, tokens, mode)
+        note = None
+        if annotate and dst != "dec":
+            note = [t.decode() for t in tokens] if tokens is not None else \
+                ["%.9g" % v for v in convert(src, "dec", values).tolist()]
+        out.write(format_block(res, dst, note))
+        count += len(values)
+    return count
+
+
+def interactive() -> None:
+    # Solicita al usuario un número decimal y lo convierte a float
+    numero = float(input("Ingresa un número decimal: "))
+
+    # Convierte el número a formato IEEE 754 de 32 bits y lo muestra en hexadecimal
+    hex_ieee = hex(struct.unpack('>I', struct.pack('>f', numero))[0])
+    print(f"Representación IEEE 754 en hexadecimal: {hex_ieee}")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    if not argv and sys.stdin.isatty():
+        interactive()
+        sys.exit(0)
+    if "-h" in argv or "--help" in argv:
+        print("Uso: python ieee.py [--from=dec|f32|f16] [--to=f32|f16|dec] "
+              "[--round=rne|rtz|rup|rdn] [--annotate] [-o salida.mem] [entrada ...]")
+        print("     sin entradas (o con '-') lee de stdin")
+        sys.exit(0)
+
+    opts = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    files, output, i = [], None, 0
+    while i < len(argv):
+        if argv[i] == "-o" and i + 1 < len(argv):
+            output = argv[i + 1]
+            i += 2
+            continue
+        if not argv[i].startswith("--"):
+            files.append(argv[i])
+        i += 1
+
+    out = open(output, "wb") if output else sys.stdout.buffer
+    total = 0
+    try:
+        for path in files or ["-"]:
+            stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+            with stream:
+                total += convert_stream(stream, out, opts.get("from", "dec"), opts.get("to", "f32"),
+                                        opts.get("round", "rne"), "--annotate" in argv)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if output:
+            out.close()
+    if output:
+        print(f"{total} valores escritos en {output}", file=sys.stderr)
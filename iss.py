@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  iss.py – Simulador de conjunto de instrucciones (ISS) en Python
+#  Ejecuta una imagen memfile.mem con la misma semántica que
+#  alu.v / decode.v / operand_selector.v / extend.v / condcheck.v
+#  y cuenta ciclos según la secuencia de estados de mainfsm.v.
+# ──────────────────────────────────────────────────────────────
+import sys
+
+from fpu import fadd16, fadd32, fmul16, fmul32
+
+MASK32 = 0xFFFFFFFF
+
+# testbench.v: reset baja en t=22, reloj de 10 ns y $finish en t=100000
+TESTBENCH_CYCLES = (100000 - 25) // 10 + 1
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Estados de mainfsm.v y caminos por clase de instrucción
+# ──────────────────────────────────────────────────────────────
+FETCH, DECODE, MEMADR, MEMRD, MEMWB, MEMWR, EXECUTER, EXECUTEI, ALUWB, BRANCH = range(10)
+
+STATE_NAMES = (
+    "FETCH", "DECODE", "MEMADR", "MEMRD", "MEMWB",
+    "MEMWR", "EXECUTER", "EXECUTEI", "ALUWB", "BRANCH",
+)
+
+PATHS = {
+    "DPR": (FETCH, DECODE, EXECUTER, ALUWB),
+    "DPI": (FETCH, DECODE, EXECUTEI, ALUWB),
+    "LDR": (FETCH, DECODE, MEMADR, MEMRD, MEMWB),
+    "STR": (FETCH, DECODE, MEMADR, MEMWR),
+    "B":   (FETCH, DECODE, BRANCH),
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  condcheck.v
+# ──────────────────────────────────────────────────────────────
+def condcheck(cond: int, flags: int) -> bool:
+    neg, zero, carry, overflow = flags >> 3 & 1, flags >> 2 & 1, flags >> 1 & 1, flags & 1
+    ge = neg == overflow
+    if cond == 0b0000: return bool(zero)
+    if cond == 0b0001: return not zero
+    if cond == 0b0010: return bool(carry)
+    if cond == 0b0011: return not carry
+    if cond == 0b0100: return bool(neg)
+    if cond == 0b0101: return not neg
+    if cond == 0b0110: return bool(overflow)
+    if cond == 0b0111: return not overflow
+    if cond == 0b1000: return bool(carry and not zero)
+    if cond == 0b1001: return not (carry and not zero)
+    if cond == 0b1010: return ge
+    if cond == 0b1011: return not ge
+    if cond == 0b1100: return not zero and ge
+    if cond == 0b1101: return not (not zero and ge)
+    if cond == 0b1110: return True
+    raise RuntimeError(f"Condición no definida en condcheck.v: {cond:04b}")
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  alu.v
+# ──────────────────────────────────────────────────────────────
+# Códigos que fuerzan C = V = 0 (is_logic)
+LOGIC_CODES = frozenset((0b0010, 0b0011, 0b0100, 0b0111, 0b0110, 0b0101,
+                         0b1000, 0b1001, 0b1110, 0b1111, 0b1010))
+
+
+def alu(a: int, b: int, ctrl: int, ext_imm: int = 0, A: int = 0):
+    """Devuelve (Result, ResultHi, ALUFlags) igual que alu.v."""
+    sub = ctrl & 1
+    total = a + ((~b & MASK32) if sub else b) + sub
+    result_hi = 0
+
+    if ctrl in (0b0000, 0b0001):
+        result = total & MASK32
+    elif ctrl == 0b0010:
+        result = a & b
+    elif ctrl == 0b0011:
+        result = a | b
+    elif ctrl == 0b0111:
+        result = (a * b) & MASK32
+    elif ctrl == 0b0100:
+        # en RTL a / 0 da x; aquí se fija a todos unos
+        result = a // b if b else MASK32
+    elif ctrl == 0b1011:
+        result = ext_imm
+    elif ctrl == 0b1100:
+        result = (A & 0x000FFFFF) | ext_imm
+    elif ctrl == 0b1101:
+        result = (A & 0xFF000FFF) | ext_imm
+    elif ctrl == 0b1010:
+        result = b
+    elif ctrl == 0b0110:
+        # SMUL: producto de los valores absolutos y luego se niega
+        abs_a = (-a & MASK32) if a >> 31 else a
+        abs_b = (-b & MASK32) if b >> 31 else b
+        prod = abs_a * abs_b
+        if (a ^ b) >> 31:
+            prod = -prod & 0xFFFFFFFFFFFFFFFF
+        result, result_hi = prod & MASK32, prod >> 32
+    elif ctrl == 0b0101:
+        prod = a * b
+        result, result_hi = prod & MASK32, prod >> 32
+    elif ctrl == 0b1000:
+        result = fadd32(a, b)
+    elif ctrl == 0b1001:
+        result = fmul32(a, b)
+    elif ctrl == 0b1110:
+        result = fadd16(a, b)
+    else:
+        result = fmul16(a, b)
+
+    neg = result >> 31
+    zero = int(result == 0 and result_hi == 0)
+    if ctrl in LOGIC_CODES:
+        carry = overflow = 0
+    else:
+        carry = total >> 32 & 1
+        overflow = int(not ((a ^ b) >> 31 ^ sub) and ((a ^ total) >> 31 & 1))
+    return result, result_hi, (neg << 3) | (zero << 2) | (carry << 1) | overflow
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  decode.v + operand_selector.v + extend.v
+# ──────────────────────────────────────────────────────────────
+def decode_dp(instr: int):
+    """Campos de una instrucción DP (Op = 00).
+
+    Devuelve (alu_ctrl, is_cmp, mul_long, ra1, ra2, wa3, wa4, ext_imm).
+    """
+    I = instr >> 25 & 1
+    opcode = instr >> 21 & 0xF
+    low4 = instr >> 4 & 0xF
+    rd = instr >> 12 & 0xF
+
+    is_cmp = not I and opcode == 0b1111
+    mul_long = (instr >> 23 & 0x1F) == 0b00001 and low4 == 0b1001
+    is_mul32 = not I and opcode == 0b0000 and low4 == 0b1001
+    is_mov = I and opcode == 0b1101
+    is_movt = I and opcode == 0b1010
+    is_movm = I and opcode == 0b1110
+
+    if is_mul32:
+        ctrl = 0b0111
+    elif mul_long:
+        ctrl = 0b0110 if instr >> 22 & 1 else 0b0101
+    elif opcode == 0b1000:
+        ctrl = 0b1001 if instr >> 4 & 1 else 0b1000
+    elif opcode == 0b1001:
+        ctrl = 0b1111 if instr >> 4 & 1 else 0b1110
+    elif is_mov:
+        ctrl = 0b1011
+    elif is_movt:
+        ctrl = 0b1100
+    elif is_movm:
+        ctrl = 0b1101
+    elif is_cmp:
+        ctrl = 0b0001
+    elif not I and opcode == 0b1101:
+        ctrl = 0b1010
+    else:
+        ctrl = {0b0100: 0b0000, 0b0010: 0b0001, 0b0000: 0b0010,
+                0b1100: 0b0011, 0b0001: 0b0100}.get(opcode, 0b0000)
+
+    # operand_selector.v (isMul excluye multiply-long)
+    is_mul = (instr >> 21 & 0x7F) == 0 and low4 == 0b1001 and not mul_long
+    if mul_long or is_mul:
+        ra1 = instr >> 8 & 0xF
+    elif is_movt or is_movm:
+        ra1 = rd
+    else:
+        ra1 = instr >> 16 & 0xF
+    ra2 = instr & 0xF
+    wa3 = instr >> 16 & 0xF if is_mul else rd
+    wa4 = instr >> 16 & 0xF
+
+    # extend.v (ImmSrc = 11 para MOV/MOVT/MOVM, 00 en otro caso)
+    if is_movm:
+        ext_imm = (instr & 0xFF) << 12
+    elif is_movt:
+        ext_imm = (instr & 0xFFF) << 20
+    elif is_mov:
+        ext_imm = instr & 0xFFF
+    else:
+        ext_imm = instr & 0xFF
+    return ctrl, is_cmp, mul_long, ra1, ra2, wa3, wa4, ext_imm
+
+
+# ──────────────────────────────────────────────────────────────
+# 5.  Predecodificación
+#     Cada palabra se convierte una sola vez en un registro
+#     (handler, cond, campos...) que se guarda por dirección.
+# ──────────────────────────────────────────────────────────────
+AL = 0b1110
+CYCLES = {k: len(v) for k, v in PATHS.items()}
+
+# COND_TABLE[cond][flags] evita recalcular condcheck en cada ciclo
+COND_TABLE = tuple(tuple(condcheck(c, f) for f in range(16)) for c in range(15))
+
+# Resultado de la ALU sin banderas: (a, b, ext_imm) -> (Result, ResultHi)
+ALU_FAST = {
+    0b0000: lambda a, b, e: ((a + b) & MASK32, 0),
+    0b0001: lambda a, b, e: ((a - b) & MASK32, 0),
+    0b0010: lambda a, b, e: (a & b, 0),
+    0b0011: lambda a, b, e: (a | b, 0),
+    0b0111: lambda a, b, e: ((a * b) & MASK32, 0),
+    0b1011: lambda a, b, e: (e, 0),
+    0b1100: lambda a, b, e: ((a & 0x000FFFFF) | e, 0),
+    0b1101: lambda a, b, e: ((a & 0xFF000FFF) | e, 0),
+    0b1010: lambda a, b, e: (b, 0),
+    0b0101: lambda a, b, e: ((a * b) & MASK32, (a * b) >> 32),
+    0b1000: lambda a, b, e: (fadd32(a, b), 0),
+    0b1001: lambda a, b, e: (fmul32(a, b), 0),
+    0b1110: lambda a, b, e: (fadd16(a, b), 0),
+    0b1111: lambda a, b, e: (fmul16(a, b), 0),
+}
+
+
+def _alu_nf(ctrl):
+    fast = ALU_FAST.get(ctrl)
+    if fast is not None:
+        return fast
+    return lambda a, b, e: alu(a, b, ctrl, e, a)[:2]
+
+
+def _exec_dp(sim, rec) -> int:
+    _, cond, flagw, ra1, ra2, wa3, wa4, imm, ctrl, fn, mul_long, is_cmp, rd_pc, cycles = rec
+    regs = sim.regs
+    a = sim.pc + 4 if ra1 == 15 else regs[ra1]
+    if ra2 < 0:
+        b = imm
+    else:
+        b = sim.pc + 4 if ra2 == 15 else regs[ra2]
+
+    # EXECUTE: las banderas se escriben si S (o CMP) y CondEx
+    if flagw:
+        result, result_hi, alu_flags = alu(a, b, ctrl, imm, a)
+        if COND_TABLE[cond][sim.flags]:
+            sim.flags = alu_flags
+    else:
+        result, result_hi = fn(a, b, imm)
+
+    # ALUWB: CondEx se evalúa otra vez con las banderas ya actualizadas
+    if not is_cmp:
+        if cond == AL or COND_TABLE[cond][sim.flags]:
+            regs[wa3] = result
+            if mul_long:
+                regs[wa4] = result_hi
+        # PCS = (Rd == 15) & RegW no depende de CondEx
+        if rd_pc:
+            sim.pc = result
+    return cycles
+
+
+def _exec_ldr(sim, rec) -> int:
+    # MEMADR: Rn + imm12 (I, U y B se ignoran en el RTL) → MEMRD → MEMWB
+    _, cond, rn, rd, imm = rec
+    ok = cond == AL or COND_TABLE[cond][sim.flags]
+    if ok or rd == 15:
+        addr = ((sim.pc + 4 if rn == 15 else sim.regs[rn]) + imm) & MASK32
+        data = sim.read_word(addr)
+        if ok:
+            sim.regs[rd] = data
+        if rd == 15:
+            sim.pc = data
+    return CYCLES["LDR"]
+
+
+def _exec_str(sim, rec) -> int:
+    # MEMADR → MEMWR
+    _, cond, rn, rd, imm = rec
+    if cond == AL or COND_TABLE[cond][sim.flags]:
+        addr = ((sim.pc + 4 if rn == 15 else sim.regs[rn]) + imm) & MASK32
+        sim.write_word(addr, sim.pc + 4 if rd == 15 else sim.regs[rd])
+    return CYCLES["STR"]
+
+
+def _exec_b(sim, rec) -> int:
+    # BRANCH: PC <= (PC + 8) + offset; sim.pc ya vale PC + 4
+    _, cond, offset, self_loop = rec
+    if cond == AL or COND_TABLE[cond][sim.flags]:
+        sim.pc = (sim.pc + 4 + offset) & MASK32
+        if self_loop:
+            sim.halted = True               # "end: B end"
+    return CYCLES["B"]
+
+
+def predecode(instr: int, pc: int) -> tuple:
+    """Registro predecodificado de la palabra `instr` ubicada en `pc`."""
+    op = instr >> 26 & 0b11
+    cond = instr >> 28
+    if cond == 0b1111:
+        raise RuntimeError(f"Condición no definida en condcheck.v en PC=0x{pc:08X}: 0x{instr:08X}")
+
+    if op == 0b00:
+        ctrl, is_cmp, mul_long, ra1, ra2, wa3, wa4, ext_imm = decode_dp(instr)
+        I = instr >> 25 & 1
+        flagw = bool(instr >> 20 & 1 or is_cmp)
+        return (_exec_dp, cond, flagw, ra1, -1 if I else ra2, wa3, wa4, ext_imm,
+                ctrl, _alu_nf(ctrl), mul_long, is_cmp, instr >> 12 & 0xF == 15,
+                CYCLES["DPI"] if I else CYCLES["DPR"])
+
+    if op == 0b01:
+        handler = _exec_ldr if instr >> 20 & 1 else _exec_str
+        return (handler, cond, instr >> 16 & 0xF, instr >> 12 & 0xF, instr & 0xFFF)
+
+    if op == 0b10:
+        off = instr & 0xFFFFFF
+        if off & 0x800000:
+            off -= 1 << 24
+        return (_exec_b, cond, off << 2, off == -2)
+
+    raise RuntimeError(f"Instrucción no soportada (Op=11) en PC=0x{pc:08X}: 0x{instr:08X}")
+
+
+# ──────────────────────────────────────────────────────────────
+# 6.  Lectura de memfile.mem ($readmemh)
+# ──────────────────────────────────────────────────────────────
+def load_memfile(path: str) -> list:
+    """Palabras de la imagen; None donde queda x (huecos de @, dígitos x)."""
+    from memfile import load_words
+    return load_words(path)
+
+
+# ──────────────────────────────────────────────────────────────
+# 7.  Simulador
+# ──────────────────────────────────────────────────────────────
+class ARM_Simulator:
+    def __init__(self, mem_words: int = 64, predecode: bool = True) -> None:
+        # mem.v: RAM[63:0], palabras sin inicializar quedan en x (None)
+        self.mem: list = [None] * mem_words
+        # Tabla de registros predecodificados; mem.v es una RAM unificada,
+        # así que un STR/STRB sobre una palabra invalida su entrada.
+        self.decoded: list = [None] * mem_words
+        self.use_predecode = predecode
+        self.regs = [0] * 16
+        self.pc = 0
+        self.flags = 0            # {N, Z, C, V}
+        self.cycles = 0
+        self.instret = 0
+        self.halted = False
+
+    def load(self, words, base: int = 0) -> None:
+        for i, w in enumerate(words):
+            self.mem[base + i] = None if w is None else w & MASK32
+            self.decoded[base + i] = None
+
+    def load_memfile(self, path: str) -> None:
+        self.load(load_memfile(path))
+
+    # ─── memoria (mem.v direcciona con a[31:2])
+    def read_word(self, addr: int) -> int:
+        idx = addr >> 2
+        if idx >= len(self.mem):
+            raise RuntimeError(f"Lectura fuera de memoria: 0x{addr:08X}")
+        w = self.mem[idx]
+        return 0 if w is None else w
+
+    def write_word(self, addr: int, value: int) -> None:
+        idx = addr >> 2
+        if idx < len(self.mem):
+            self.mem[idx] = value
+            self.decoded[idx] = None
+
+    def read_reg(self, r: int) -> int:
+        # regfile.v: R15 devuelve Result, que en DECODE/EXECUTE vale PC+8
+        return self.pc + 4 if r == 15 else self.regs[r]
+
+    def fetch_decoded(self, pc: int):
+        """Registro predecodificado en `pc`, o None si la palabra es x."""
+        idx = pc >> 2
+        if idx >= len(self.mem) or self.mem[idx] is None:
+            return None
+        rec = self.decoded[idx]
+        if rec is None:
+            rec = predecode(self.mem[idx], pc)
+            if self.use_predecode:
+                self.decoded[idx] = rec
+        return rec
+
+    # ─── una instrucción completa (FETCH … último estado)
+    def step(self) -> int:
+        rec = self.fetch_decoded(self.pc)
+        if rec is None:
+            self.halted = True
+            return 0
+        # FETCH: IR <= mem[PC], PC <= PC + 4
+        self.pc = (self.pc + 4) & MASK32
+        cycles = rec[0](self, rec)
+        self.instret += 1
+        self.cycles += cycles
+        return cycles
+
+    def run(self, max_cycles: int = TESTBENCH_CYCLES) -> int:
+        decoded = self.decoded
+        fetch = self.fetch_decoded
+        cycles, instret = self.cycles, self.instret
+        while not self.halted and cycles < max_cycles:
+            pc = self.pc
+            idx = pc >> 2
+            rec = decoded[idx] if idx < len(decoded) else None
+            if rec is None:
+                rec = fetch(pc)
+                if rec is None:
+                    self.halted = True
+                    break
+            self.pc = (pc + 4) & MASK32
+            cycles += rec[0](self, rec)
+            instret += 1
+        self.cycles, self.instret = cycles, instret
+        return cycles
+
+    def dump_regs(self) -> str:
+        return "\n".join(f"R{i}={v:08x}" for i, v in enumerate(self.regs))
+
+
+# ──────────────────────────────────────────────────────────────
+# 8.  main
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python iss.py <memfile.mem> [max_ciclos]")
+        sys.exit(1)
+
+    memfile = sys.argv[1]
+    max_cycles = int(sys.argv[2]) if len(sys.argv) > 2 else TESTBENCH_CYCLES
+
+    try:
+        words = load_memfile(memfile)
+        # mem.v tiene 64 palabras; una imagen más grande agranda la RAM
+        sim = ARM_Simulator(max(64, len(words)))
+        sim.load(words)
+        sim.run(max_cycles)
+    except FileNotFoundError:
+        print(f"Archivo no encontrado: {memfile}")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Instrucciones: {sim.instret}  Ciclos: {sim.cycles}  CPI: {sim.cycles / max(sim.instret, 1):.2f}")
+    print("\n=== CONTENIDO FINAL DEL REGFILE ===")
+    print(sim.dump_regs())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  iss_jit.py – Modo de compilación por bloques básicos para iss.py
+#  Los bloques calientes se traducen a código Python, se compilan con
+#  compile() y se cachean por PC inicial + contenido de las palabras.
+#  Resultados y ciclos son idénticos a los del intérprete.
+# ──────────────────────────────────────────────────────────────
+import sys
+
+from fpu import fadd16, fadd32, fmul16, fmul32
+from iss import (
+    AL, COND_TABLE, CYCLES, MASK32, TESTBENCH_CYCLES,
+    ARM_Simulator, _exec_dp, _exec_ldr, _exec_str, alu, load_memfile, predecode,
+)
+
+HOT_THRESHOLD = 16      # visitas antes de compilar un bloque
+MAX_BLOCK = 64          # instrucciones por bloque
+
+# Plantillas de Result sin banderas por ALUControl
+_RESULT_EXPR = {
+    0b0000: "({a} + {b}) & M",
+    0b0001: "({a} - {b}) & M",
+    0b0010: "{a} & {b}",
+    0b0011: "{a} | {b}",
+    0b0111: "({a} * {b}) & M",
+    0b1011: "{e}",
+    0b1100: "({a} & 0x000FFFFF) | {e}",
+    0b1101: "({a} & 0xFF000FFF) | {e}",
+    0b1010: "{b}",
+    0b1000: "fadd32({a}, {b})",
+    0b1001: "fmul32({a}, {b})",
+    0b1110: "fadd16({a}, {b})",
+    0b1111: "fmul16({a}, {b})",
+}
+
+_GLOBALS = {
+    "M": MASK32, "C": COND_TABLE, "alu": alu,
+    "fadd32": fadd32, "fmul32": fmul32, "fadd16": fadd16, "fmul16": fmul16,
+}
+
+# (pc inicial, palabras del bloque) -> (función, instrucciones, ciclos, palabras cubiertas)
+_CODE_CACHE: dict = {}
+
+
+def _guarded(cond, body, ind):
+    """Líneas de `body` protegidas por CondEx (sin if cuando cond = AL)."""
+    if cond == AL or not body:
+        return [ind + l for l in body]
+    return [f"{ind}if C[{cond}][f]:"] + [ind + "    " + l for l in body]
+
+
+def gen_block(mem, start_pc: int, smc=()):
+    """Genera el código fuente del bloque que empieza en `start_pc`.
+
+    El bloque termina en un B<cond>, en una escritura a R15, después de
+    un STR/STRB (puede modificar código) o antes de una palabra x, Op=11
+    o modificada en tiempo de ejecución. Devuelve (src, n, ciclos, words)
+    o None si no hay nada que compilar.
+    """
+    body, words = [], []
+    used, written = set(), set()
+    cycles = 0
+    pc = start_pc
+    terminal = False
+    uses_flags = False
+
+    def reg(n, cur_pc):
+        if n == 15:
+            return hex((cur_pc + 8) & MASK32)
+        used.add(n)
+        return f"r{n}"
+
+    while len(words) < MAX_BLOCK and not terminal:
+        idx = pc >> 2
+        if idx >= len(mem) or mem[idx] is None or idx in smc:
+            break
+        instr = mem[idx]
+        try:
+            rec = predecode(instr, pc)
+        except RuntimeError:
+            break
+        words.append(instr)
+        handler, cond = rec[0], rec[1]
+        nxt = (pc + 4) & MASK32
+        if cond != AL:
+            uses_flags = True
+
+        if handler is _exec_dp:
+            (_, _, flagw, ra1, ra2, wa3, wa4, imm, ctrl, _, mul_long,
+             is_cmp, rd_pc, cyc) = rec
+            a = reg(ra1, pc)
+            b = hex(imm) if ra2 < 0 else reg(ra2, pc)
+            e = hex(imm)
+            write = [] if is_cmp else [f"r{wa3} = res"] + ([f"r{wa4} = hi"] if mul_long else [])
+            if flagw:
+                uses_flags = True
+                if ctrl in (0b0000, 0b0001):
+                    sub = ctrl & 1
+                    body.append(f"t = {a} + ({b} ^ M) + 1" if sub else f"t = {a} + {b}")
+                    body.append("res = t & M")
+                    body.append(
+                        f"nf = (res >> 31) << 3 | (res == 0) << 2 | (t >> 32 & 1) << 1"
+                        f" | ((({a} ^ {b}) >> 31 ^ {sub ^ 1}) & (({a} ^ res) >> 31))"
+                    )
+                else:
+                    body.append(f"res, hi, nf = alu({a}, {b}, {ctrl}, {e}, {a})")
+                body += _guarded(cond, ["f = nf"], "")
+                body += _guarded(cond, write, "")
+            elif mul_long:
+                if ctrl == 0b0101:
+                    body += [f"t = {a} * {b}", "res = t & M", "hi = t >> 32"]
+                else:
+                    body.append(f"res, hi, _ = alu({a}, {b}, {ctrl}, {e}, {a})")
+                body += _guarded(cond, write, "")
+            elif rd_pc and not is_cmp:
+                # PCS no depende de CondEx: Result se calcula siempre
+                expr = _RESULT_EXPR.get(ctrl, "alu({a}, {b}, %d, {e}, {a})[0]" % ctrl)
+                body.append(f"res = {expr.format(a=a, b=b, e=e)}")
+                body += _guarded(cond, write, "")
+            elif ctrl in _RESULT_EXPR:
+                expr = _RESULT_EXPR[ctrl].format(a=a, b=b, e=e)
+                body += _guarded(cond, [f"r{wa3} = {expr}"], "")
+            else:
+                body += _guarded(cond, [f"r{wa3} = alu({a}, {b}, {ctrl}, {e}, {a})[0]"], "")
+            if not is_cmp:
+                used.update((wa3, wa4) if mul_long else (wa3,))
+                written.update((wa3, wa4) if mul_long else (wa3,))
+            if rd_pc and not is_cmp:
+                body.append("sim.pc = res")
+                terminal = True
+
+        elif handler is _exec_ldr:
+            _, _, rn, rd, imm = rec
+            cyc = CYCLES["LDR"]
+            addr = f"({reg(rn, pc)} + {imm}) & M"
+            used.add(rd)
+            written.add(rd)
+            if rd == 15:
+                body.append(f"d = sim.read_word({addr})")
+                body += _guarded(cond, ["r15 = d"], "")
+                body.append("sim.pc = d")
+                terminal = True
+            else:
+                body += _guarded(cond, [f"r{rd} = sim.read_word({addr})"], "")
+
+        elif handler is _exec_str:
+            _, _, rn, rd, imm = rec
+            cyc = CYCLES["STR"]
+            addr = f"({reg(rn, pc)} + {imm}) & M"
+            body += _guarded(cond, [f"sim.write_word({addr}, {reg(rd, pc)})"], "")
+            body.append(f"sim.pc = {hex(nxt)}")
+            terminal = True
+
+        else:
+            _, _, offset, self_loop = rec
+            target = (pc + 8 + offset) & MASK32
+            cyc = CYCLES["B"]
+            taken = [f"sim.pc = {hex(target)}"] + (["sim.halted = True"] if self_loop else [])
+            if cond == AL:
+                body += taken
+            else:
+                body += _guarded(cond, taken, "")
+                body += ["else:", f"    sim.pc = {hex(nxt)}"]
+            terminal = True
+
+        cycles += cyc
+        pc = nxt
+
+    if not words:
+        return None
+    if not terminal:
+        body.append(f"sim.pc = {hex(pc)}")
+
+    pre = ["r = sim.regs"] + [f"r{n} = r[{n}]" for n in sorted(used)]
+    if uses_flags:
+        pre.append("f = sim.flags")
+    post = [f"r[{n}] = r{n}" for n in sorted(written)]
+    if uses_flags:
+        post.append("sim.flags = f")
+    lines = [f"def block(sim):  # 0x{start_pc:08X}"] + ["    " + l for l in pre + body + post]
+    return "\n".join(lines) + "\n", len(words), cycles, words
+
+
+def compile_block(mem, start_pc: int, smc=()):
+    """Bloque compilado (fn, n, ciclos, words), reutilizando _CODE_CACHE."""
+    gen = gen_block(mem, start_pc, smc)
+    if gen is None:
+        return None
+    src, n, cycles, words = gen
+    key = (start_pc, tuple(words))
+    entry = _CODE_CACHE.get(key)
+    if entry is None:
+        ns = dict(_GLOBALS)
+        exec(compile(src, f"<bloque 0x{start_pc:08X}>", "exec"), ns)
+        entry = (ns["block"], n, cycles, len(words))
+        _CODE_CACHE[key] = entry
+    return entry
+
+
+class ARM_BlockSimulator(ARM_Simulator):
+    def __init__(self, mem_words: int = 64, hot: int = HOT_THRESHOLD) -> None:
+        super().__init__(mem_words)
+        self.hot = hot
+        self.blocks: dict = {}        # pc inicial -> entrada de _CODE_CACHE
+        self.cover: dict = {}         # índice de palabra -> {pc iniciales}
+        self.heat: dict = {}
+        self.smc: set = set()         # palabras de código modificadas por STR
+
+    def load(self, words, base: int = 0) -> None:
+        super().load(words, base)
+        self.blocks.clear()
+        self.cover.clear()
+        self.heat.clear()
+        self.smc.clear()
+
+    def write_word(self, addr: int, value: int) -> None:
+        super().write_word(addr, value)
+        starts = self.cover.pop(addr >> 2, None)
+        if starts:
+            # código auto-modificado: esa palabra vuelve al intérprete
+            self.smc.add(addr >> 2)
+            for s in starts:
+                self.blocks.pop(s, None)
+
+    def _build(self, pc: int):
+        entry = compile_block(self.mem, pc, self.smc)
+        if entry is not None:
+            self.blocks[pc] = entry
+            first = pc >> 2
+            for idx in range(first, first + entry[3]):
+                self.cover.setdefault(idx, set()).add(pc)
+        return entry
+
+    def run(self, max_cycles: int = TESTBENCH_CYCLES) -> int:
+        blocks, heat, hot = self.blocks, self.heat, self.hot
+        cycles, instret = self.cycles, self.instret
+        while not self.halted and cycles < max_cycles:
+            pc = self.pc
+            entry = blocks.get(pc)
+            if entry is None:
+                n = heat.get(pc, 0) + 1
+                heat[pc] = n
+                if n >= hot:
+                    entry = self._build(pc)
+            if entry is not None and cycles + entry[2] <= max_cycles:
+                entry[0](self)
+                instret += entry[1]
+                cycles += entry[2]
+            else:
+                self.cycles, self.instret = cycles, instret
+                self.step()
+                cycles, instret = self.cycles, self.instret
+        self.cycles, self.instret = cycles, instret
+        return cycles
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python iss_jit.py <memfile.mem> [max_ciclos]")
+        sys.exit(1)
+
+    memfile = sys.argv[1]
+    max_cycles = int(sys.argv[2]) if len(sys.argv) > 2 else TESTBENCH_CYCLES
+
+    try:
+        words = load_memfile(memfile)
+        # mem.v tiene 64 palabras; una imagen más grande agranda la RAM
+        sim = ARM_BlockSimulator(max(64, len(words)))
+        sim.load(words)
+        sim.run(max_cycles)
+    except FileNotFoundError:
+        print(f"Archivo no encontrado: {memfile}")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Instrucciones: {sim.instret}  Ciclos: {sim.cycles}  Bloques: {len(sim.blocks)}")
+    print("\n=== CONTENIDO FINAL DEL REGFILE ===")
+    print(sim.dump_regs())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  iss_lanes.py – Simulador por carriles (NumPy) para iss.py
+#  Ejecuta el mismo programa sobre N conjuntos de registros a la vez.
+#  Cada carril tiene su banco de 16 registros, NZCV, PC, memoria y
+#  contador de ciclos; condcheck.v se convierte en máscaras por carril.
+#  En cada paso se ejecuta la instrucción del menor PC vivo sobre los
+#  carriles que están en ese PC, así los saltos divergentes se
+#  reagrupan solos cuando los caminos vuelven a juntarse.
+# ──────────────────────────────────────────────────────────────
+import sys
+
+import numpy as np
+
+from alu_np import alu_code as alu_vec
+from iss import (
+    COND_TABLE, CYCLES, MASK32, TESTBENCH_CYCLES,
+    _exec_b, _exec_dp, _exec_ldr, predecode,
+)
+
+U32 = np.uint32
+
+_COND = np.array(COND_TABLE, dtype=bool)            # [cond, flags]
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Simulador por carriles
+# ──────────────────────────────────────────────────────────────
+class ARM_LaneSimulator:
+    def __init__(self, lanes: int, mem_words: int = 64) -> None:
+        self.n = lanes
+        self.mem = np.zeros((lanes, mem_words), dtype=U32)
+        self.valid = np.zeros((lanes, mem_words), dtype=bool)   # False = x
+        self.regs = np.zeros((16, lanes), dtype=U32)            # regs[r] = vector de carriles
+        self.pc = np.zeros(lanes, dtype=np.int64)
+        self.flags = np.zeros(lanes, dtype=np.uint8)            # {N, Z, C, V}
+        self.cycles = np.zeros(lanes, dtype=np.int64)
+        self.instret = np.zeros(lanes, dtype=np.int64)
+        self.halted = np.zeros(lanes, dtype=bool)
+        self.error = np.zeros(lanes, dtype=bool)                # Op=11, cond=1111, lectura fuera de RAM
+        self._decoded: dict = {}
+
+    def load(self, words, base: int = 0, valid=None) -> None:
+        words = np.asarray(words, dtype=np.int64).astype(U32)
+        self.mem[:, base:base + len(words)] = words
+        self.valid[:, base:base + len(words)] = True if valid is None else valid
+
+    def load_memfile(self, path: str) -> None:
+        import memfile
+        m = memfile.load(path)
+        self.load(m.words, valid=m.valid)
+
+    def set_reg(self, r: int, values) -> None:
+        self.regs[r] = np.asarray(values, dtype=np.int64).astype(U32)
+
+    def _decode(self, word: int, pc: int):
+        rec = self._decoded.get((word, pc))
+        if rec is None:
+            rec = predecode(word, pc)
+            self._decoded[(word, pc)] = rec
+        return rec
+
+    def _read(self, r: int, lanes, pc: int):
+        # regfile.v: R15 devuelve PC+8
+        if r == 15:
+            return np.full(len(lanes), (pc + 8) & MASK32, dtype=U32)
+        return self.regs[r, lanes]
+
+    def _exec(self, rec, lanes, pc: int) -> None:
+        handler, cond = rec[0], rec[1]
+        regs = self.regs
+        nxt = (pc + 4) & MASK32
+        self.pc[lanes] = nxt
+
+        if handler is _exec_dp:
+            (_, _, flagw, ra1, ra2, wa3, wa4, imm, ctrl, _, mul_long,
+             is_cmp, rd_pc, cyc) = rec
+            a = self._read(ra1, lanes, pc)
+            b = U32(imm) if ra2 < 0 else self._read(ra2, lanes, pc)
+            res, hi, nf = alu_vec(a, b, ctrl, imm, a)
+            # EXECUTE: banderas; ALUWB: CondEx con las banderas nuevas
+            if flagw:
+                ok = _COND[cond, self.flags[lanes]]
+                self.flags[lanes[ok]] = nf[ok]
+            if not is_cmp:
+                ok = _COND[cond, self.flags[lanes]]
+                regs[wa3, lanes[ok]] = res[ok]
+                if mul_long:
+                    regs[wa4, lanes[ok]] = hi[ok]
+                if rd_pc:
+                    self.pc[lanes] = res
+
+        elif handler is _exec_ldr:
+            _, _, rn, rd, imm = rec
+            cyc = CYCLES["LDR"]
+            ok = _COND[cond, self.flags[lanes]]
+            if rd == 15:
+                ok_read = np.ones(len(lanes), dtype=bool)
+            else:
+                ok_read = ok
+            addr = (self._read(rn, lanes, pc).astype(np.int64) + imm) & MASK32
+            idx = addr >> 2
+            bad = ok_read & (idx >= self.mem.shape[1])
+            if bad.any():
+                self.error[lanes[bad]] = True
+                self.halted[lanes[bad]] = True
+                ok_read &= ~bad
+                ok &= ~bad
+            rl, ri = lanes[ok_read], idx[ok_read]
+            data = np.where(self.valid[rl, ri], self.mem[rl, ri], U32(0))
+            regs[rd, rl[ok[ok_read]]] = data[ok[ok_read]]
+            if rd == 15:
+                self.pc[rl] = data
+
+        elif handler is _exec_b:
+            _, _, offset, self_loop = rec
+            cyc = CYCLES["B"]
+            ok = _COND[cond, self.flags[lanes]]
+            self.pc[lanes[ok]] = (pc + 8 + offset) & MASK32
+            if self_loop:
+                self.halted[lanes[ok]] = True
+
+        else:
+            _, _, rn, rd, imm = rec
+            cyc = CYCLES["STR"]
+            ok = _COND[cond, self.flags[lanes]]
+            wl = lanes[ok]
+            addr = (self._read(rn, wl, pc).astype(np.int64) + imm) & MASK32
+            idx = addr >> 2
+            inside = idx < self.mem.shape[1]
+            wl, idx = wl[inside], idx[inside]
+            self.mem[wl, idx] = self._read(rd, wl, pc)
+            self.valid[wl, idx] = True
+
+        self.cycles[lanes] += cyc
+        self.instret[lanes] += 1
+
+    def step(self, max_cycles: int = TESTBENCH_CYCLES) -> bool:
+        """Ejecuta una instrucción sobre el grupo del menor PC; False si no queda nada."""
+        live = ~self.halted & (self.cycles < max_cycles)
+        if not live.any():
+            return False
+        pc = int(self.pc[live].min())
+        lanes = np.flatnonzero(live & (self.pc == pc))
+        idx = pc >> 2
+        if idx >= self.mem.shape[1]:
+            self.halted[lanes] = True
+            return True
+        x = ~self.valid[lanes, idx]
+        if x.any():
+            self.halted[lanes[x]] = True
+            lanes = lanes[~x]
+            if not len(lanes):
+                return True
+        words = self.mem[lanes, idx]
+        # con código auto-modificado los carriles pueden ver palabras distintas
+        groups = [(int(words[0]), lanes)] if (words == words[0]).all() else [
+            (int(w), lanes[words == w]) for w in np.unique(words)]
+        for word, group in groups:
+            try:
+                rec = self._decode(word, pc)
+            except RuntimeError:
+                self.error[group] = True
+                self.halted[group] = True
+                continue
+            self._exec(rec, group, pc)
+        return True
+
+    def run(self, max_cycles: int = TESTBENCH_CYCLES) -> None:
+        while self.step(max_cycles):
+            pass
+
+    def dump_regs(self, lane: int) -> str:
+        return "\n".join(f"R{i}={int(v):08x}" for i, v in enumerate(self.regs[:, lane]))
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  main: un carril por línea de entradas (valores hex de R0, R1, ...)
+# ──────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python iss_lanes.py <memfile.mem> <entradas.txt> [max_ciclos]")
+        sys.exit(1)
+
+    memfile, inputs = sys.argv[1], sys.argv[2]
+    max_cycles = int(sys.argv[3]) if len(sys.argv) > 3 else TESTBENCH_CYCLES
+
+    try:
+        with open(inputs, "r") as f:
+            rows = [l.split("//", 1)[0].split() for l in f]
+        rows = [[int(v, 16) for v in r] for r in rows if r]
+    except FileNotFoundError:
+        print(f"Archivo no encontrado: {inputs}")
+        sys.exit(1)
+
+    sim = ARM_LaneSimulator(len(rows))
+    sim.load_memfile(memfile)
+    for r in range(max(len(row) for row in rows)):
+        sim.set_reg(r, [row[r] if r < len(row) else 0 for row in rows])
+    sim.run(max_cycles)
+
+    for lane in range(sim.n):
+        regs = " ".join(f"{int(v):08x}" for v in sim.regs[:, lane])
+        state = "ERROR" if sim.error[lane] else f"{int(sim.cycles[lane])} ciclos"
+        print(f"{lane:5d}: {regs}  ({state})")
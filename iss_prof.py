@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  iss_prof.py – Perfilador para iss.py
+#  ARM_ProfileSimulator es un camino de ejecución aparte: el bucle de
+#  ARM_Simulator.run no cambia ni pregunta si hay perfilado, así que
+#  sin perfilar no cuesta nada. Por cada PC cuenta ejecuciones y
+#  ciclos, por cada B<cond> las veces tomado / no tomado, y por cada
+#  dirección los LDR y STR. Con la fuente (.asm, o la lista extract
+#  del ensamblador) cada PC se muestra con su línea.
+#  Exporta:
+#    · informe de texto ordenado por ciclos
+#    · pilas colapsadas (flamegraph.pl / speedscope): como la ISA no
+#      tiene llamadas, la pila es programa;bucle;bucle interno;línea,
+#      con los bucles sacados del grafo de control de cycles.py
+# ──────────────────────────────────────────────────────────────
+import os
+import sys
+
+from iss import AL, COND_TABLE, MASK32, TESTBENCH_CYCLES, ARM_Simulator, _exec_b
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Simulador con perfilado
+# ──────────────────────────────────────────────────────────────
+class ARM_ProfileSimulator(ARM_Simulator):
+    def __init__(self, mem_words: int = 64) -> None:
+        super().__init__(mem_words)
+        self.reset_profile()
+
+    def reset_profile(self) -> None:
+        n = len(self.mem)
+        self.count = [0] * n            # ejecuciones por índice de palabra
+        self.cyc = [0] * n              # ciclos por índice de palabra
+        self.taken = [0] * n            # B<cond> tomados
+        self.not_taken = [0] * n
+        self.loads: dict = {}           # dirección -> LDR
+        self.stores: dict = {}          # dirección -> STR
+
+    def read_word(self, addr: int) -> int:
+        self.loads[addr] = self.loads.get(addr, 0) + 1
+        return super().read_word(addr)
+
+    def write_word(self, addr: int, value: int) -> None:
+        self.stores[addr] = self.stores.get(addr, 0) + 1
+        super().write_word(addr, value)
+
+    def run(self, max_cycles: int = TESTBENCH_CYCLES) -> int:
+        decoded = self.decoded
+        fetch = self.fetch_decoded
+        count, cyc, taken, not_taken = self.count, self.cyc, self.taken, self.not_taken
+        cycles, instret = self.cycles, self.instret
+        while not self.halted and cycles < max_cycles:
+            pc = self.pc
+            idx = pc >> 2
+            rec = decoded[idx] if idx < len(decoded) else None
+            if rec is None:
+                rec = fetch(pc)
+                if rec is None:
+                    self.halted = True
+                    break
+            if rec[0] is _exec_b:
+                if rec[1] == AL or COND_TABLE[rec[1]][self.flags]:
+                    taken[idx] += 1
+                else:
+                    not_taken[idx] += 1
+            self.pc = (pc + 4) & MASK32
+            c = rec[0](self, rec)
+            cycles += c
+            instret += 1
+            count[idx] += 1
+            cyc[idx] += c
+        self.cycles, self.instret = cycles, instret
+        return cycles
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Fuente y pilas
+# ──────────────────────────────────────────────────────────────
+def line_of(source, labels, idx: int) -> str:
+    ln, text = source[idx] if idx < len(source) else (None, "?")
+    label = f"{labels[idx]}: " if idx in labels else ""
+    return (f"línea {ln}: " if ln is not None else f"0x{idx << 2:04X}: ") + label + text
+
+
+def loop_frames(words, labels) -> dict:
+    """índice de palabra -> nombres de los bucles que la contienen."""
+    from cycles import CFG
+    cfg = CFG(words)
+    names = []
+    for loop in cfg.loops:
+        head = cfg.blocks[loop["header"]].start
+        names.append(f"bucle {labels.get(head, f'0x{head << 2:04X}')}")
+    return {pc: [names[i] for i in cfg.blocks[b].loops] for pc, b in cfg.block_of.items()}
+
+
+def collapsed(sim, words, source, labels, root: str = "programa") -> str:
+    """Pilas colapsadas 'programa;bucle;...;línea ciclos' por PC ejecutado.
+
+    Los bucles salen de la imagen cargada (`words`), no de la memoria
+    final, que el programa pudo haber pisado con STR.
+    """
+    frames = loop_frames(words, labels)
+    out = []
+    for idx, c in enumerate(sim.cyc):
+        if not c:
+            continue
+        stack = [root] + frames.get(idx, []) + [line_of(source, labels, idx)]
+        out.append(";".join(f.replace(";", ",") for f in stack) + f" {c}")
+    return "\n".join(out) + "\n"
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Informe
+# ──────────────────────────────────────────────────────────────
+def report(sim, source, labels, top: int = 20) -> str:
+    lines = [f"Instrucciones: {sim.instret}  Ciclos: {sim.cycles}  "
+             f"CPI: {sim.cycles / max(sim.instret, 1):.2f}"]
+    total = max(sim.cycles, 1)
+
+    hot = sorted((i for i, c in enumerate(sim.cyc) if c), key=lambda i: -sim.cyc[i])
+    lines.append(f"\n== PC por ciclos (primeros {min(top, len(hot))} de {len(hot)}) ==")
+    lines.append(f"{'pc':>6} {'veces':>9} {'ciclos':>10} {'%':>6}  fuente")
+    for i in hot[:top]:
+        lines.append(f"0x{i << 2:04X} {sim.count[i]:9d} {sim.cyc[i]:10d} "
+                     f"{100 * sim.cyc[i] / total:6.2f}  {line_of(source, labels, i)}")
+
+    branches = [i for i in range(len(sim.taken)) if sim.taken[i] or sim.not_taken[i]]
+    if branches:
+        lines.append("\n== Saltos ==")
+        lines.append(f"{'pc':>6} {'tomado':>9} {'no tomado':>10} {'% tomado':>9}  fuente")
+        for i in sorted(branches, key=lambda i: -(sim.taken[i] + sim.not_taken[i])):
+            t, nt = sim.taken[i], sim.not_taken[i]
+            lines.append(f"0x{i << 2:04X} {t:9d} {nt:10d} {100 * t / (t + nt):9.1f}  "
+                         f"{line_of(source, labels, i)}")
+
+    addrs = sorted(set(sim.loads) | set(sim.stores))
+    if addrs:
+        lines.append("\n== Memoria ==")
+        lines.append(f"{'dirección':>10} {'LDR':>9} {'STR':>9}")
+        for a in addrs:
+            lines.append(f"0x{a:08X} {sim.loads.get(a, 0):9d} {sim.stores.get(a, 0):9d}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python iss_prof.py <memfile.mem|programa.asm> [max_ciclos] [--asm=fuente.asm] "
+              "[--dialect=sc|gen|v2] [--folded=salida.folded] [--top=20]")
+        sys.exit(1)
+
+    from cycles import load_program
+    max_cycles = int(args[1]) if len(args) > 1 else TESTBENCH_CYCLES
+    try:
+        words, source, labels = load_program(args[0], opts.get("dialect", "sc"))
+        if "asm" in opts:
+            # fuente aparte para una imagen ya ensamblada
+            _, source, labels = load_program(opts["asm"], opts.get("dialect", "sc"))
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    sim = ARM_ProfileSimulator(max(64, len(words)))
+    sim.load(words)
+    sim.run(max_cycles)
+    print(report(sim, source, labels, int(opts.get("top", 20))))
+    if "folded" in opts:
+        root = os.path.splitext(os.path.basename(args[0]))[0]
+        with open(opts["folded"], "w") as f:
+            f.write(collapsed(sim, words, source, labels, root))
+        print(f"\nPilas colapsadas escritas en {opts['folded']}")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  memfile.py – Lector compartido de archivos $readmemh / $readmemb
+#  Acepta comentarios // y /* */, directivas @dirección, líneas en
+#  blanco, mayúsculas/minúsculas, '_' dentro de los números y dígitos
+#  x/z (la palabra queda en x, como en mem.v). El texto se decodifica
+#  con NumPy por bloques de ~8 MB: sin bucles por línea ni por palabra.
+#
+#  Resultado: Memfile con un arreglo uint32 denso + máscara de validez,
+#  o un mapa disperso de páginas si las direcciones son muy grandes.
+#  Cada palabra conserva su offset en el archivo para reportar errores
+#  y mapear direcciones a línea:columna.
+# ──────────────────────────────────────────────────────────────
+import mmap
+import os
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:          # sin NumPy se usa el lector línea a línea
+    np = None
+
+DENSE_LIMIT = 1 << 24        # palabras; por encima se usa el mapa de páginas
+PAGE_BITS = 12               # 4096 palabras por página
+CHUNK = 8 << 20              # bytes por bloque vectorizado
+
+
+class MemfileError(RuntimeError):
+    def __init__(self, msg: str, path: str, line: int, col: int) -> None:
+        super().__init__(f"{path}:{line}:{col}: {msg}")
+        self.path, self.line, self.col = path, line, col
+
+
+def _position(data, offset: int):
+    """(línea, columna) 1-based de un offset de bytes."""
+    # mmap no tiene count(): se cuenta por bloques
+    line = 1 + sum(bytes(data[i:min(i + CHUNK, offset)]).count(b"\n")
+                   for i in range(0, offset, CHUNK))
+    return line, offset - (data.rfind(b"\n", 0, offset) + 1) + 1
+
+
+def _blank_block_comments(data: bytes) -> bytes:
+    # /* */ se reemplaza por espacios conservando los saltos de línea
+    return re.sub(rb"/\*.*?(?:\*/|\Z)",
+                  lambda m: re.sub(rb"[^\n]", b" ", m.group()), data, flags=re.S)
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Tablas de caracteres
+# ──────────────────────────────────────────────────────────────
+# Clase de cada byte (bytes.translate es mucho más rápido que un LUT de
+# NumPy): 0-15 dígito, x/z, '_', '@', '/', espacio o inválido
+_X, _SEP, _AT, _SLASH, _SPACE, _BAD = 16, 17, 18, 19, 20, 255
+_CLASS = {}
+for _base, _digits in ((16, b"0123456789abcdef"), (2, b"01")):
+    _t = bytearray([_BAD]) * 256
+    for _i, _c in enumerate(_digits):
+        _t[_c] = _t[bytes([_c]).upper()[0]] = _i
+    for _c in b"xXzZ?":
+        _t[_c] = _X
+    for _c in b" \t\r\n\v\f":
+        _t[_c] = _SPACE
+    _t[ord("_")], _t[ord("@")], _t[ord("/")] = _SEP, _AT, _SLASH
+    _CLASS[_base] = bytes(_t)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Resultado
+# ──────────────────────────────────────────────────────────────
+class Memfile:
+    """Imagen leída: `words`/`valid` densos o `pages` {página: (words, valid)}."""
+
+    def __init__(self, path, data, addrs, values, valid, offsets, dense_limit) -> None:
+        self.path = path
+        self.data = data                 # texto (mmap) para las posiciones
+        self.addrs = addrs               # dirección de cada palabra leída
+        self.offsets = offsets           # offset en el archivo de cada palabra
+        self.words = self.valid = self.pages = None
+        n = int(addrs.max()) + 1 if len(addrs) else 0
+        self.size = n
+        if n <= dense_limit:
+            self.words = np.zeros(n, dtype=np.uint32)
+            self.valid = np.zeros(n, dtype=bool)
+            # con direcciones repetidas gana la última, como en $readmemh
+            self.words[addrs] = values
+            self.valid[addrs] = valid
+        else:
+            self.pages = {}
+            page = addrs >> PAGE_BITS
+            order = np.argsort(page, kind="stable")
+            bounds = np.flatnonzero(np.diff(page[order])) + 1
+            for idx in np.split(order, bounds):
+                words = np.zeros(1 << PAGE_BITS, dtype=np.uint32)
+                ok = np.zeros(1 << PAGE_BITS, dtype=bool)
+                low = addrs[idx] & ((1 << PAGE_BITS) - 1)
+                words[low] = values[idx]
+                ok[low] = valid[idx]
+                self.pages[int(page[idx[0]])] = (words, ok)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def sparse(self) -> bool:
+        return self.pages is not None
+
+    def __getitem__(self, addr: int):
+        """Palabra en `addr` (dirección de palabra) o None si es x."""
+        if self.pages is None:
+            if addr >= self.size or not self.valid[addr]:
+                return None
+            return int(self.words[addr])
+        page = self.pages.get(addr >> PAGE_BITS)
+        low = addr & ((1 << PAGE_BITS) - 1)
+        if page is None or not page[1][low]:
+            return None
+        return int(page[0][low])
+
+    def to_list(self, size: int = None) -> list:
+        """Lista de enteros con None para x, como ARM_Simulator.mem."""
+        if self.pages is not None:
+            raise RuntimeError("Imagen dispersa: use pages o memfile[addr]")
+        words = self.words.tolist()
+        if not self.valid.all():
+            words = [w if ok else None for w, ok in zip(words, self.valid.tolist())]
+        if size is not None:
+            words = (words + [None] * size)[:size]
+        return words
+
+    def source(self, addr: int):
+        """(línea, columna) de la última palabra escrita en `addr`, o None."""
+        hits = np.flatnonzero(self.addrs == addr)
+        if not len(hits):
+            return None
+        return _position(self.data, int(self.offsets[hits[-1]]))
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Decodificación vectorizada de un bloque
+# ──────────────────────────────────────────────────────────────
+def _decode(cls, tstart, tlen, base: int):
+    """Valor, número de dígitos, x y '@' fuera de lugar de cada token."""
+    width = int(tlen.max())
+    # matriz (tokens, ancho) alineada a la derecha: columna j = j-ésimo
+    # carácter desde el final
+    col = np.arange(width)
+    inside = col < tlen[:, None]
+    idx = tstart[:, None] + tlen[:, None] - 1 - col
+    val = np.where(inside, cls[np.where(inside, idx, 0)], _SEP)
+    stray = ((val == _AT) & (col < (tlen - 1)[:, None])).any(axis=1)
+
+    digit = val <= _X
+    ndig = digit.sum(axis=1)
+    k = np.cumsum(digit, axis=1) - 1          # posición del dígito desde el final
+    bits = 4 if base == 16 else 1
+    shift = np.minimum(np.where(digit, k, 0) * bits, 63).astype(np.uint64)
+    value = np.bitwise_or.reduce(
+        np.where(val < _X, val.astype(np.uint64), 0) << shift, axis=1)
+    return value, ndig, (val == _X).any(axis=1), stray
+
+
+def _parse_chunk(buf, start: int, base: int, data, path):
+    """Tokens de buf: (es_@, valor, tiene_x, offset absoluto)."""
+    cls = np.frombuffer(buf.translate(_CLASS[base]), dtype=np.uint8)
+    n = len(cls)
+    token = cls != _SPACE
+
+    # comentarios //: desde el primer // de cada línea hasta el salto
+    slash = cls == _SLASH
+    cstart = np.flatnonzero(slash[:-1] & slash[1:])
+    if len(cstart):
+        nl = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == ord("\n"))
+        line = np.searchsorted(nl, cstart)
+        first = np.ones(len(cstart), dtype=bool)
+        first[1:] = line[1:] != line[:-1]
+        cstart, line = cstart[first], line[first]
+        cend = np.append(nl, n)[line]
+        # tramos alternos código/comentario -> máscara con np.repeat
+        bounds = np.empty(2 * len(cstart) + 2, dtype=np.int64)
+        bounds[0], bounds[-1] = 0, n
+        bounds[1:-1:2], bounds[2:-1:2] = cstart, cend
+        code = np.zeros(len(bounds) - 1, dtype=bool)
+        code[0::2] = True
+        token &= np.repeat(code, np.diff(bounds))
+
+    # '/' suelto o carácter fuera de la tabla
+    if (token & (cls >= _SLASH)).any():
+        off = start + int(np.flatnonzero(token & (cls >= _SLASH))[0])
+        raise MemfileError(f"carácter inválido {chr(data[off])!r}", path, *_position(data, off))
+
+    padded = np.zeros(n + 2, dtype=bool)
+    padded[1:-1] = token
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    if not len(edges):
+        return None
+    tstart, tlen = edges[0::2], edges[1::2] - edges[0::2]
+    if tlen.max() > 80:
+        off = start + int(tstart[np.argmax(tlen)])
+        raise MemfileError("valor de más de 32 bits", path, *_position(data, off))
+    is_at = cls[tstart] == _AT
+
+    # camino rápido: tokens de 8 dígitos hex (el caso de memfile.mem)
+    value = np.zeros(len(tstart), dtype=np.uint64)
+    ndig = np.zeros(len(tstart), dtype=np.int64)
+    has_x = np.zeros(len(tstart), dtype=bool)
+    stray = np.zeros(len(tstart), dtype=bool)
+    slow = np.ones(len(tstart), dtype=bool)
+    if base == 16:
+        eight = np.flatnonzero(tlen == 8)
+        m = cls[tstart[eight, None] + np.arange(8)]
+        plain = (m < 16).all(axis=1)
+        m = m[plain].astype(np.uint32)
+        fast = eight[plain]
+        w = m[:, 0]
+        for j in range(1, 8):
+            w = (w << 4) | m[:, j]
+        value[fast] = w
+        ndig[fast] = 8
+        slow[fast] = False
+    slow = np.flatnonzero(slow)
+    if len(slow):
+        value[slow], ndig[slow], has_x[slow], stray[slow] = _decode(
+            cls, tstart[slow], tlen[slow], base)
+
+    bits = 4 if base == 16 else 1
+    wrong = np.flatnonzero(stray | (ndig == 0) | (ndig * bits > 64)
+                           | (~is_at & (value > 0xFFFFFFFF)))
+    if len(wrong):
+        t = int(wrong[0])
+        off = start + int(tstart[t])
+        msg = ("'@' en medio de un número" if stray[t] else
+               "número vacío" if ndig[t] == 0 else "valor de más de 32 bits")
+        raise MemfileError(msg, path, *_position(data, off))
+    if (is_at & has_x).any():
+        off = start + int(tstart[np.flatnonzero(is_at & has_x)[0]])
+        raise MemfileError("dirección con x/z", path, *_position(data, off))
+    return is_at, value, has_x, start + tstart
+
+
+def _chunks(data, size: int):
+    """Cortes del archivo en saltos de línea, fuera de comentarios /* */."""
+    start, n = 0, len(data)
+    while start < n:
+        end = min(start + size, n)
+        if end < n:
+            nl = data.find(b"\n", end)
+            end = n if nl < 0 else nl + 1
+        yield start, end
+        start = end
+
+
+def _parse_np(data, path, base, dense_limit):
+    addrs, values, valid, offsets = [], [], [], []
+    cur = 0
+    for start, end in _chunks(data, CHUNK):
+        parsed = _parse_chunk(bytes(data[start:end]), start, base, data, path)
+        if parsed is None:
+            continue
+        is_at, value, has_x, off = parsed
+        # dirección de cada palabra: base del último @ + índice en el tramo
+        seg = np.cumsum(is_at)
+        bases = np.append(cur, value[is_at].astype(np.int64))
+        ordinal = np.cumsum(~is_at) - 1
+        seg_first = np.append(0, ordinal[is_at] + 1)
+        data_tok = ~is_at
+        addr = bases[seg] + ordinal - seg_first[seg]
+        addr = addr[data_tok]
+        if len(addr):
+            last_seg = int(seg[-1])
+            cur = int(addr[-1]) + 1 if seg[np.flatnonzero(data_tok)[-1]] == last_seg \
+                else int(bases[last_seg])
+        else:
+            cur = int(bases[int(seg[-1])])
+        addrs.append(addr)
+        values.append(value[data_tok].astype(np.uint32))
+        valid.append(~has_x[data_tok])
+        offsets.append(off[data_tok])
+
+    cat = (lambda xs, dt: np.concatenate(xs) if xs else np.zeros(0, dtype=dt))
+    return Memfile(path, data, cat(addrs, np.int64), cat(values, np.uint32),
+                   cat(valid, bool), cat(offsets, np.int64), dense_limit)
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Lector de respaldo sin NumPy
+# ──────────────────────────────────────────────────────────────
+def _parse_py(data, path, base):
+    """Lista con None para x y huecos (sólo imágenes densas)."""
+    words, addr = [], 0
+    text = bytes(data)
+    for ln, raw in enumerate(text.splitlines(), 1):
+        line = raw.split(b"//", 1)[0]
+        for m in re.finditer(rb"\S+", line):
+            tok = m.group().replace(b"_", b"")
+            try:
+                if tok.startswith(b"@"):
+                    addr = int(tok[1:], 16)
+                    continue
+                w = None if re.search(rb"[xXzZ?]", tok) else int(tok, base)
+            except ValueError:
+                raise MemfileError(f"número inválido {tok.decode(errors='replace')!r}",
+                                   path, ln, m.start() + 1) from None
+            if w is not None and w > 0xFFFFFFFF:
+                raise MemfileError("valor de más de 32 bits", path, ln, m.start() + 1)
+            words.extend([None] * (addr + 1 - len(words)))
+            words[addr] = w
+            addr += 1
+    return words
+
+
+# ──────────────────────────────────────────────────────────────
+# 5.  API
+# ──────────────────────────────────────────────────────────────
+def parse(data, path: str = "<memoria>", base: int = 16, dense_limit: int = DENSE_LIMIT):
+    """Memfile a partir de bytes (o un mmap)."""
+    if data.find(b"/*") >= 0:
+        data = _blank_block_comments(bytes(data))
+    if np is None:
+        return _parse_py(data, path, base)
+    return _parse_np(data, path, base, dense_limit)
+
+
+def load(path: str, base: int = 16, dense_limit: int = DENSE_LIMIT):
+    """Lee `path` con mmap. Sin NumPy devuelve la lista con None para x."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse(b"", path, base, dense_limit)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return parse(data, path, base, dense_limit)
+
+
+def load_words(path: str, base: int = 16) -> list:
+    """Lista de palabras con None para x/huecos (lo que usa iss.py)."""
+    m = load(path, base)
+    return m if isinstance(m, list) else m.to_list()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python memfile.py <memfile.mem> [dirección]")
+        sys.exit(1)
+    try:
+        m = load(sys.argv[1])
+    except MemfileError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if isinstance(m, list):
+        print(f"{len(m)} palabras")
+        sys.exit(0)
+    if len(sys.argv) > 2:
+        addr = int(sys.argv[2], 0)
+        w, src = m[addr], m.source(addr)
+        print(f"@{addr:X}: {'x' if w is None else f'{w:08X}'}"
+              + (f"  ({m.path}:{src[0]}:{src[1]})" if src else ""))
+    else:
+        kind = f"{len(m.pages)} páginas" if m.sparse else "denso"
+        print(f"{len(m.addrs)} palabras leídas, tamaño {len(m)} ({kind})")
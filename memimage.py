@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  memimage.py – Formatos de imagen de memoria para los ensambladores
+#  Escritura en bloque (un solo write por archivo) de:
+#    hex    $readmemh, una palabra %08X por línea (formato de siempre)
+#    hexs   $readmemh disperso, con directivas @dirección (en palabras)
+#    memb   $readmemb, 32 dígitos binarios por línea
+#    bin    binario crudo little-endian (array('I') / NumPy tal cual)
+#    binbe  binario crudo big-endian
+#    ihex   Intel HEX (bytes little-endian, registros de 16 bytes)
+#  y un cargador que abre los archivos con mmap; el binario crudo se
+#  devuelve como vista sobre el mmap, sin copiar ni parsear texto.
+# ──────────────────────────────────────────────────────────────
+import mmap
+import os
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:          # los formatos funcionan sin NumPy
+    np = None
+
+FORMATS = ("hex", "hexs", "memb", "bin", "binbe", "ihex")
+EXTENSIONS = {
+    ".mem": "hex", ".memh": "hex", ".memb": "memb", ".bin": "bin",
+    ".binbe": "binbe", ".be": "binbe", ".hex": "ihex", ".ihex": "ihex",
+}
+_WORD = "I" if array("I").itemsize == 4 else "L"
+
+
+def guess_format(path: str) -> str:
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "hex")
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Imágenes: densas (secuencia) o dispersas (dirección -> palabra)
+# ──────────────────────────────────────────────────────────────
+def _runs(image):
+    """Tramos contiguos [(dirección inicial, palabras)] de la imagen.
+
+    `image` puede ser una secuencia (None = x, se omite) o un dict
+    {dirección de palabra: valor}.
+    """
+    if isinstance(image, dict):
+        items = sorted(image.items())
+    else:
+        if np is not None and isinstance(image, np.ndarray):
+            return [(0, image)]
+        if all(w is not None for w in image):
+            return [(0, image)]
+        items = [(a, w) for a, w in enumerate(image) if w is not None]
+    runs, start, cur = [], None, []
+    for a, w in items:
+        if start is not None and a == start + len(cur):
+            cur.append(w)
+        else:
+            if cur:
+                runs.append((start, cur))
+            start, cur = a, [w]
+    if cur:
+        runs.append((start, cur))
+    return runs
+
+
+def _words(words):
+    """array('I') con las palabras (sin copia si ya lo es)."""
+    if isinstance(words, array) and words.typecode == _WORD:
+        return words
+    return array(_WORD, [w & 0xFFFFFFFF for w in words])
+
+
+def _raw(words, big_endian: bool = False):
+    """Buffer con las palabras en el orden de bytes pedido.
+
+    Un ndarray uint32 contiguo (o un array('I')) en ese orden se devuelve
+    tal cual; solo se copia si hay que convertir tipo u orden de bytes.
+    """
+    if np is not None and isinstance(words, np.ndarray):
+        return np.ascontiguousarray(words, dtype=">u4" if big_endian else "<u4")
+    w = _words(words)
+    if (sys.byteorder == "big") != big_endian:
+        w = array(_WORD, w)
+        w.byteswap()
+    return w
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Codificadores en bloque
+# ──────────────────────────────────────────────────────────────
+_HEX = b"0123456789ABCDEF"
+
+
+def hex_lines(words) -> bytes:
+    """'%08X\\n' por palabra, generado de una vez."""
+    if np is not None:
+        w = np.asarray(words, dtype=np.uint32)
+        shifts = np.arange(28, -1, -4, dtype=np.uint32)
+        out = np.empty((len(w), 9), dtype=np.uint8)
+        out[:, :8] = np.frombuffer(_HEX, dtype=np.uint8)[(w[:, None] >> shifts) & 0xF]
+        out[:, 8] = ord("\n")
+        return out.tobytes()
+    w = _words(words)
+    return (("%08X\n" * len(w)) % tuple(w)).encode()
+
+
+def bin_lines(words) -> bytes:
+    """32 dígitos binarios por palabra para $readmemb."""
+    if np is not None:
+        w = np.asarray(words, dtype=np.uint32).astype(">u4")
+        bits = np.unpackbits(w.view(np.uint8).reshape(-1, 4), axis=1)
+        out = np.empty((len(w), 33), dtype=np.uint8)
+        out[:, :32] = bits + ord("0")
+        out[:, 32] = ord("\n")
+        return out.tobytes()
+    return "".join(format(x, "032b") + "\n" for x in _words(words)).encode()
+
+
+def raw_bytes(words, big_endian: bool = False) -> bytes:
+    return _raw(words, big_endian).tobytes()
+
+
+def ihex_records(image) -> bytes:
+    out = []
+
+    def record(rtype, addr, data=b""):
+        body = bytes((len(data), addr >> 8 & 0xFF, addr & 0xFF, rtype)) + data
+        csum = -sum(body) & 0xFF
+        out.append(b":" + body.hex().upper().encode() + b"%02X\n" % csum)
+
+    upper = 0
+    for start, words in _runs(image):
+        data = raw_bytes(words)
+        a, pos = start * 4, 0
+        while pos < len(data):
+            if a >> 16 != upper:
+                upper = a >> 16
+                record(0x04, 0, upper.to_bytes(2, "big"))
+            # un registro no cruza un límite de 64 KB
+            n = min(16, len(data) - pos, 0x10000 - (a & 0xFFFF))
+            record(0x00, a & 0xFFFF, data[pos:pos + n])
+            a, pos = a + n, pos + n
+    record(0x01, 0)
+    return b"".join(out)
+
+
+def encode(image, fmt: str = "hex") -> bytes:
+    """Contenido completo del archivo en el formato pedido."""
+    if fmt == "hexs":
+        parts = []
+        for start, words in _runs(image):
+            parts.append(b"@%X\n" % start)
+            parts.append(hex_lines(words))
+        return b"".join(parts)
+    if fmt == "ihex":
+        return ihex_records(image)
+
+    words = _dense_words(image, fmt)
+    if fmt == "hex":
+        return hex_lines(words)
+    if fmt == "memb":
+        return bin_lines(words)
+    if fmt == "bin":
+        return raw_bytes(words)
+    if fmt == "binbe":
+        return raw_bytes(words, big_endian=True)
+    raise RuntimeError(f"Formato de imagen desconocido: {fmt}")
+
+
+def _dense_words(image, fmt: str):
+    runs = _runs(image)
+    if len(runs) > 1 or (runs and runs[0][0] != 0):
+        raise RuntimeError(f"El formato {fmt} no admite imágenes dispersas; use hexs o ihex")
+    return runs[0][1] if runs else []
+
+
+def write_image(path: str, image, fmt: str = None) -> None:
+    """Escribe la imagen con un único write; fmt por extensión si no se da.
+
+    En bin/binbe se escribe el buffer de las palabras directamente, sin
+    pasar por bytes (sin ninguna copia si ya es uint32 en ese orden).
+    """
+    fmt = fmt or guess_format(path)
+    if fmt in ("bin", "binbe"):
+        data = memoryview(_raw(_dense_words(image, fmt), fmt == "binbe"))
+    else:
+        data = encode(image, fmt)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Cargador (mmap)
+# ──────────────────────────────────────────────────────────────
+def _map(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_ihex(buf):
+    image, upper = {}, 0
+    for raw in bytes(buf).splitlines():
+        raw = raw.strip()
+        if not raw.startswith(b":"):
+            continue
+        rec = bytes.fromhex(raw[1:].decode())
+        n, addr, rtype, data = rec[0], rec[1] << 8 | rec[2], rec[3], rec[4:4 + rec[0]]
+        if sum(rec) & 0xFF:
+            raise RuntimeError(f"Checksum inválido en registro Intel HEX: {raw.decode()}")
+        if rtype == 0x00:
+            base = upper + addr
+            for i in range(n):
+                a = base + i
+                w = image.get(a >> 2, 0)
+                image[a >> 2] = w | data[i] << (8 * (a & 3))
+        elif rtype == 0x04:
+            upper = int.from_bytes(data, "big") << 16
+        elif rtype == 0x02:
+            upper = int.from_bytes(data, "big") << 4
+        elif rtype == 0x01:
+            break
+    return image
+
+
+def _dense(image: dict):
+    n = max(image) + 1 if image else 0
+    if np is not None:
+        out = np.zeros(n, dtype=np.uint32)
+        if image:
+            out[np.fromiter(image.keys(), np.int64, len(image))] = np.fromiter(
+                image.values(), np.uint32, len(image))
+        return out
+    out = array(_WORD, bytes(4 * n))
+    for a, w in image.items():
+        out[a] = w
+    return out
+
+
+def load_image(path: str, fmt: str = None):
+    """Palabras de la imagen como arreglo uint32 (huecos y x en 0).
+
+    El binario crudo se devuelve como vista de NumPy sobre el mmap (o un
+    memoryview 'I' sin NumPy), así no se copia ni se parsea nada; sin
+    NumPy, si el orden de bytes no es el nativo sí se copia a un array.
+    """
+    fmt = fmt or guess_format(path)
+    buf = _map(path)
+    if fmt in ("bin", "binbe"):
+        if len(buf) % 4:
+            raise RuntimeError(f"{path}: tamaño no múltiplo de 4 bytes")
+        if np is not None:
+            return np.frombuffer(buf, dtype="<u4" if fmt == "bin" else ">u4")
+        if (sys.byteorder == "big") == (fmt == "binbe"):
+            return memoryview(buf).cast(_WORD)
+        words = array(_WORD, bytes(buf))
+        words.byteswap()
+        return words
+    if fmt == "ihex":
+        return _dense(_parse_ihex(buf))
+    if fmt in ("hex", "hexs", "memb"):
+        # texto: lector compartido de memfile.py (x y huecos quedan en 0)
+        import memfile
+        m = memfile.parse(buf, path, 16 if fmt != "memb" else 2)
+        if isinstance(m, list):
+            return array(_WORD, [0 if w is None else w for w in m])
+        if m.sparse:
+            raise RuntimeError(f"{path}: imagen dispersa, use memfile.load()")
+        return m.words
+    raise RuntimeError(f"Formato de imagen desconocido: {fmt}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python memimage.py <entrada> <salida> [formato_salida]")
+        print(f"Formatos: {', '.join(FORMATS)}")
+        sys.exit(1)
+    words = load_image(sys.argv[1])
+    write_image(sys.argv[2], words, sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"{len(words)} palabras escritas en {sys.argv[2]}")
@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  netlist.py – Grafo estructural de netlist/top.json (Yosys)
+#  netlist/top.ys sólo hace `proc` y `write_json`: no hay `hierarchy`
+#  ni `flatten`, así que cada módulo trae sus celdas $… y las
+#  instancias de submódulos sin elaborar (flopr con el WIDTH por
+#  defecto aunque la instancia pida 32).
+#
+#  El JSON se lee una vez y se guarda al lado como <json>.graph.npz,
+#  invalidado por el hash del JSON. Por módulo:
+#    · nets enteros (los de Yosys; 0/1 son las constantes, -1 = x/z)
+#    · tabla de celdas (nombre, tipo, src) y de parámetros
+#    · pines en CSR: celda, puerto, dirección y bits
+#    · adyacencia: celda que maneja cada net y lectores de cada net
+#
+#  Informes:
+#    celdas       conteo por tipo en cada módulo y jerárquico desde top
+#    area         estimación en equivalentes de compuerta (GE, NAND2 = 1)
+#    profundidad  camino combinacional más largo por operación de alu.v,
+#                 con ALUControl fijo (los mux con selección constante
+#                 son cables), en niveles de compuerta de 2 entradas;
+#                 las instancias suman su retardo puerto a puerto, y si
+#                 su módulo no está en el JSON el valor sale con "+"
+#  Área y retardo son un modelo grueso por tipo de celda y ancho, para
+#  comparar versiones del RTL, no un resultado de síntesis.
+# ──────────────────────────────────────────────────────────────
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+import numpy as np
+
+DEFAULT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "netlist", "top.json")
+GRAPH_VERSION = 1
+
+X = -1                                          # net de un bit x/z
+CONST_NET = {"0": 0, "1": 1, "x": X, "z": X}
+DIRS = ("input", "output", "inout")
+
+SEQUENTIAL = {"$dff", "$adff", "$dffe", "$adffe", "$sdff", "$sdffe", "$dffsr",
+              "$memwr", "$memwr_v2", "$meminit", "$meminit_v2"}
+
+# alu.v: ALUControl -> operación
+ALU_OPS = {
+    0b0000: "ADD", 0b0001: "SUB", 0b0010: "AND", 0b0011: "ORR",
+    0b0100: "DIV", 0b0101: "UMUL", 0b0110: "SMUL", 0b0111: "MUL",
+    0b1000: "FADDS", 0b1001: "FMULS", 0b1010: "MOV", 0b1011: "MOV16",
+    0b1100: "MOVT", 0b1101: "MOVM", 0b1110: "FADDH", 0b1111: "FMULH",
+}
+
+
+def _log2(n: int) -> int:
+    return max(1, math.ceil(math.log2(max(n, 2))))
+
+
+def _param(text: str):
+    """Parámetro de Yosys: binario -> int (x como 0); el resto queda texto."""
+    if text == "":
+        return 0, ""
+    if set(text) <= set("01xz"):
+        return int(text.replace("x", "0").replace("z", "0"), 2), ""
+    return 0, text
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Módulo
+# ──────────────────────────────────────────────────────────────
+class Module:
+    """Tablas de un módulo. Todo lo que va a disco son arreglos NumPy."""
+
+    FIELDS = ("port_names", "port_dir", "port_ptr", "port_bits",
+              "cell_names", "cell_types", "cell_src",
+              "pin_cell", "pin_names", "pin_out", "pin_ptr", "pin_bits",
+              "par_cell", "par_names", "par_int", "par_text",
+              "mem_names", "mem_width", "mem_size",
+              "net_names", "net_ptr", "net_bits", "default_names", "default_int")
+
+    def __init__(self, name: str, arrays: dict) -> None:
+        self.name = name
+        for f in self.FIELDS:
+            setattr(self, f, arrays[f])
+        bits = np.concatenate([self.port_bits, self.pin_bits, self.net_bits, [1]])
+        self.n_nets = int(bits.max()) + 1
+        self._adjacency()
+
+    @classmethod
+    def from_json(cls, name: str, mod: dict) -> "Module":
+        a = {f: [] for f in cls.FIELDS}
+
+        def flat(names, ptr, bits, items):
+            ptr.append(0)
+            for n, b in items:
+                names.append(n)
+                bits.extend(CONST_NET[x] if isinstance(x, str) else x for x in b)
+                ptr.append(len(bits))
+
+        flat(a["port_names"], a["port_ptr"], a["port_bits"],
+             ((n, p["bits"]) for n, p in mod.get("ports", {}).items()))
+        a["port_dir"] = [DIRS.index(p["direction"]) for p in mod.get("ports", {}).values()]
+
+        a["pin_ptr"].append(0)
+        for c, (cname, cell) in enumerate(mod.get("cells", {}).items()):
+            a["cell_names"].append(cname)
+            a["cell_types"].append(cell["type"])
+            a["cell_src"].append(cell.get("attributes", {}).get("src", "").replace("{workspace}/", ""))
+            dirs = cell.get("port_directions", {})
+            for pin, bits in cell["connections"].items():
+                a["pin_cell"].append(c)
+                a["pin_names"].append(pin)
+                a["pin_out"].append(dirs.get(pin) == "output")
+                a["pin_bits"].extend(CONST_NET[x] if isinstance(x, str) else x for x in bits)
+                a["pin_ptr"].append(len(a["pin_bits"]))
+            for pname, text in cell.get("parameters", {}).items():
+                value, rest = _param(text)
+                a["par_cell"].append(c)
+                a["par_names"].append(pname)
+                a["par_int"].append(value)
+                a["par_text"].append(rest)
+        for mname, mem in mod.get("memories", {}).items():
+            a["mem_names"].append(mname)
+            a["mem_width"].append(mem["width"])
+            a["mem_size"].append(mem["size"])
+        for pname, text in mod.get("parameter_default_values", {}).items():
+            a["default_names"].append(pname)
+            a["default_int"].append(_param(text)[0])
+        flat(a["net_names"], a["net_ptr"], a["net_bits"],
+             ((n, v["bits"]) for n, v in mod.get("netnames", {}).items()))
+
+        types = {"port_dir": np.int8, "pin_out": bool, "par_int": np.int64, "default_int": np.int64,
+                 "mem_width": np.int32, "mem_size": np.int32}
+        arrays = {}
+        for f, v in a.items():
+            if f in types:
+                arrays[f] = np.array(v, dtype=types[f])
+            elif f.endswith(("_ptr", "_bits", "_cell")):
+                arrays[f] = np.array(v, dtype=np.int32)
+            else:
+                arrays[f] = np.array(v, dtype=str)
+        return cls(name, arrays)
+
+    def _adjacency(self) -> None:
+        """driver[net] = celda (-2 si es entrada del módulo, -1 ninguna);
+        readers en CSR: fan_cell[fan_ptr[n]:fan_ptr[n + 1]]."""
+        self.driver = np.full(self.n_nets, -1, dtype=np.int32)
+        for p in range(len(self.port_names)):
+            if self.port_dir[p] != 1:
+                b = self.port_bits[self.port_ptr[p]:self.port_ptr[p + 1]]
+                self.driver[b[b > 1]] = -2
+        lens = np.diff(self.pin_ptr)
+        owner = np.repeat(self.pin_cell, lens)
+        out = np.repeat(self.pin_out, lens)
+        nets = self.pin_bits
+        real = nets > 1
+        self.driver[nets[out & real]] = owner[out & real]
+        rd = ~out & real
+        order = np.argsort(nets[rd], kind="stable")
+        self.fan_cell = owner[rd][order]
+        self.fan_ptr = np.searchsorted(nets[rd][order], np.arange(self.n_nets + 1)).astype(np.int32)
+        # pines por celda: {puerto: (salida, bits)}
+        self.pins = [dict() for _ in range(len(self.cell_names))]
+        for i, c in enumerate(self.pin_cell):
+            self.pins[c][str(self.pin_names[i])] = (bool(self.pin_out[i]),
+                                                   self.pin_bits[self.pin_ptr[i]:self.pin_ptr[i + 1]])
+        self.params = [dict() for _ in range(len(self.cell_names))]
+        for i, c in enumerate(self.par_cell):
+            self.params[c][str(self.par_names[i])] = str(self.par_text[i]) or int(self.par_int[i])
+
+    def port(self, name: str):
+        p = list(self.port_names).index(name)
+        return self.port_bits[self.port_ptr[p]:self.port_ptr[p + 1]]
+
+    def words(self, c: int) -> int:
+        """Palabras de la memoria a la que apunta el MEMID de la celda."""
+        memid = self.params[c].get("MEMID")
+        hit = np.flatnonzero(self.mem_names == memid.lstrip("\\")) if isinstance(memid, str) else []
+        return int(self.mem_size[hit[0]]) if len(hit) else 0
+
+    def is_comb(self, c: int) -> bool:
+        t = str(self.cell_types[c])
+        if t in SEQUENTIAL:
+            return False
+        if t in ("$memrd", "$memrd_v2"):
+            return not self.params[c].get("CLK_ENABLE", 0)
+        return t.startswith("$")
+
+    def comb_order(self, through: dict = None) -> list:
+        """Celdas combinacionales en orden topológico (Kahn). Registros,
+        escrituras a memoria e instancias de submódulos cortan el grafo,
+        salvo las instancias de `through` ({celda: pines de entrada con
+        camino combinacional a alguna salida})."""
+        through = through or {}
+        comb = [self.is_comb(c) or c in through for c in range(len(self.cell_names))]
+        deps = [set() for _ in comb]
+        for c, pins in enumerate(self.pins):
+            if not comb[c]:
+                continue
+            for pin, (out, bits) in pins.items():
+                if not out and (c not in through or pin in through[c]):
+                    for d in self.driver[bits[bits > 1]]:
+                        if d >= 0 and comb[d] and d != c:
+                            deps[c].add(int(d))
+        users = [[] for _ in comb]
+        for c, ds in enumerate(deps):
+            for d in ds:
+                users[d].append(c)
+        pending = [len(ds) for ds in deps]
+        ready = [c for c in range(len(comb)) if comb[c] and not pending[c]]
+        order = []
+        while ready:
+            c = ready.pop()
+            order.append(c)
+            for u in users[c]:
+                pending[u] -= 1
+                if not pending[u]:
+                    ready.append(u)
+        loop = [str(self.cell_names[c]) for c in range(len(comb)) if comb[c] and pending[c]]
+        if loop:
+            raise RuntimeError(f"{self.name}: lazo combinacional en {', '.join(loop[:5])}")
+        return order
+
+    def submodules(self) -> list:
+        """[(celda, tipo, parámetros)] de las instancias de submódulos."""
+        return [(str(self.cell_names[c]), str(t), self.params[c])
+                for c, t in enumerate(self.cell_types) if not str(t).startswith("$")]
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Netlist y caché
+# ──────────────────────────────────────────────────────────────
+class Netlist:
+    def __init__(self, path: str = DEFAULT_JSON, rebuild: bool = False) -> None:
+        self.path = path
+        self.cache_path = path + ".graph.npz"
+        with open(path, "rb") as f:
+            self.hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        self.modules = None if rebuild else self._load()
+        if self.modules is None:
+            self._build()
+        self.delays = {}            # módulo -> port_delays(), en memoria
+
+    def _load(self):
+        try:
+            with np.load(self.cache_path) as z:
+                if str(z["hash"]) != self.hash or int(z["version"]) != GRAPH_VERSION:
+                    return None
+                cols = {f: (z[f], z[f + "@"]) for f in Module.FIELDS}
+                names = [str(m) for m in z["modules"]]
+        except (OSError, KeyError, ValueError):
+            return None
+        # un arreglo por campo para todos los módulos, cortado por desplazamientos
+        return {m: Module(m, {f: col[off[i]:off[i + 1]] for f, (col, off) in cols.items()})
+                for i, m in enumerate(names)}
+
+    def _build(self) -> None:
+        with open(self.path) as f:
+            data = json.load(f)
+        self.modules = {n: Module.from_json(n, m) for n, m in data["modules"].items()}
+        arrays = {"hash": np.array(self.hash), "version": np.array(GRAPH_VERSION),
+                  "modules": np.array(list(self.modules), dtype=str)}
+        for f in Module.FIELDS:
+            parts = [getattr(mod, f) for mod in self.modules.values()]
+            arrays[f] = np.concatenate(parts)
+            arrays[f + "@"] = np.cumsum([0] + [len(p) for p in parts])
+        tmp = self.cache_path + ".tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, self.cache_path)
+
+    def __getitem__(self, name: str) -> Module:
+        if name not in self.modules:
+            raise RuntimeError(f"Módulo no encontrado en el netlist: {name}")
+        return self.modules[name]
+
+    def top(self) -> str:
+        used = {t for m in self.modules.values() for _, t, _ in m.submodules()}
+        roots = [n for n in self.modules if n not in used]
+        return "top" if "top" in roots else roots[0]
+
+    def stale(self, rtl_dir: str = None) -> dict:
+        """{módulo: [(instancia, tipo)]} instanciados en el RTL actual
+        que el JSON no tiene (el netlist es anterior al RTL)."""
+        rtl_dir = rtl_dir or os.path.dirname(os.path.dirname(os.path.abspath(self.path)))
+        declared = {}
+        for fname in os.listdir(rtl_dir):
+            if fname.endswith(".v"):
+                with open(os.path.join(rtl_dir, fname), errors="replace") as f:
+                    text = f.read()
+                for m in re.finditer(r"^\s*module\s+(\w+)", text, re.M):
+                    declared[m.group(1)] = text
+        out = {}
+        for name, mod in self.modules.items():
+            if name not in declared:
+                continue
+            have = {c for c, _, _ in mod.submodules()}
+            rx = r"^\s*(\w+)\s*(?:#\s*\([^;]*?\)\s*)?(\w+)\s*\("
+            missing = [(inst, kind) for kind, inst in re.findall(rx, declared[name], re.M)
+                       if kind in declared and kind != "module" and inst not in have]
+            if missing:
+                out[name] = missing
+        return out
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Conteo y área
+# ──────────────────────────────────────────────────────────────
+def _w(p: dict, key: str, default: int = 1) -> int:
+    v = p.get(key, default)
+    return v if isinstance(v, int) else default
+
+
+def cell_area(kind: str, p: dict, words: int = 0) -> float:
+    """Equivalentes de compuerta de una celda según su tipo y anchos;
+    `words` es el tamaño de la memoria de los puertos $mem*."""
+    a, b, y = _w(p, "A_WIDTH"), _w(p, "B_WIDTH"), _w(p, "Y_WIDTH")
+    width = _w(p, "WIDTH")
+    if kind == "$not":
+        return 0.5 * y
+    if kind in ("$and", "$or"):
+        return 1.25 * y
+    if kind in ("$xor", "$xnor"):
+        return 2.5 * y
+    if kind in ("$logic_not", "$reduce_or", "$reduce_and", "$reduce_bool", "$reduce_xor"):
+        return 1.25 * max(a - 1, 1)
+    if kind in ("$logic_and", "$logic_or"):
+        return 1.25 * (a + b - 1)
+    if kind in ("$eq", "$ne"):
+        return 2.5 * max(a, b) + 1.25 * max(max(a, b) - 1, 1)
+    if kind == "$mux":
+        return 2.5 * width
+    if kind == "$pmux":
+        return 2.5 * width * _w(p, "S_WIDTH")
+    if kind in ("$add", "$sub", "$ge", "$gt", "$le", "$lt"):
+        return 7.0 * max(a, b)
+    if kind == "$mul":
+        return 7.0 * a * b
+    if kind in ("$div", "$mod"):
+        return 9.0 * a * b
+    if kind in ("$shr", "$shl", "$sshr", "$sshl", "$shift", "$shiftx"):
+        return 2.5 * y * min(b, _log2(a))
+    if kind in ("$dff", "$dffe"):
+        return 5.0 * width
+    if kind in ("$adff", "$adffe", "$sdff", "$sdffe"):
+        return 6.0 * width
+    words = words or 2 ** min(_w(p, "ABITS"), 16)
+    if kind in ("$memrd", "$memrd_v2"):
+        return 2.5 * width * (words - 1) if not p.get("CLK_ENABLE") else 5.0 * width
+    if kind in ("$memwr", "$memwr_v2"):
+        return 1.25 * words
+    return 0.0
+
+
+def _inst_scale(net: Netlist, kind: str, p: dict) -> float:
+    """Una instancia con otro WIDTH escala el módulo sin elaborar (las
+    instancias posicionales traen '$1' por el primer parámetro)."""
+    mod = net[kind]
+    if not len(mod.default_names):
+        return 1.0
+    base = int(mod.default_int[0])
+    want = p.get(str(mod.default_names[0]), p.get("$1", base))
+    return want / base if isinstance(want, int) and base else 1.0
+
+
+def cell_counts(net: Netlist, name: str) -> dict:
+    """{tipo: n} de las celdas propias del módulo."""
+    mod = net[name]
+    out = {}
+    for t in mod.cell_types:
+        out[str(t)] = out.get(str(t), 0) + 1
+    return out
+
+
+def area(net: Netlist, name: str, scale: float = 1.0) -> dict:
+    """{'propia': GE de las celdas del módulo, 'memorias': GE,
+    'total': GE con los submódulos, 'hijos': {instancia: total}}."""
+    mod = net[name]
+    own = sum(cell_area(str(t), mod.params[c], mod.words(c)) for c, t in enumerate(mod.cell_types))
+    mem = 5.0 * float(np.dot(mod.mem_width, mod.mem_size))
+    children = {}
+    for inst, kind, p in mod.submodules():
+        if kind in net.modules:
+            children[inst] = area(net, kind, _inst_scale(net, kind, p))["total"]
+    own, mem = own * scale, mem * scale
+    return {"propia": own, "memorias": mem, "hijos": children,
+            "total": own + mem + sum(children.values())}
+
+
+def hierarchy(net: Netlist, name: str = None, prefix: str = "", params=None):
+    """[(ruta, módulo, parámetros de la instancia)] desde `name`."""
+    name = name or net.top()
+    out = [(prefix or name, name, params or {})]
+    for inst, kind, p in net[name].submodules():
+        if kind in net.modules:
+            out += hierarchy(net, kind, f"{prefix or name}.{inst}", p)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Profundidad combinacional
+# ──────────────────────────────────────────────────────────────
+def cell_delay(kind: str, p: dict) -> int:
+    """Niveles de compuerta de 2 entradas de una celda (sumador prefijo,
+    multiplicador Wallace, divisor en arreglo)."""
+    a, b, y = _w(p, "A_WIDTH"), _w(p, "B_WIDTH"), _w(p, "Y_WIDTH")
+    if kind in ("$not", "$and", "$or", "$xor", "$xnor"):
+        return 1
+    if kind in ("$logic_not", "$reduce_or", "$reduce_and", "$reduce_bool", "$reduce_xor"):
+        return _log2(a)
+    if kind in ("$logic_and", "$logic_or"):
+        return max(_log2(a), _log2(b)) + 1
+    if kind in ("$eq", "$ne"):
+        return 1 + _log2(max(a, b))
+    if kind == "$mux":
+        return 2
+    if kind == "$pmux":
+        return 2 + _log2(_w(p, "S_WIDTH"))
+    if kind in ("$add", "$sub", "$ge", "$gt", "$le", "$lt"):
+        return 2 + 2 * _log2(max(a, b))
+    if kind == "$mul":
+        return 3 * math.ceil(math.log(max(min(a, b), 2)) / math.log(1.5)) + 2 + 2 * _log2(y)
+    if kind in ("$div", "$mod"):
+        return a * (2 + 2 * _log2(b))
+    if kind in ("$shr", "$shl", "$sshr", "$sshl", "$shift", "$shiftx"):
+        return 2 * min(b, _log2(a))
+    if kind in ("$memrd", "$memrd_v2"):
+        return 2 * _w(p, "ABITS")
+    return 0
+
+
+def _extend(vals, width: int, signed: bool):
+    vals = list(vals[:width])
+    fill = vals[-1] if signed and vals else 0
+    return vals + [fill] * (width - len(vals))
+
+
+def fold(kind: str, p: dict, ins: dict):
+    """Bits de Y (0, 1 o None) de una celda con entradas parcialmente
+    constantes, o None si el tipo no se pliega."""
+    y = _w(p, "Y_WIDTH", _w(p, "WIDTH"))
+    sa, sb = p.get("A_SIGNED") == 1, p.get("B_SIGNED") == 1
+    A = ins.get("A", [])
+    B = ins.get("B", [])
+    if kind in ("$not", "$and", "$or", "$xor", "$xnor"):
+        A = _extend(A, y, sa)
+        B = _extend(B, y, sb) if kind != "$not" else A
+        out = []
+        for x, z in zip(A, B):
+            if kind == "$not":
+                out.append(None if x is None else 1 - x)
+            elif kind == "$and":
+                out.append(0 if 0 in (x, z) else None if None in (x, z) else 1)
+            elif kind == "$or":
+                out.append(1 if 1 in (x, z) else None if None in (x, z) else 0)
+            else:
+                v = None if None in (x, z) else x ^ z
+                out.append(v if v is None or kind == "$xor" else 1 - v)
+        return out
+    if kind in ("$logic_not", "$reduce_or", "$reduce_bool", "$reduce_and", "$logic_and", "$logic_or"):
+        def truth(v):
+            return 1 if 1 in v else 0 if None not in v else None
+        if kind == "$reduce_and":
+            r = 0 if 0 in A else None if None in A else 1
+        elif kind == "$logic_not":
+            t = truth(A)
+            r = None if t is None else 1 - t
+        elif kind == "$logic_and":
+            ta, tb = truth(A), truth(B)
+            r = 0 if 0 in (ta, tb) else None if None in (ta, tb) else 1
+        elif kind == "$logic_or":
+            ta, tb = truth(A), truth(B)
+            r = 1 if 1 in (ta, tb) else None if None in (ta, tb) else 0
+        else:
+            r = truth(A)
+        return [r] + [0] * (y - 1)
+    if kind in ("$eq", "$ne"):
+        w = max(len(A), len(B))
+        A, B = _extend(A, w, sa), _extend(B, w, sb)
+        if any(x is not None and z is not None and x != z for x, z in zip(A, B)):
+            r = 0
+        elif None in A or None in B:
+            r = None
+        else:
+            r = 1
+        if r is not None and kind == "$ne":
+            r = 1 - r
+        return [r] + [0] * (y - 1)
+    if kind in ("$mux", "$pmux"):
+        sel = _select(kind, ins)
+        if sel is None:
+            return [None] * y
+        return list(sel[1])
+    return None
+
+
+def _select(kind: str, ins: dict):
+    """('A' o índice de B, bits elegidos) si la selección es constante."""
+    S = ins["S"]
+    if None in S:
+        return None
+    w = len(ins["A"])
+    if kind == "$mux":
+        return ("B", ins["B"]) if S[0] else ("A", ins["A"])
+    hot = [i for i, s in enumerate(S) if s]
+    if not hot:
+        return ("A", ins["A"])
+    if len(hot) == 1:
+        k = hot[0]
+        return (k, ins["B"][k * w:(k + 1) * w])
+    return None
+
+
+def port_delays(net: Netlist, name: str, _stack: tuple = ()) -> dict:
+    """{(entrada, salida): niveles} del camino combinacional más largo
+    entre puertos del módulo, bajando por sus propias instancias. Sin
+    entrada la salida sale de un registro (o es constante)."""
+    if name in net.delays:
+        return net.delays[name]
+    if name in _stack:
+        raise RuntimeError(f"Instanciación recursiva: {' > '.join(_stack + (name,))}")
+    mod = net[name]
+    outputs = [str(n) for n, d in zip(mod.port_names, mod.port_dir) if d == 1]
+    out = {}
+    for port in (str(n) for n, d in zip(mod.port_names, mod.port_dir) if d != 1):
+        arrival = depth(mod, net=net, origin=port, _stack=_stack + (name,))[0]
+        for o in outputs:
+            bits = mod.port(o)
+            reach = arrival[bits[bits > 1]]
+            if len(reach) and reach.max() >= 0:
+                out[(port, o)] = int(reach.max())
+    net.delays[name] = out
+    return out
+
+
+def depth(mod: Module, const: dict = None, net: Netlist = None, origin: str = None,
+          _stack: tuple = ()):
+    """Llegada en niveles de cada net del módulo con los puertos de
+    `const` fijos. Devuelve (llegada, via, crit_in, conocido, parcial):
+    via[net] es la celda que fija su llegada y crit_in[celda] la entrada
+    que llega última, para reconstruir el camino; parcial[net] marca los
+    nets detrás de una instancia cuyo módulo no está en `net` (su
+    llegada es un mínimo).
+
+    Con `net`, las instancias suman su retardo puerto a puerto; sin él
+    cortan el grafo. Con `origin` solo cuenta lo que sale de ese puerto
+    de entrada (llegada -1 en lo que no alcanza): es lo que usa
+    port_delays."""
+    known = np.full(mod.n_nets, -1, dtype=np.int8)
+    known[0], known[1] = 0, 1
+    for port, value in (const or {}).items():
+        for i, n in enumerate(mod.port(port)):
+            if n > 1:
+                known[n] = value >> i & 1
+    if origin is None:
+        arrival = np.zeros(mod.n_nets, dtype=np.int64)
+    else:
+        arrival = np.full(mod.n_nets, -1, dtype=np.int64)
+        bits = mod.port(origin)
+        arrival[bits[bits > 1]] = 0
+    via = np.full(mod.n_nets, -1, dtype=np.int32)
+    crit_in = np.full(len(mod.cell_names), -1, dtype=np.int32)
+    partial = np.zeros(mod.n_nets, dtype=bool)
+
+    # instancias: {celda: {(entrada, salida): niveles}}, None si falta el módulo
+    delays = {}
+    if net is not None:
+        for c, t in enumerate(mod.cell_types):
+            if not str(t).startswith("$"):
+                delays[c] = port_delays(net, str(t), _stack) if str(t) in net.modules else None
+    through = {c: {i for i, _ in d} if d is not None else set(mod.pins[c])
+               for c, d in delays.items()}
+
+    def value(n):
+        return None if n < 0 or known[n] < 0 else int(known[n])
+
+    for c in mod.comb_order(through):
+        if c in delays:
+            # instancia: cada salida llega con su peor entrada + retardo interno
+            d = delays[c]
+            outs = {k: b[b > 1] for k, (out, b) in mod.pins[c].items() if out}
+            ins = {k: b[b > 1] for k, (out, b) in mod.pins[c].items() if not out}
+            for o, ob in outs.items():
+                best, crit, part = -1, -1, d is None
+                for i, ib in ins.items():
+                    if not len(ib) or (d is not None and (i, o) not in d):
+                        continue
+                    k = int(np.argmax(arrival[ib]))
+                    if arrival[ib[k]] < 0:
+                        continue
+                    t = int(arrival[ib[k]]) + (0 if d is None else d[(i, o)])
+                    part |= bool(partial[ib].any())
+                    if t > best:
+                        best, crit = t, int(ib[k])
+                if best < 0 and origin is None:
+                    best = 0            # solo registros del submódulo
+                if best >= 0:
+                    arrival[ob] = best
+                    via[ob] = c if crit >= 0 else -1
+                    partial[ob] = part
+                    if crit >= 0 and (crit_in[c] < 0 or best >= arrival[crit_in[c]]):
+                        crit_in[c] = crit
+            continue
+        kind, p = str(mod.cell_types[c]), mod.params[c]
+        ins = {k: b for k, (out, b) in mod.pins[c].items() if not out}
+        outs = np.concatenate([b for out, b in mod.pins[c].values() if out])
+        vals = {k: [value(n) for n in b] for k, b in ins.items()}
+        y = fold(kind, p, vals)
+        if y is not None and "Y" in mod.pins[c]:
+            ybits = mod.pins[c]["Y"][1]
+            for n, v in zip(ybits, y):
+                if v is not None and n > 1:
+                    known[n] = v
+        sel = _select(kind, vals) if kind in ("$mux", "$pmux") else None
+        if sel is not None:
+            # selección constante: el mux es un cable hacia la entrada elegida
+            k = sel[0]
+            src = ins[k] if isinstance(k, str) else ins["B"][k * len(ins["A"]):(k + 1) * len(ins["A"])]
+            ybits = mod.pins[c]["Y"][1]
+            ok = (ybits > 1) & (src > 1)
+            arrival[ybits[ok]] = arrival[src[ok]]
+            via[ybits[ok]] = via[src[ok]]
+            partial[ybits[ok]] = partial[src[ok]]
+            continue
+        live = np.concatenate([b for b in ins.values()] or [np.zeros(0, dtype=np.int32)])
+        live = live[(live > 1)]
+        live = live[known[live] < 0]
+        live_out = outs[(outs > 1)]
+        live_out = live_out[known[live_out] < 0]
+        if not len(live_out):
+            continue
+        if len(live):
+            k = int(np.argmax(arrival[live]))
+            crit_in[c] = live[k]
+            start = arrival[live[k]]
+        else:
+            start = 0 if origin is None else -1
+        if start < 0:
+            continue                    # no alcanzado desde `origin`
+        arrival[live_out] = start + cell_delay(kind, p)
+        via[live_out] = c
+        partial[live_out] = partial[live].any()
+    return arrival, via, crit_in, known, partial
+
+
+def critical_path(mod: Module, res, bits) -> tuple:
+    """(niveles, [celdas], parcial) del bit más tardío de `bits`; niveles
+    es None si todos los bits quedan constantes y parcial dice si algún
+    bit pasa por una instancia sin módulo (niveles es un mínimo)."""
+    arrival, via, crit_in, known, partial = res
+    live = bits[bits > 1]
+    live = live[known[live] < 0]
+    if not len(live):
+        return None, [], False
+    net = int(live[np.argmax(arrival[live])])
+    levels, path = int(arrival[net]), []
+    c = via[net]
+    while c >= 0 and len(path) < len(mod.cell_names):
+        path.append(int(c))
+        net = crit_in[c]
+        c = via[net] if net >= 0 else -1
+    return levels, path[::-1], bool(partial[live].any())
+
+
+def alu_depths(net: Netlist, name: str = "alu") -> list:
+    """[(código, operación, {puerto: (niveles, camino, parcial)})] por
+    ALUControl, más el peor caso sin fijar ALUControl (código None)."""
+    mod = net[name]
+    outputs = [str(n) for n, d in zip(mod.port_names, mod.port_dir) if d == 1]
+    rows = []
+    for code in [None] + sorted(ALU_OPS):
+        res = depth(mod, None if code is None else {"ALUControl": code}, net)
+        paths = {o: critical_path(mod, res, mod.port(o)) for o in outputs}
+        rows.append((code, ALU_OPS.get(code, "cualquiera"), paths))
+    return rows
+
+
+def _path_text(mod: Module, path) -> str:
+    def src(c):
+        # "alu.v:0.0-0.0|alu.v:101.9-126.16": la primera ubicación real
+        spots = [m for m in re.findall(r"([\w.]+):(\d+)", str(mod.cell_src[c])) if m[1] != "0"]
+        return f"{mod.cell_types[c]}@{spots[0][0]}:{spots[0][1]}" if spots else str(mod.cell_types[c])
+    return " > ".join(src(c) for c in path)
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    reports = ("celdas", "area", "profundidad")
+    path = args[0] if args and args[0].endswith(".json") else DEFAULT_JSON
+    todo = [a for a in args if not a.endswith(".json")] or list(reports)
+    if any(r not in reports for r in todo):
+        print("Uso: python netlist.py [top.json] [celdas] [area] [profundidad] "
+              "[--module=alu] [--rebuild]")
+        sys.exit(1)
+    try:
+        net = Netlist(path, "--rebuild" in sys.argv)
+        print(f"{path}: {len(net.modules)} módulos, hash {net.hash}")
+        for mod, missing in net.stale().items():
+            print(f"  aviso: {mod} instancia en el RTL " +
+                  ", ".join(f"{i} ({k})" for i, k in missing) + " y el netlist no los tiene")
+
+        if "celdas" in todo:
+            print("\n== Celdas por módulo ==")
+            for name in sorted(net.modules):
+                counts = cell_counts(net, name)
+                cells = "  ".join(f"{t}={n}" for t, n in sorted(counts.items(), key=lambda kv: -kv[1]))
+                print(f"{name:11} {sum(counts.values()):4d}  {cells}")
+            total = {}
+            for _, name, _ in hierarchy(net):
+                for t, n in cell_counts(net, name).items():
+                    if t.startswith("$"):
+                        total[t] = total.get(t, 0) + n
+            print(f"{'jerarquía':11} {sum(total.values()):4d}  " +
+                  "  ".join(f"{t}={n}" for t, n in sorted(total.items(), key=lambda kv: -kv[1])))
+
+        if "area" in todo:
+            print("\n== Área estimada (GE) ==")
+            for route, name, p in hierarchy(net):
+                a = area(net, name, _inst_scale(net, name, p))
+                indent = "  " * route.count(".")
+                print(f"{indent + route.split('.')[-1]:24} {name:11} "
+                      f"{a['total']:12.0f}  (propia {a['propia']:.0f}, memorias {a['memorias']:.0f})")
+
+        if "profundidad" in todo:
+            name = opts.get("module", "alu")
+            mod = net[name]
+            print(f"\n== Profundidad combinacional de {name} por ALUControl (niveles) ==")
+            partial = False
+            for code, op, paths in alu_depths(net, name):
+                label = "----" if code is None else f"{code:04b}"
+                cols = "  ".join(f"{o}=" + (" cte " if lv is None else f"{lv:4d}" + "+ "[not part])
+                                 for o, (lv, _, part) in paths.items())
+                print(f"{label} {op:10} {cols}")
+                worst = max(paths.values(), key=lambda lp: lp[0] or 0)
+                if worst[1]:
+                    print(f"{'':16}{_path_text(mod, worst[1])}")
+                partial |= any(part for _, _, part in paths.values())
+            if partial:
+                missing = sorted({k for _, k, _ in mod.submodules() if k not in net.modules})
+                print(f"  + pasa por instancias sin módulo en el JSON ({', '.join(missing)}): "
+                      "el valor es un mínimo, regenere el netlist")
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  peephole.py – Optimizaciones de mirilla para scpython.py
+#  Etapa opcional entre la tokenización y la codificación de
+#  ARM_Assembler.assemble_program. Cada regla reescribe o quita
+#  instrucciones sin cambiar registros, banderas ni memoria tal como
+#  los deja el RTL, y queda anotada en un registro auditable con las
+#  palabras y ciclos ahorrados por ejecución (caminos de mainfsm.v).
+#
+#  Reglas (todas activas por defecto, se apagan por nombre):
+#    zero_imm   SUB Rx, R15, R15 + ADD/ORR Rx, Rx, #imm  ->  MOV Rx, #imm
+#    b_next     B<cond> a la instrucción siguiente        ->  (nada)
+#    mov_self   MOV/LSL/LSR Rx, Rx (el RTL no desplaza)   ->  (nada)
+#    add_zero   ADD/SUB/ORR Rx, Rx, #0 sin S              ->  (nada)
+#
+#  MUL por potencia de dos -> LSL no se incluye: LSL no desplaza en
+#  este datapath (decode.v la trata como MOV) y todo DP cuesta los
+#  mismos 4 ciclos, así que no ahorra nada y cambiaría el resultado.
+#
+#  Quitar palabras corre las direcciones del código que sigue. Si el
+#  programa usa R15 (fuera del SUB Rx, R15, R15) no se toca nada; los
+#  programas que escriben con STR sobre su propio código quedan bajo
+#  responsabilidad del autor.
+# ──────────────────────────────────────────────────────────────
+from iss import CYCLES
+
+RULES = ("zero_imm", "b_next", "mov_self", "add_zero")
+COST = {"DP": CYCLES["DPI"], "B": CYCLES["B"]}
+
+
+class Insn:
+    """Vista de una línea tokenizada: (instr, cond, S, regs, imms, label)."""
+
+    def __init__(self, asm, ln, pc, toks, text) -> None:
+        self.ln, self.pc, self.toks, self.text = ln, pc, toks, text
+        op = next((v for k, v in toks if k == "OP"), None)
+        self.instr, self.cond, self.S = asm.decode_mnemonic(op) if op else (None, "AL", False)
+        self.regs = [int(v[1:]) for k, v in toks if k == "REG"]
+        self.imms = [int(v[1:], 0) for k, v in toks if k == "IMM"]
+        self.label = next((v for k, v in toks if k == "POINTER"), None)
+
+
+class Peephole:
+    def __init__(self, disabled=()) -> None:
+        unknown = set(disabled) - set(RULES)
+        if unknown:
+            raise RuntimeError(f"Regla desconocida: {', '.join(sorted(unknown))} (use {', '.join(RULES)})")
+        self.enabled = [r for r in RULES if r not in disabled]
+        self.log: list = []         # (regla, línea, antes, después, palabras, ciclos)
+
+    # ─── entrada desde assemble_program
+    def run(self, asm, token_lines, src_clean):
+        """Devuelve (token_lines, src_clean) optimizados y corrige asm.labels."""
+        code = [Insn(asm, ln, pc, toks, text)
+                for (ln, pc, toks), text in zip(token_lines, src_clean)]
+        fixed = next((i for i in code if self._uses_pc(i)), None)
+        if fixed is not None:
+            self.log.append(("-", fixed.ln, fixed.text, "", 0, 0))
+            return token_lines, src_clean
+        changed = True
+        while changed:
+            targets = set(asm.labels.values())
+            changed = False
+            for rule in self.enabled:
+                new = getattr(self, "_" + rule)(asm, code, targets)
+                if new is not None:
+                    code = self._renumber(asm, new)
+                    changed = True
+                    break
+        return [(i.ln, i.pc, i.toks) for i in code], [i.text for i in code]
+
+    @staticmethod
+    def _uses_pc(i: Insn) -> bool:
+        """R15 como dato o como destino depende de dónde queda el código."""
+        if i.instr == "SUB" and len(i.regs) == 3 and i.regs[1:] == [15, 15] and i.regs[0] != 15:
+            return False
+        return 15 in i.regs
+
+    @staticmethod
+    def _renumber(asm, new):
+        """Recalcula pc y etiquetas; la etiqueta de una palabra quitada
+        pasa a la siguiente que queda."""
+        from bisect import bisect_left
+        kept = [i.pc for i in new]
+        for name, pc in asm.labels.items():
+            asm.labels[name] = bisect_left(kept, pc)
+        for k, i in enumerate(new):
+            i.pc = k
+        return new
+
+    def _note(self, rule, insns, after, saved_words, saved_cycles) -> None:
+        before = " + ".join(i.text for i in insns)
+        self.log.append((rule, insns[0].ln, before, after, saved_words, saved_cycles))
+
+    # ─── reglas: devuelven la lista nueva o None si no aplican
+    def _zero_imm(self, asm, code, targets):
+        for k in range(len(code) - 1):
+            a, b = code[k], code[k + 1]
+            if not (a.instr == "SUB" and not a.S and len(a.regs) == 3 and a.regs[1:] == [15, 15]):
+                continue
+            rx = a.regs[0]
+            if b.pc in targets:
+                continue
+            if not (b.instr in ("ADD", "ORR") and not b.S and b.cond == a.cond
+                    and b.regs == [rx, rx] and len(b.imms) == 1 and b.imms[0] <= 0xFF):
+                continue
+            suffix = "" if a.cond == "AL" else a.cond
+            text = f"MOV{suffix} R{rx}, #{b.imms[0]}"
+            toks = [("OP", "MOV" + suffix), ("REG", f"R{rx}"), ("COMMA", ","), ("IMM", f"#{b.imms[0]}")]
+            mov = Insn(asm, a.ln, a.pc, toks, text)
+            self._note("zero_imm", [a, b], text, 1, COST["DP"])
+            return code[:k] + [mov] + code[k + 2:]
+        return None
+
+    def _b_next(self, asm, code, targets):
+        for k, i in enumerate(code):
+            if i.instr == "B" and asm.labels.get(i.label) == i.pc + 1:
+                self._note("b_next", [i], "", 1, COST["B"])
+                return code[:k] + code[k + 1:]
+        return None
+
+    def _mov_self(self, asm, code, targets):
+        for k, i in enumerate(code):
+            if i.instr in ("MOV", "LSL", "LSR") and len(i.regs) == 2 \
+                    and i.regs[0] == i.regs[1] and (i.instr == "MOV" or not i.S):
+                self._note("mov_self", [i], "", 1, COST["DP"])
+                return code[:k] + code[k + 1:]
+        return None
+
+    def _add_zero(self, asm, code, targets):
+        for k, i in enumerate(code):
+            if i.instr in ("ADD", "SUB", "ORR") and not i.S and len(i.regs) == 2 \
+                    and i.regs[0] == i.regs[1] and i.imms == [0]:
+                self._note("add_zero", [i], "", 1, COST["DP"])
+                return code[:k] + code[k + 1:]
+        return None
+
+    # ─── informe
+    def summary(self) -> str:
+        lines = []
+        for rule, ln, before, after, words, cycles in self.log:
+            if rule == "-":
+                lines.append(f"sin cambios: la línea {ln} ({before}) usa R15 y el código no se puede mover")
+                continue
+            lines.append(f"{rule:9} línea {ln:4d}: {before}  ->  {after or '(quitada)'}"
+                         f"   (-{words} palabra{'s' if words != 1 else ''}, -{cycles} ciclos)")
+        words = sum(e[4] for e in self.log)
+        cycles = sum(e[5] for e in self.log)
+        lines.append(f"{sum(e[0] != '-' for e in self.log)} reescrituras: -{words} palabras, "
+                     f"-{cycles} ciclos por pasada (cada instrucción ejecutada una vez)")
+        return "\n".join(lines)
@@ -2,8 +2,11 @@
 #  ASM-lite v2.2  –  Generador de código máquina ARM-like
 #  ▸ Añadido soporte para SMUL / UMUL (multiply-long)     – v2.0
 #  ▸ Añadido soporte para FADD / FMUL (punto flotante)   – v2.2
+#  ▸ Pseudo MOV32 Rd, #imm32 / LDR Rd, =imm32 (MOV/MOVM/MOVT)
+#  ▸ MOVM Rd, #imm8 / MOVT Rd, #imm12 también como instrucciones
 
 import re, sys, traceback
+from functools import lru_cache
 
 # ──────────────────────────────────────────────────────────────
 # 1.  Expresiones regulares para tokenizar
@@ -17,11 +20,15 @@ TOKEN_SPEC = {
     "S_COLON":   r";",
     "L_BRACKET": r"\[",
     "R_BRACKET": r"\]",
+    "LITERAL":   r"=(?:0x[0-9a-fA-F]+|[0-9]+)",
     "SPACE":     r"\s+",
     "COMMENT":   r"//.*",
     "UNKNOWN":   r".",
 }
 
+# Escáner de archivo completo: mismos tokens + saltos de línea explícitos
+FILE_TOKEN_SPEC = {"NEWLINE": r"\r\n|\r|\n", **TOKEN_SPEC, "SPACE": r"[^\S\r\n]+"}
+
 def reg_val(r: str) -> int:
     v = int(r[1:])
     if not (0 <= v <= 15):
@@ -34,6 +41,34 @@ def imm_val(s: str, m: int = 255) -> int:
         raise ValueError(f"Inmediato fuera de rango (0–{m}): {s}")
     return v
 
+# Constantes de 32 bits con los caminos de alu.v / extend.v:
+#   MOV  Rd,#imm12  Result = imm12                          (bits 11:0)
+#   MOVM Rd,#imm8   Result = (Rd & 0xFF000FFF) | imm8 << 12  (bits 19:12, borra 23:20)
+#   MOVT Rd,#imm12  Result = (Rd & 0x000FFFFF) | imm12 << 20 (bits 31:20)
+#   SUB  Rd,Rd,#imm8 Result = Rd - imm8
+# MOVM/MOVT conservan parte de Rd, así que la secuencia empieza siempre
+# con MOV; después sólo hace falta MOVM / MOVT si sus bits no son cero.
+# De 0xFFFFFF01 a 0xFFFFFFFF (-255 … -1) basta MOV #0 + SUB #imm8.
+# Es la más corta con MOV/MOVM/MOVT/SUB/ORR/ADD/LSL: ORR/ADD #imm8 sólo
+# tocan los bits bajos que ya pone MOV, SUB #imm8 sólo llega por debajo
+# de cero a esos 255 valores y LSL no desplaza en este datapath
+# (decode.v la trata como MOV).
+CONST_OPS = {"MOV": 0b1101, "MOVM": 0b1110, "MOVT": 0b1010, "SUB": 0b0010}
+
+@lru_cache(maxsize=4096)
+def const_sequence(value: int) -> tuple:
+    """((op, imm), ...) más corta que deja `value` en un registro."""
+    if not (0 <= value <= 0xFFFFFFFF):
+        raise ValueError(f"Constante fuera de 32 bits: {value:#x}")
+    if value >= 0xFFFFFF01:
+        return (("MOV", 0), ("SUB", 0x100000000 - value))
+    seq = [("MOV", value & 0xFFF)]
+    if value >> 12 & 0xFF:
+        seq.append(("MOVM", value >> 12 & 0xFF))
+    if value >> 20:
+        seq.append(("MOVT", value >> 20))
+    return tuple(seq)
+
 # ──────────────────────────────────────────────────────────────
 # 2.  Clase ensamblador
 # ──────────────────────────────────────────────────────────────
@@ -43,6 +78,10 @@ class ARM_Assembler:
             "|".join(f"(?P<{n}>{p})" for n, p in TOKEN_SPEC.items()),
             re.IGNORECASE,
         )
+        self.file_regex = re.compile(
+            "|".join(f"(?P<{n}>{p})" for n, p in FILE_TOKEN_SPEC.items()),
+            re.IGNORECASE,
+        )
 
         # 2.1 Instrucciones DP estándar
         #     (cmd ⇒ campo bits[24:21])
@@ -52,6 +91,8 @@ class ARM_Assembler:
             "ADD": 0b0100,
             "ORR": 0b1100,
             "MOV": 0b1101,
+            "MOVM": 0b1110,   # solo #imm (ver CONST_OPS)
+            "MOVT": 0b1010,
             "LSL": 0b1101,
             "LSR": 0b1101,
             "MUL": 0b0111,
@@ -81,16 +122,33 @@ class ARM_Assembler:
         # 2.4 Instrucciones especiales (vacío por ahora)
         self.spc_instr = {}
 
+        # Pseudoinstrucciones que se expanden a varias palabras
+        self.pseudo_instr = {"MOV32"}
+
         self.labels: dict[str, int] = {}
 
+        # Optimizador de mirilla opcional (peephole.py); None = apagado
+        self.peephole = None
+
         self.valid_ops = (
             list(self.dp_instr.keys())
             + list(self.mem_instr.keys())
             + list(self.b_instr.keys())
             + list(self.mul_long_cmd.keys())
             + list(self.spc_instr.keys())
+            + list(self.pseudo_instr)
         )
 
+        # Índice de mnemónicos: op × cond × S → (op, cond, S)
+        valid = set(self.valid_ops)
+        self.mnemonics = {}
+        for op in self.valid_ops:
+            for suf in [""] + list(self.conds):
+                for s in ("", "S"):
+                    dec = self._scan_mnemonic(op + suf + s)
+                    if dec[0] in valid:
+                        self.mnemonics[op + suf + s] = dec
+
     # ────────────────────── 2.5 Tokenización
     def tokenize_instruction(self, instr: str):
         tokens = []
@@ -99,15 +157,38 @@ class ARM_Assembler:
             if kind in ["SPACE", "COMMENT"]:
                 continue
             # Identificar posibles mnemónicos
-            if kind == "POINTER":
-                maybe, cond, _ = self.decode_mnemonic(value)
-                if maybe in self.valid_ops and cond in self.conds:
-                    kind = "OP"
+            if kind == "POINTER" and value.upper() in self.mnemonics:
+                kind = "OP"
             tokens.append((kind, value))
         return tokens
 
+    # Tokeniza el archivo entero en una sola pasada → (línea, texto, tokens)
+    def scan_program(self, text: str):
+        mnemonics = self.mnemonics
+        ln, start, tokens = 1, 0, []
+        for m in self.file_regex.finditer(text):
+            kind = m.lastgroup
+            if kind == "NEWLINE":
+                if tokens:
+                    yield ln, text[start:m.start()].split("//", 1)[0].strip(), tokens
+                    tokens = []
+                ln, start = ln + 1, m.end()
+                continue
+            if kind == "SPACE" or kind == "COMMENT":
+                continue
+            value = m.group()
+            if kind == "POINTER" and value.upper() in mnemonics:
+                kind = "OP"
+            tokens.append((kind, value))
+        if tokens:
+            yield ln, text[start:].split("//", 1)[0].strip(), tokens
+
     # ────────────────────── 2.6 Sufijos condicionales y 'S'
     def decode_mnemonic(self, instr: str):
+        dec = self.mnemonics.get(instr.upper())
+        return dec if dec is not None else self._scan_mnemonic(instr)
+
+    def _scan_mnemonic(self, instr: str):
         instr = instr.upper()
         S = instr.endswith("S")
         if S:
@@ -190,6 +271,19 @@ class ARM_Assembler:
                     (Rn << 16) | (Rd << 12) | operand2
                 )
 
+            # ─── MOVM Rd,#imm8 / MOVT Rd,#imm12 (como MOV #imm: S=0, Rn=0)
+            if instr in ("MOVM", "MOVT"):
+                if len(regs) != 1 or len(imms) != 1:
+                    raise RuntimeError(f"{instr} Rd,#imm")
+                Rd = regs[0]
+                operand2 = imm_val(next(v for k, v in tokens if k == "IMM"),
+                                   255 if instr == "MOVM" else 4095)
+                return (
+                    (self.conds[cond] << 28) | (0b00 << 26) |
+                    (1 << 25) | (cmd << 21) |
+                    (Rd << 12) | operand2
+                )
+
 
 
 
@@ -270,51 +364,87 @@ class ARM_Assembler:
 
         raise RuntimeError(f"Instrucción no reconocida: {instr}")
 
-    # ────────────────────── 2.8  Ensamblar programa completo ───────────────
+    # ────────────────────── 2.8  Pseudoinstrucciones ────────────────────────
+    def expand_pseudo(self, tokens):
+        """Palabras de MOV32 Rd,#imm32 / LDR Rd,=imm32, o None si no es pseudo."""
+        op_tok = next((v for k, v in tokens if k == "OP"), None)
+        if op_tok is None:
+            return None
+        instr, cond, _ = self.decode_mnemonic(op_tok)
+        lit = next((v for k, v in tokens if k == "LITERAL"), None)
+        if instr == "MOV32":
+            lit = next((v for k, v in tokens if k == "IMM"), lit)
+        elif instr != "LDR" or lit is None:
+            return None
+        regs = [reg_val(v) for k, v in tokens if k == "REG"]
+        if len(regs) != 1 or lit is None:
+            raise RuntimeError(f"{instr} Rd, #imm32 / LDR Rd, =imm32")
+        Rd = regs[0]
+        return [
+            (self.conds[cond] << 28) | (1 << 25) | (CONST_OPS[op] << 21)
+            | (Rd << 16 if op == "SUB" else 0) | (Rd << 12) | imm
+            for op, imm in const_sequence(int(lit[1:], 0))
+        ]
+
+    # ────────────────────── 2.9  Ensamblar programa completo ───────────────
     def assemble_program(self, text: str):
-        # eliminar comentarios/espacios y numerar
-        lines = [(n + 1, l.split("//", 1)[0].strip()) for n, l in enumerate(text.splitlines())]
-        lines = [(n, l) for n, l in lines if l]
-
         token_lines, src_clean, pc = [], [], 0
 
-        # Primer pase (etiquetas)
-        for ln, line in lines:
-            toks = self.tokenize_instruction(line)
-            if not toks:
-                continue
+        # Primer pase (etiquetas); el escáner ya quita comentarios y numera.
+        # Las pseudoinstrucciones se expanden aquí porque cambian los pc.
+        for ln, line, toks in self.scan_program(text):
             if toks[0][0] == "LABEL":
                 self.labels[toks[0][1][:-1]] = pc
                 toks = toks[1:]
-            if toks:
-                token_lines.append((ln, pc, toks))
-                src_clean.append(line)
+            if not toks:
+                continue
+            try:
+                words = self.expand_pseudo(toks)
+            except Exception as e:
+                print(f"\nERROR: {e}\nEN LÍNEA {ln}: {line}\n")
+                sys.exit(1)
+            for k, word in enumerate(words or [None]):
+                token_lines.append((ln, pc, toks if word is None else [("WORD", word)]))
+                src_clean.append(line if k == 0 else f"  ... {line}")
                 pc += 1
 
-        # Segundo pase (codificación)
-        machine = []
+        # Mirilla opcional entre tokenización y codificación
+        if self.peephole is not None:
+            token_lines, src_clean = self.peephole.run(self, token_lines, src_clean)
+
+        # Segundo pase (codificación); las líneas que no emiten palabra
+        # (-1) tampoco dejan texto ni número de línea
+        machine, listing = [], []
+        self.line_numbers = []          # línea fuente de cada palabra
         for idx, (ln, pc_val, toks) in enumerate(token_lines):
             try:
-                code = self.assemble_instruction(toks, pc_val)
-                if code != -1:
-                    machine.append(code)
+                if toks[0][0] == "WORD":
+                    code = toks[0][1]
+                else:
+                    code = self.assemble_instruction(toks, pc_val)
             except Exception as e:
                 print(f"\nERROR: {e}\nEN LÍNEA {ln}: {src_clean[idx]}\n")
                 sys.exit(1)
+            if code != -1:
+                machine.append(code)
+                listing.append(src_clean[idx])
+                self.line_numbers.append(ln)
 
-        return machine, src_clean
+        return machine, listing
 
 # ──────────────────────────────────────────────────────────────
 # 3.  main
 # ──────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     print("ARM-lite Assembler – v2.2 (SMUL/UMUL + FADD/FMUL)")
-    if len(sys.argv) < 2:
-        print("Uso: python asm.py <archivo.asm> [salida.mem]")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    if len(args) < 1:
+        print("Uso: python asm.py <archivo.asm> [salida.mem] [--opt] [--no-opt=regla,...]")
         sys.exit(1)
 
-    infile  = sys.argv[1]
-    outfile = sys.argv[2] if len(sys.argv) > 2 else "memfile.mem"
+    infile  = args[0]
+    outfile = args[1] if len(args) > 1 else "memfile.mem"
 
     try:
         source = open(infile, "r").read()
@@ -323,6 +453,9 @@ if __name__ == "__main__":
         sys.exit(1)
 
     asm = ARM_Assembler()
+    if "--opt" in sys.argv or "no-opt" in opts:
+        from peephole import Peephole
+        asm.peephole = Peephole(filter(None, opts.get("no-opt", "").split(",")))
     try:
         codes, src_lines = asm.assemble_program(source)
 
@@ -330,6 +463,10 @@ if __name__ == "__main__":
         for i, code in enumerate(codes):
             print(f"{i:02d} {src_lines[i].lstrip():24}: 0x{code:08X}")
 
+        if asm.peephole is not None:
+            print("\n== Mirilla ==")
+            print(asm.peephole.summary())
+
         with open(outfile, "w") as f:
             f.writelines(f"{c:08X}\n" for c in codes)
 
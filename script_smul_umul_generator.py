@@ -24,6 +24,9 @@ TOKEN_SPEC = {
     "UNKNOWN":   r".",
 }
 
+# Escáner de archivo completo: mismos tokens + saltos de línea explícitos
+FILE_TOKEN_SPEC = {"NEWLINE": r"\r\n|\r|\n", **TOKEN_SPEC, "SPACE": r"[^\S\r\n]+"}
+
 def reg_val(r: str) -> int:
     v = int(r[1:])
     if not (0 <= v <= 15):
@@ -45,6 +48,10 @@ class ARM_Assembler:
             "|".join(f"(?P<{n}>{p})" for n, p in TOKEN_SPEC.items()),
             re.IGNORECASE,
         )
+        self.file_regex = re.compile(
+            "|".join(f"(?P<{n}>{p})" for n, p in FILE_TOKEN_SPEC.items()),
+            re.IGNORECASE,
+        )
 
         # 2.1 Instrucciones DP estándar (sin SMUL/UMUL)
         self.dp_instr = {
@@ -88,6 +95,16 @@ class ARM_Assembler:
             + list(self.spc_instr.keys())
         )
 
+        # Índice de mnemónicos: op × cond × S → (op, cond, S)
+        valid = set(self.valid_ops)
+        self.mnemonics = {}
+        for op in self.valid_ops:
+            for suf in [""] + list(self.conds):
+                for s in ("", "S"):
+                    dec = self._scan_mnemonic(op + suf + s)
+                    if dec[0] in valid:
+                        self.mnemonics[op + suf + s] = dec
+
     # ────────────────────── 2.5 Tokenización línea
     def tokenize_instruction(self, instr: str):
         tokens = []
@@ -97,15 +114,38 @@ class ARM_Assembler:
                 continue
 
             # Detectar nombres de instrucción
-            if kind == "POINTER":
-                maybe, cond, _ = self.decode_mnemonic(value)
-                if maybe in self.valid_ops and cond in self.conds:
-                    kind = "OP"
+            if kind == "POINTER" and value.upper() in self.mnemonics:
+                kind = "OP"
             tokens.append((kind, value))
         return tokens
 
+    # Tokeniza el archivo entero en una sola pasada → (línea, texto, tokens)
+    def scan_program(self, text: str):
+        mnemonics = self.mnemonics
+        ln, start, tokens = 1, 0, []
+        for m in self.file_regex.finditer(text):
+            kind = m.lastgroup
+            if kind == "NEWLINE":
+                if tokens:
+                    yield ln, text[start:m.start()].split("//", 1)[0].strip(), tokens
+                    tokens = []
+                ln, start = ln + 1, m.end()
+                continue
+            if kind == "SPACE" or kind == "COMMENT":
+                continue
+            value = m.group()
+            if kind == "POINTER" and value.upper() in mnemonics:
+                kind = "OP"
+            tokens.append((kind, value))
+        if tokens:
+            yield ln, text[start:].split("//", 1)[0].strip(), tokens
+
     # ────────────────────── 2.6 Decodificar sufijos (cond, S)
     def decode_mnemonic(self, instr: str):
+        dec = self.mnemonics.get(instr.upper())
+        return dec if dec is not None else self._scan_mnemonic(instr)
+
+    def _scan_mnemonic(self, instr: str):
         instr = instr.upper()
         S = instr.endswith("S")
         if S: instr = instr[:-1]
@@ -251,14 +291,9 @@ class ARM_Assembler:
 
     # ────────────────────── 2.8 Procesar programa completo
     def assemble_program(self, text: str):
-        lines = [(n+1, l.split("//", 1)[0].strip()) for n, l in enumerate(text.splitlines())]
-        lines = [(n, l) for n, l in lines if l]
-
         token_lines, extract, pc = [], [], 0
         # Primer barrido (etiquetas)
-        for ln, line in lines:
-            toks = self.tokenize_instruction(line)
-            if not toks: continue
+        for ln, line, toks in self.scan_program(text):
             if toks[0][0] == "LABEL":
                 self.labels[toks[0][1][:-1]] = pc
                 toks = toks[1:]
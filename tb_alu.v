@@ -0,0 +1,68 @@
+// Banco autocomprobado de alu.v para todos los ALUControl
+// Lee vectores de alu_np.py (8 palabras por vector):
+//   ALUControl  a  b  ExtImm  A  Result  ResultHi  ALUFlags
+// DIV por cero viene con Result en x: ahí se exige que el RTL también
+// dé x y que C = V = 0.
+//
+//   python alu_np.py gen 1000000 alu_vectors.mem
+//   iverilog -o icarus/tb_alu.vvp tb_alu.v alu.v fadd.v fmul.v fadd16.v fmul16.v
+//   vvp icarus/tb_alu.vvp +vec=alu_vectors.mem +n=1000000
+module tb_alu;
+    parameter MAX = 1 << 20;               // vectores como máximo
+
+    reg  [31:0] vec [0:8*MAX-1];
+    reg  [31:0] a, b, ExtImm, A;
+    reg  [3:0]  ALUControl;
+    wire [31:0] Result, ResultHi;
+    wire [3:0]  ALUFlags;
+
+    reg  [31:0] exp_res, exp_hi;
+    reg  [3:0]  exp_flags;
+    reg  [8*256:1] vec_file;
+    integer n, i, errors, bad;
+
+    alu dut (
+        .a          (a),
+        .b          (b),
+        .ALUControl (ALUControl),
+        .Result     (Result),
+        .ResultHi   (ResultHi),
+        .ALUFlags   (ALUFlags),
+        .ExtImm     (ExtImm),
+        .A          (A)
+    );
+
+    initial begin
+        if (!$value$plusargs("vec=%s", vec_file)) vec_file = "alu_vectors.mem";
+        if (!$value$plusargs("n=%d", n))          n = 1000;
+        if (n > MAX) n = MAX;
+        $readmemh(vec_file, vec, 0, 8*n-1);
+
+        errors = 0;
+        for (i = 0; i < n; i = i + 1) begin
+            ALUControl = vec[8*i][3:0];
+            a          = vec[8*i+1];
+            b          = vec[8*i+2];
+            ExtImm     = vec[8*i+3];
+            A          = vec[8*i+4];
+            exp_res    = vec[8*i+5];
+            exp_hi     = vec[8*i+6];
+            exp_flags  = vec[8*i+7][3:0];
+            #1;
+            if (exp_res === 32'bx)
+                bad = Result !== 32'bx || ALUFlags[1:0] !== 2'b00;
+            else
+                bad = Result !== exp_res || ResultHi !== exp_hi || ALUFlags !== exp_flags;
+            if (bad) begin
+                if (errors < 10)
+                    $display("#%0d: ctrl=%04b a=%08h b=%08h imm=%08h A=%08h esperado=%08h/%08h/%04b obtenido=%08h/%08h/%04b",
+                             i, ALUControl, a, b, ExtImm, A, exp_res, exp_hi, exp_flags,
+                             Result, ResultHi, ALUFlags);
+                errors = errors + 1;
+            end
+        end
+
+        $display("%0d/%0d vectores coinciden", n - errors, n);
+        $finish;
+    end
+endmodule
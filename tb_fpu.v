@@ -0,0 +1,61 @@
+// Banco de regresión de FADD/FMUL a través de alu.v
+// Lee vectores de fpu_vectors.py (a, b, Result, ALUFlags por vector),
+// los aplica con el ALUControl pedido y vuelca Result/ALUFlags.
+//
+//   python fpu_vectors.py gen fadds 1000000 fadds.mem
+//   iverilog -o icarus/tb_fpu.vvp tb_fpu.v alu.v fadd.v fmul.v fadd16.v fmul16.v
+//   vvp icarus/tb_fpu.vvp +vec=fadds.mem +op=8 +n=1000000 +out=fadds_out.mem
+//   python fpu_vectors.py check fadds fadds.mem fadds_out.mem
+module tb_fpu;
+    parameter MAX = 1 << 20;               // vectores como máximo
+
+    reg  [31:0] vec [0:4*MAX-1];
+    reg  [31:0] res [0:2*MAX-1];
+    reg  [31:0] a, b;
+    reg  [3:0]  ALUControl;
+    wire [31:0] Result, ResultHi;
+    wire [3:0]  ALUFlags;
+
+    reg  [8*256:1] vec_file, out_file;
+    integer n, op, i, errors;
+
+    alu dut (
+        .a          (a),
+        .b          (b),
+        .ALUControl (ALUControl),
+        .Result     (Result),
+        .ResultHi   (ResultHi),
+        .ALUFlags   (ALUFlags),
+        .ExtImm     (32'b0),
+        .A          (32'b0)
+    );
+
+    initial begin
+        if (!$value$plusargs("vec=%s", vec_file)) vec_file = "fadds.mem";
+        if (!$value$plusargs("out=%s", out_file)) out_file = "fpu_out.mem";
+        if (!$value$plusargs("op=%d", op))        op = 4'b1000;     // FADDS
+        if (!$value$plusargs("n=%d", n))          n = 1000;
+        if (n > MAX) n = MAX;
+        ALUControl = op;
+        $readmemh(vec_file, vec, 0, 4*n-1);
+
+        errors = 0;
+        for (i = 0; i < n; i = i + 1) begin
+            a = vec[4*i];
+            b = vec[4*i+1];
+            #1;
+            res[2*i]   = Result;
+            res[2*i+1] = {28'b0, ALUFlags};
+            if (Result !== vec[4*i+2] || ALUFlags !== vec[4*i+3][3:0]) begin
+                if (errors < 10)
+                    $display("#%0d: a=%08h b=%08h esperado=%08h/%04b obtenido=%08h/%04b",
+                             i, a, b, vec[4*i+2], vec[4*i+3][3:0], Result, ALUFlags);
+                errors = errors + 1;
+            end
+        end
+
+        $writememh(out_file, res, 0, 2*n-1);
+        $display("ALUControl=%04b: %0d/%0d vectores coinciden", ALUControl, n - errors, n);
+        $finish;
+    end
+endmodule
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  tblog.py – Lector columnar del log por ciclo de testbench.v
+#  testbench.v imprime en cada flanco una línea
+#    t=…  STATE=…  PC=0x…  Instr=0x…  …  ALUFlags=…
+#  Desde PC=0x hasta el final todos los campos tienen ancho fijo, así
+#  que el formato se deduce de la primera línea y el resto se lee por
+#  bloques con NumPy: cada línea se ubica por su salto de línea y cada
+#  campo es un gather a desplazamiento fijo + tabla de nibbles. Sólo t y
+#  STATE (%0t, %0d) tienen ancho variable y se leen hacia adelante y
+#  hacia atrás desde los extremos conocidos. Nada de regex por línea,
+#  salvo para las líneas 't=' que no calzan con ese ancho (ALUControl
+#  es %03b de un bus de 4 bits y puede salir con 3 ó 4 dígitos): esas
+#  se leen campo a campo y vuelven a su lugar; si ni así se leen, se
+#  avisa cuántas se ignoraron.
+#
+#  Cada campo queda como columna tipada (hex -> uint32, bin -> uint8,
+#  t -> uint64, STATE -> int8 con -1 = x) más una máscara x/z por fila.
+#  Las columnas se guardan como .npy en <log>.cols/ y se abren con
+#  mmap; se rehacen sólo si el log cambió de tamaño o fecha.
+#
+#  Consultas: ciclos por instrucción, tiempo en cada estado de
+#  mainfsm.v y línea de tiempo de escrituras a memoria.
+# ──────────────────────────────────────────────────────────────
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from iss import STATE_NAMES
+
+BLOCK_BYTES = 32 << 20
+COLS_VERSION = 1
+
+# valor de cada byte como dígito hexadecimal; 16 = x/z u otro carácter
+_NIBBLE = np.full(256, 16, dtype=np.uint8)
+for _c in b"0123456789":
+    _NIBBLE[_c] = _c - ord("0")
+for _c in b"abcdef":
+    _NIBBLE[_c] = _NIBBLE[_c - 32] = _c - ord("a") + 10
+
+_FIELD = re.compile(rb"(\w+)=(0x)?(\S+)")
+_REG = re.compile(rb"R(\d+)=([0-9a-fA-FxXzZ]{8})\s*$")
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Formato
+# ──────────────────────────────────────────────────────────────
+class Layout:
+    """Posiciones de los campos de ancho fijo, relativas a 'PC=0x'.
+
+    fields: [(nombre, base, desplazamiento, ancho)] con base 16 ó 2.
+    """
+
+    def __init__(self, line: bytes) -> None:
+        line = line.rstrip(b"\r\n")
+        found = list(_FIELD.finditer(line))
+        names = [m.group(1).decode() for m in found]
+        if names[:3] != ["t", "STATE", "PC"] or found[2].group(2) is None:
+            raise RuntimeError(f"Formato de log no reconocido: {line[:60].decode(errors='replace')}")
+        self.anchor = found[2].start()
+        self.tail = len(line) - self.anchor
+        self.fields = []
+        for m in found[2:]:
+            base = 16 if m.group(2) else 2
+            if base == 2 and set(m.group(3)) - set(b"01xzXZ"):
+                raise RuntimeError(f"Campo {m.group(1).decode()} no es hex ni binario")
+            self.fields.append((m.group(1).decode(), base, m.start(3) - self.anchor, len(m.group(3))))
+        self.equals = [m.start(3) - self.anchor - (3 if m.group(2) else 1) for m in found[2:]]
+        self.value_cols = np.concatenate([np.arange(off, off + w) for _, _, off, w in self.fields])
+
+    def dtype(self):
+        cols = [("t", np.uint64), ("STATE", np.int8)]
+        for name, base, _, width in self.fields:
+            bits = width * (4 if base == 16 else 1)
+            cols.append((name, np.uint32 if bits > 8 else np.uint8))
+        return np.dtype(cols + [("xz", np.uint16)])
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Lectura por bloques
+# ──────────────────────────────────────────────────────────────
+def _windows(buf, width: int):
+    """Vista (len(buf) - width + 1, width): la fila i son los bytes
+    buf[i:i + width]. Indexarla por filas copia `width` bytes por línea
+    en lugar de armar una matriz de índices."""
+    return np.lib.stride_tricks.sliding_window_view(buf, width)
+
+
+def _decimal(buf, end, length, width: int):
+    """Números decimales que terminan en `end` (inclusive) con `length`
+    dígitos; (valores, todos los caracteres son dígitos)."""
+    start = end - width + 1
+    rows = _windows(buf, width)[np.maximum(start, 0)]
+    for i in np.flatnonzero(start < 0):          # sólo la primera línea del bloque
+        rows[i] = np.concatenate((np.zeros(-start[i], dtype=np.uint8), buf[:end[i] + 1]))
+    digits = rows[:, ::-1].astype(np.int64) - ord("0")
+    inside = np.arange(width) < length[:, None]
+    good = ((digits >= 0) & (digits <= 9) | ~inside).all(axis=1)
+    digits = np.where(inside, digits, 0)
+    return digits @ (10 ** np.arange(width)).astype(np.int64), good
+
+
+def parse_block(buf, layout: Layout):
+    """(filas, líneas que no son del formato, inicios, finales) de un
+    bloque de líneas completas; `buf` es uint8 y termina en '\\n'."""
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    ends = ends - (buf[np.maximum(ends - 1, 0)] == ord("\r"))
+    anchor = ends - layout.tail
+    if len(buf) < layout.tail + 14:
+        # ni una línea de datos cabe (cola del archivo)
+        return np.zeros(0, dtype=layout.dtype()), np.arange(len(ends)), starts, ends
+    # "t=0  STATE=0  " es lo mínimo antes de PC=0x
+    ok = (anchor >= starts + 14) & (buf[starts] == ord("t")) \
+        & (buf[np.minimum(starts + 1, len(buf) - 1)] == ord("="))
+    anchor_c = np.clip(anchor, 0, len(buf) - layout.tail)
+    for k, ch in enumerate(b"PC=0x"):
+        ok &= buf[anchor_c + k] == ch
+    for eq in layout.equals:
+        ok &= buf[anchor_c + eq] == ord("=")
+    sel = np.flatnonzero(ok)
+    a, s = anchor[sel], starts[sel]
+
+    # STATE: 1 ó 2 dígitos (o 'x') justo antes de "  PC="; t antes de "  STATE="
+    two = (buf[a - 4] >= ord("0")) & (buf[a - 4] <= ord("9"))
+    state, state_ok = _decimal(buf, a - 3, 1 + two, 2)
+    t_end = a - 12 - two
+    t, t_ok = _decimal(buf, t_end, t_end - s - 1, 20)
+    good = t_ok & (t_end - s - 1 <= 20)
+    if not good.all():
+        ok[sel[~good]] = False
+        sel, a, state, state_ok, t = sel[good], a[good], state[good], state_ok[good], t[good]
+
+    rows = np.zeros(len(sel), dtype=layout.dtype())
+    rows["t"] = t
+    rows["STATE"] = np.where(state_ok, state, -1)
+    xz = (~state_ok).astype(np.uint16)
+    # toda la cola de ancho fijo de una vez: una copia de fila por línea,
+    # luego sólo las columnas de los valores y la tabla de nibbles
+    tail = _windows(buf, layout.tail)[a]
+    nib = _NIBBLE[tail[:, layout.value_cols]]
+    col = 0
+    for k, (name, base, off, width) in enumerate(layout.fields):
+        f = nib[:, col:col + width]
+        col += width
+        bad = (f >= base).any(axis=1)
+        if base == 16 and width == 8:
+            packed = (f[:, 0::2] << 4) | (f[:, 1::2] & 15)
+            value = np.ascontiguousarray(packed).view(">u4")[:, 0]
+        else:
+            shift = 4 if base == 16 else 1
+            value = (f & (base - 1)).astype(np.uint32) @ (1 << shift * np.arange(width - 1, -1, -1)).astype(np.uint32)
+        rows[name] = np.where(bad, 0, value)
+        xz |= bad.astype(np.uint16) << (k + 1)
+    rows["xz"] = xz
+    return rows, np.flatnonzero(~ok), starts, ends
+
+
+def parse_line(line: bytes, layout: Layout):
+    """Fila de una línea 't=...' que no calza con el ancho fijo (p. ej.
+    ALUControl=%03b sobre un bus de 4 bits cambia de 3 a 4 dígitos).
+    None si le falta algún campo del formato."""
+    found = {m.group(1).decode(): m.group(3) for m in _FIELD.finditer(line)}
+    if "t" not in found or "STATE" not in found or any(n not in found for n, *_ in layout.fields):
+        return None
+    row = np.zeros(1, dtype=layout.dtype())
+    try:
+        row["t"] = int(found["t"])
+    except ValueError:
+        return None
+    xz = 0
+    try:
+        row["STATE"] = int(found["STATE"])
+    except ValueError:
+        row["STATE"], xz = -1, 1
+    for k, (name, base, _, _) in enumerate(layout.fields):
+        text = found[name].decode()
+        try:
+            value = int(text, base)
+        except ValueError:
+            value, xz = 0, xz | 1 << (k + 1)
+        row[name] = value & (np.iinfo(row.dtype[name]).max)
+    row["xz"] = xz
+    return row
+
+
+def read_blocks(path: str):
+    """Genera (filas, layout, registros {n: valor|None}) por bloque de
+    BLOCK_BYTES, con memoria acotada aunque el log tenga gigas."""
+    layout, dropped, first_bad = None, 0, b""
+    # un solo búfer: cada bloque se lee detrás de la línea incompleta del anterior
+    data = bytearray(BLOCK_BYTES + 1)
+    view = memoryview(data)
+    carry = 0
+    with open(path, "rb") as f:
+        while True:
+            n = f.readinto(view[carry:BLOCK_BYTES])
+            if n:
+                total = carry + n
+                cut = data.rfind(b"\n", 0, total) + 1
+                if not cut:
+                    raise RuntimeError(f"{path}: línea de más de {BLOCK_BYTES} bytes")
+            elif carry:
+                data[carry] = ord("\n")              # última línea sin '\n'
+                total = cut = carry + 1
+            else:
+                break
+            buf = np.frombuffer(data, dtype=np.uint8, count=cut)
+            if layout is None:
+                first = re.search(rb"^t=.*$", data[:cut], re.M)
+                if first is not None:
+                    layout = Layout(first.group(0))
+            if layout is not None:
+                rows, other, starts, ends = parse_block(buf, layout)
+                # las líneas sueltas (IMEM[...], el volcado final R0..R15) son pocas
+                regs, extra, at = {}, [], []
+                for i in other:
+                    line = bytes(data[int(starts[i]):int(ends[i])])
+                    if line.startswith(b"t="):
+                        row = parse_line(line, layout)
+                        if row is None:
+                            dropped += 1
+                            first_bad = first_bad or line
+                        else:
+                            extra.append(row)
+                            at.append(i)
+                        continue
+                    m = _REG.match(line)
+                    if m:
+                        text = m.group(2).decode()
+                        regs[int(m.group(1))] = None if set(text) & set("xXzZ") else int(text, 16)
+                if extra:
+                    # de vuelta al orden del archivo
+                    lines = np.concatenate((np.setdiff1d(np.arange(len(starts)), other), at))
+                    rows = np.concatenate([rows] + extra)[np.argsort(lines, kind="stable")]
+                del buf
+                yield rows, layout, regs
+            else:
+                del buf
+            data[:total - cut] = data[cut:total]
+            carry = total - cut
+    if layout is None:
+        raise RuntimeError(f"{path}: no hay líneas 't=... STATE=...' de testbench.v")
+    if dropped:
+        print(f"aviso: {path}: {dropped} líneas 't=' sin todos los campos se ignoraron "
+              f"(la primera: {first_bad[:80].decode(errors='replace')})", file=sys.stderr)
+
+
+def parse_log(path: str):
+    """(filas estructuradas, layout, registros finales {n: valor|None})."""
+    chunks, regs, layout = [], {}, None
+    for rows, layout, found in read_blocks(path):
+        chunks.append(rows)
+        regs.update(found)
+    return np.concatenate(chunks), layout, regs
+
+
+# ──────────────────────────────────────────────────────────────
+# 3.  Columnas en disco
+# ──────────────────────────────────────────────────────────────
+class Trace:
+    """Log de testbench.v como columnas NumPy (en memoria o mmap)."""
+
+    def __init__(self, path: str, cols_dir: str = None, rebuild: bool = False) -> None:
+        self.path = path
+        self.cols_dir = cols_dir or path + ".cols"
+        if rebuild or not self._load():
+            self._build()
+
+    def _stamp(self) -> list:
+        st = os.stat(self.path)
+        return [COLS_VERSION, st.st_size, st.st_mtime_ns]
+
+    def _load(self) -> bool:
+        try:
+            with open(os.path.join(self.cols_dir, "meta.json")) as f:
+                meta = json.load(f)
+            if meta["stamp"] != self._stamp():
+                return False
+            self.names = meta["names"]
+            self.regs = {int(k): v for k, v in meta["regs"].items()}
+            self.cols = {n: np.load(os.path.join(self.cols_dir, n + ".npy"), mmap_mode="r")
+                         for n in self.names + ["xz"]}
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _build(self) -> None:
+        rows, layout, self.regs = parse_log(self.path)
+        self.names = [n for n in rows.dtype.names if n != "xz"]
+        self.cols = {n: np.ascontiguousarray(rows[n]) for n in rows.dtype.names}
+        os.makedirs(self.cols_dir, exist_ok=True)
+        for n, col in self.cols.items():
+            np.save(os.path.join(self.cols_dir, n + ".npy"), col)
+        meta = {"stamp": self._stamp(), "names": self.names, "regs": self.regs}
+        tmp = os.path.join(self.cols_dir, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.cols_dir, "meta.json"))
+
+    def __len__(self) -> int:
+        return len(self.cols["t"])
+
+    def __getitem__(self, name: str):
+        return self.cols[name]
+
+    def known(self, name: str):
+        """Filas donde el campo `name` no tiene x/z."""
+        bit = 1 << (self.names.index(name) - 1) if name != "t" else 0
+        return (self.cols["xz"] & bit) == 0
+
+    def table(self):
+        """Las columnas como un arreglo estructurado."""
+        out = np.zeros(len(self), dtype=[(n, self.cols[n].dtype) for n in self.names + ["xz"]])
+        for n in self.names + ["xz"]:
+            out[n] = self.cols[n]
+        return out
+
+
+# ──────────────────────────────────────────────────────────────
+# 4.  Consultas
+# ──────────────────────────────────────────────────────────────
+def instructions(trace: Trace):
+    """Una fila por instrucción: (t, pc, instr, ciclos).
+
+    La instrucción empieza en FETCH; su palabra es Instr en el ciclo
+    siguiente (IRWrite la carga al final de FETCH). La última puede
+    quedar cortada por el $finish.
+    """
+    state = np.asarray(trace["STATE"])
+    fetch = np.flatnonzero(state == STATE_NAMES.index("FETCH"))
+    out = np.zeros(len(fetch), dtype=[("t", np.uint64), ("pc", np.uint32),
+                                      ("instr", np.uint32), ("cycles", np.uint32)])
+    out["t"] = trace["t"][fetch]
+    out["pc"] = trace["PC"][fetch]
+    out["instr"] = trace["Instr"][np.minimum(fetch + 1, len(trace) - 1)]
+    out["cycles"] = np.diff(fetch, append=len(trace))
+    return out
+
+
+def instr_class(instr):
+    """Clase de mainfsm.v (DPR, DPI, LDR, STR, B) de cada palabra."""
+    instr = np.asarray(instr, dtype=np.uint32)
+    op = (instr >> 26) & 3
+    return np.select([(op == 0) & ((instr >> 25) & 1 == 0), op == 0,
+                      (op == 1) & ((instr >> 20) & 1 == 1), op == 1, op == 2],
+                     ["DPR", "DPI", "LDR", "STR", "B"], "?")
+
+
+def cpi(trace: Trace) -> dict:
+    """{clase: (instrucciones, ciclos)} y 'total'."""
+    ins = instructions(trace)
+    cls = instr_class(ins["instr"])
+    out = {}
+    for c in ("DPR", "DPI", "LDR", "STR", "B", "?"):
+        sel = cls == c
+        if sel.any():
+            out[c] = (int(sel.sum()), int(ins["cycles"][sel].sum()))
+    out["total"] = (len(ins), int(ins["cycles"].sum()))
+    return out
+
+
+def state_time(trace: Trace) -> dict:
+    """{estado: (ciclos, tiempo)}; el período sale del propio log."""
+    state = np.asarray(trace["STATE"])
+    t = np.asarray(trace["t"])
+    period = int(np.median(np.diff(t))) if len(t) > 1 else 0
+    counts = np.bincount(state[state >= 0], minlength=len(STATE_NAMES))
+    out = {STATE_NAMES[s] if s < len(STATE_NAMES) else str(s): (int(n), int(n) * period)
+           for s, n in enumerate(counts) if n}
+    if (state < 0).any():
+        out["x"] = (int((state < 0).sum()), int((state < 0).sum()) * period)
+    return out
+
+
+def mem_writes(trace: Trace):
+    """Escrituras a memoria: (t, adr, data) de las filas con MemWrite=1."""
+    sel = (np.asarray(trace["MemWrite"]) == 1) & trace.known("MemWrite")
+    out = np.zeros(int(sel.sum()), dtype=[("t", np.uint64), ("adr", np.uint32), ("data", np.uint32),
+                                          ("known", bool)])
+    out["t"] = trace["t"][sel]
+    out["adr"] = trace["Adr"][sel]
+    out["data"] = trace["WriteData"][sel]
+    out["known"] = (trace.known("Adr") & trace.known("WriteData"))[sel]
+    return out
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    queries = ("cpi", "estados", "escrituras", "pcs")
+    if not args or any(q not in queries for q in args[1:]):
+        print("Uso: python tblog.py <testbench.log> [cpi] [estados] [escrituras] [pcs] "
+              "[--top=20] [--cols=dir] [--rebuild]")
+        sys.exit(1)
+    try:
+        trace = Trace(args[0], opts.get("cols"), "--rebuild" in sys.argv)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    todo = args[1:] or ["cpi", "estados", "escrituras"]
+    top = int(opts.get("top", 20))
+    print(f"{len(trace)} ciclos en el log ({trace.cols_dir})")
+
+    if "cpi" in todo:
+        print("\n== Ciclos por instrucción ==")
+        for c, (n, cyc) in cpi(trace).items():
+            print(f"{c:6} {n:10d} instr {cyc:12d} ciclos  CPI {cyc / max(n, 1):.2f}")
+    if "estados" in todo:
+        print("\n== Tiempo por estado ==")
+        res = state_time(trace)
+        total = max(sum(n for n, _ in res.values()), 1)
+        for s, (n, t) in sorted(res.items(), key=lambda kv: -kv[1][0]):
+            print(f"{s:9} {n:10d} ciclos {t:14d} t  {100 * n / total:6.2f}%")
+    if "pcs" in todo:
+        ins = instructions(trace)
+        pcs, inv, count = np.unique(ins["pc"], return_inverse=True, return_counts=True)
+        cyc = np.bincount(inv, weights=ins["cycles"])
+        print(f"\n== PC por ciclos (primeros {min(top, len(pcs))} de {len(pcs)}) ==")
+        for k in np.argsort(-cyc)[:top]:
+            print(f"0x{pcs[k]:08X} {count[k]:10d} veces {int(cyc[k]):12d} ciclos")
+    if "escrituras" in todo:
+        w = mem_writes(trace)
+        print(f"\n== Escrituras a memoria ({len(w)}, primeras {min(top, len(w))}) ==")
+        for t, adr, data, known in w[:top].tolist():
+            print(f"{t:>12}  [0x{adr:08X}] <= " + (f"0x{data:08X}" if known else "x"))
+    if trace.regs:
+        print("\n== Regfile final ==")
+        print("  ".join(f"R{i}=" + ("x" if v is None else f"{v:08x}") for i, v in sorted(trace.regs.items())))
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# ──────────────────────────────────────────────────────────────
+#  vcd.py – Lector indexado de dump.vcd (mmap + NumPy)
+#  testbench.v hace $dumpvars sin límite, así que dump.vcd crece a
+#  gigas en corridas largas. El archivo se mapea en memoria y se
+#  indexa una sola vez:
+#    · desplazamiento en bytes de cada marca de tiempo #t
+#    · páginas de ~PAGE_BYTES que empiezan en una marca, con un mapa de
+#      bits de qué identificadores cambian en cada página
+#  El índice se guarda al lado (dump.vcd.idx.npz) y se rehace solo si
+#  el VCD cambió de tamaño o fecha. Una consulta (señales + ventana de
+#  tiempo) sólo lee las páginas de la ventana donde esas señales
+#  cambian, más la última página anterior que fija su valor inicial.
+#
+#  Los nombres se buscan por sufijo y admiten comodines:
+#      dut.arm.dp.PC    dut.arm.c.dec.fsm.state    dut.arm.dp.rf.*
+#  Resultado por señal: (tiempos int64, valores uint64, x/z bool); las
+#  señales de más de 64 bits devuelven valores como enteros Python y
+#  las real como float64.
+# ──────────────────────────────────────────────────────────────
+import fnmatch
+import mmap
+import os
+import re
+import sys
+
+import numpy as np
+
+PAGE_BYTES = 1 << 18            # tamaño mínimo de página del índice
+SCAN_BYTES = 64 << 20           # bloque para buscar marcas de tiempo
+INDEX_VERSION = 1
+
+_VALUE_ID = re.compile(rb"^(?:[bBrR][^ \n]* |[01xzXZ])([^\s]+)", re.M)
+
+
+class Signal:
+    def __init__(self, name: str, code: str, width: int, kind: str) -> None:
+        self.name, self.code, self.width, self.kind = name, code, width, kind
+
+    def __repr__(self) -> str:
+        return f"Signal({self.name}, {self.code!r}, {self.width}, {self.kind})"
+
+
+# ──────────────────────────────────────────────────────────────
+# 1.  Cabecera
+# ──────────────────────────────────────────────────────────────
+def parse_header(mm):
+    """({nombre: Signal}, timescale, desplazamiento tras $enddefinitions)."""
+    end = mm.find(b"$enddefinitions")
+    if end < 0:
+        raise RuntimeError("VCD sin $enddefinitions")
+    end = mm.find(b"$end", end + 15) + 4
+    text = mm[:end].decode(errors="replace")
+    signals, scope, timescale = {}, [], ""
+    for kind, body in re.findall(r"\$(\w+)\s+(.*?)\s*\$end", text, re.S):
+        if kind == "scope":
+            scope.append(body.split()[-1])
+        elif kind == "upscope":
+            scope.pop()
+        elif kind == "timescale":
+            timescale = " ".join(body.split())
+        elif kind == "var":
+            parts = body.split()
+            vtype, width, code, name = parts[0], int(parts[1]), parts[2], parts[3]
+            # "rf [31:0]" y "rf[3] [31:0]": el rango de bits no es parte del nombre
+            if len(parts) > 4 and not parts[4].startswith("["):
+                name += parts[4]
+            full = ".".join(scope + [name])
+            signals[full] = Signal(full, code, width, "real" if vtype == "real" else "bits")
+    return signals, timescale, end
+
+
+# ──────────────────────────────────────────────────────────────
+# 2.  Índice
+# ──────────────────────────────────────────────────────────────
+def scan_times(mm, start: int):
+    """(tiempos, desplazamientos) de las líneas '#t' del cuerpo."""
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    offsets = [np.array([start], dtype=np.int64)] if start < len(buf) and buf[start] == ord("#") else []
+    for lo in range(start, len(buf), SCAN_BYTES):
+        chunk = buf[lo:min(lo + SCAN_BYTES + 1, len(buf))]
+        pos = np.flatnonzero((chunk[:-1] == ord("\n")) & (chunk[1:] == ord("#")))
+        offsets.append(pos.astype(np.int64) + lo + 1)
+    offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64)
+
+    # número decimal tras '#': hasta 19 dígitos, vectorizado por lotes
+    times = np.zeros(len(offsets), dtype=np.int64)
+    for lo in range(0, len(offsets), 1 << 20):
+        idx = offsets[lo:lo + (1 << 20), None] + np.arange(1, 20)
+        inside = idx < len(buf)
+        digits = buf[np.minimum(idx, len(buf) - 1)].astype(np.int64) - ord("0")
+        valid = np.cumprod(inside & (digits >= 0) & (digits <= 9), axis=1).astype(bool)
+        t = np.zeros(len(idx), dtype=np.int64)
+        for k in range(idx.shape[1]):
+            t = np.where(valid[:, k], t * 10 + digits[:, k], t)
+        times[lo:lo + len(t)] = t
+    return times, offsets
+
+
+class VCD:
+    def __init__(self, path: str, index_path: str = None, rebuild: bool = False) -> None:
+        self.path = path
+        self.file = open(path, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.signals, self.timescale, self.body = parse_header(self.mm)
+        self.codes = sorted({s.code for s in self.signals.values()})
+        self.code_index = {c: i for i, c in enumerate(self.codes)}
+        self.index_path = index_path or path + ".idx.npz"
+        if rebuild or not self._load_index():
+            self._build_index()
+
+    def close(self) -> None:
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ─── índice en disco
+    def _stamp(self):
+        st = os.stat(self.path)
+        return np.array([INDEX_VERSION, st.st_size, st.st_mtime_ns, PAGE_BYTES], dtype=np.int64)
+
+    def _load_index(self) -> bool:
+        try:
+            with np.load(self.index_path) as z:
+                if not np.array_equal(z["stamp"], self._stamp()) or z["codes"].tolist() != self.codes:
+                    return False
+                self.times, self.offsets = z["times"], z["offsets"]
+                self.page_ts, self.page_map = z["page_ts"], z["page_map"]
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _build_index(self) -> None:
+        self.times, self.offsets = scan_times(self.mm, self.body)
+        # páginas: la primera marca de tiempo tras cada PAGE_BYTES
+        if len(self.offsets):
+            marks = np.arange(self.offsets[0], len(self.mm), PAGE_BYTES)
+            page_ts = np.unique(np.searchsorted(self.offsets, marks))
+            page_ts = page_ts[page_ts < len(self.offsets)]
+        else:
+            page_ts = np.zeros(0, dtype=np.int64)
+        self.page_ts = page_ts.astype(np.int64)
+        page_map = np.zeros((len(self.page_ts), len(self.codes)), dtype=bool)
+        for p in range(len(self.page_ts)):
+            lo, hi = self._page_range(p)
+            seen = set(_VALUE_ID.findall(self.mm[lo:hi]))
+            cols = [self.code_index[c.decode()] for c in seen if c.decode() in self.code_index]
+            page_map[p, cols] = True
+        self.page_map = np.packbits(page_map, axis=1)
+        tmp = self.index_path + ".tmp.npz"
+        np.savez(tmp, stamp=self._stamp(), codes=np.array(self.codes), times=self.times,
+                 offsets=self.offsets, page_ts=self.page_ts, page_map=self.page_map)
+        os.replace(tmp, self.index_path)
+
+    def _page_range(self, p: int):
+        lo = int(self.offsets[self.page_ts[p]])
+        hi = int(self.offsets[self.page_ts[p + 1]]) if p + 1 < len(self.page_ts) else len(self.mm)
+        return lo, hi
+
+    def _pages_with(self, col: int):
+        """Páginas donde cambia el identificador de la columna `col`."""
+        return np.flatnonzero(self.page_map[:, col >> 3] >> (7 - (col & 7)) & 1)
+
+    # ─── nombres
+    def find(self, pattern: str) -> list:
+        """Señales cuyo nombre completo termina en `pattern` (con comodines)."""
+        if pattern in self.signals:
+            return [pattern]
+        # literal primero: "rf[3]" no es una clase de caracteres
+        out = [n for n in self.signals if n.endswith("." + pattern)] or \
+              [n for n in self.signals
+               if fnmatch.fnmatchcase(n, pattern) or fnmatch.fnmatchcase(n, "*." + pattern)]
+        if not out:
+            raise RuntimeError(f"Señal no encontrada en el VCD: {pattern}")
+        return out
+
+    # ─── consultas
+    def _parse(self, lo: int, hi: int, codes: dict, out: dict) -> None:
+        """Cambios de los identificadores `codes` entre los bytes lo y hi."""
+        alts = b"|".join(re.escape(c.encode()) for c in sorted(codes, key=len, reverse=True))
+        rx = re.compile(rb"^(?:([01xzXZ])|[bB]([01xzXZ]+) |[rR]([^ \n]+) )(" + alts + rb")\r?$", re.M)
+        data = self.mm[lo:hi]
+        for m in rx.finditer(data):
+            code = m.group(4).decode()
+            out[code].append((lo + m.start(), m.group(1) or m.group(2) or m.group(3)))
+
+    def changes(self, names, t0: int = None, t1: int = None) -> dict:
+        """{nombre: (tiempos, valores, xz)} entre t0 y t1 (inclusive).
+
+        El primer elemento es el valor vigente en t0 aunque haya cambiado
+        antes (con tiempo t0).
+        """
+        sigs = [self.signals[n] for pat in ([names] if isinstance(names, str) else names)
+                for n in self.find(pat)]
+        t0 = int(self.times[0]) if t0 is None and len(self.times) else (t0 or 0)
+        t1 = int(self.times[-1]) if t1 is None and len(self.times) else (t1 or 0)
+        first = int(np.searchsorted(self.times, t0, "left"))
+        last = int(np.searchsorted(self.times, t1, "right"))
+        lo = int(self.offsets[first]) if first < len(self.offsets) else len(self.mm)
+        hi = int(self.offsets[last]) if last < len(self.offsets) else len(self.mm)
+        p_lo = max(int(np.searchsorted(self.page_ts, first, "right")) - 1, 0)
+        p_hi = int(np.searchsorted(self.page_ts, max(last - 1, 0), "right")) - 1
+
+        codes = {s.code for s in sigs}
+        found = {c: [] for c in codes}
+        before = {c: [] for c in codes}
+        # valor inicial: hacia atrás desde la página de t0, leyendo cada
+        # página una vez para todas las señales que aún no tienen valor
+        # (en p_lo pueden cambiar sólo después de t0)
+        cols = {c: self.code_index[c] for c in codes}
+        bits = np.unpackbits(self.page_map[:p_lo + 1], axis=1, count=len(self.codes))
+        pending = set(codes)
+        for p in range(p_lo, -1, -1):
+            here = {c for c in pending if bits[p, cols[c]]}
+            if not here:
+                continue
+            a, b = self._page_range(p)
+            self._parse(a, min(b, lo), here, before)
+            pending -= {c for c in here if before[c]}
+            if not pending:
+                break
+        # ventana: sólo páginas donde cambia alguna de las señales pedidas
+        hits = np.zeros(len(self.page_ts), dtype=bool)
+        for c in cols.values():
+            hits[self._pages_with(c)] = True
+        for p in np.flatnonzero(hits[p_lo:p_hi + 1]) + p_lo:
+            a, b = self._page_range(int(p))
+            a, b = max(a, lo), min(b, hi)
+            if a < b:
+                self._parse(a, b, codes, found)
+
+        out = {}
+        for s in sigs:
+            rows = before[s.code][-1:] + found[s.code]
+            pos = np.array([r[0] for r in rows], dtype=np.int64)
+            t = self.times[np.searchsorted(self.offsets, pos, "right") - 1] if len(pos) else \
+                np.zeros(0, dtype=np.int64)
+            if before[s.code]:
+                t[0] = t0
+            out[s.name] = (t,) + decode_values([r[1] for r in rows], s)
+        return out
+
+    def value_at(self, name: str, t: int):
+        """(valor, xz) de una señal en el instante t."""
+        _, values, xz = self.changes(name, t, t)[self.find(name)[0]]
+        return (values[-1], bool(xz[-1])) if len(values) else (None, True)
+
+
+def decode_values(raw, sig):
+    """Valores de texto del VCD -> (valores, xz)."""
+    if sig.kind == "real":
+        return np.array([float(v) for v in raw], dtype=np.float64), np.zeros(len(raw), dtype=bool)
+    text = [v.decode() for v in raw]
+    xz = np.array([any(ch in "xzXZ" for ch in v) for v in text], dtype=bool)
+    ints = [int(v.translate(_XZ_ZERO), 2) for v in text]
+    if sig.width <= 64:
+        return np.array(ints, dtype=np.uint64), xz
+    return np.array(ints, dtype=object), xz
+
+
+_XZ_ZERO = str.maketrans("xzXZ", "0000")
+
+
+if __name__ == "__main__":
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2 or args[0] not in ("index", "list", "query"):
+        print("Uso: python vcd.py index <dump.vcd>")
+        print("     python vcd.py list  <dump.vcd> [patrón]")
+        print("     python vcd.py query <dump.vcd> <señal,señal,...> [--from=T] [--to=T]")
+        sys.exit(1)
+    try:
+        vcd = VCD(args[1], rebuild=args[0] == "index")
+        if args[0] == "index":
+            print(f"{len(vcd.signals)} señales, {len(vcd.times)} marcas de tiempo, "
+                  f"{len(vcd.page_ts)} páginas -> {vcd.index_path}")
+        elif args[0] == "list":
+            names = vcd.find(args[2]) if len(args) > 2 else sorted(vcd.signals)
+            for n in names:
+                s = vcd.signals[n]
+                print(f"{s.width:4d}  {s.code:5}  {n}")
+        else:
+            res = vcd.changes(args[2].split(","),
+                              int(opts["from"]) if "from" in opts else None,
+                              int(opts["to"]) if "to" in opts else None)
+            for name, (t, v, xz) in res.items():
+                width = vcd.signals[name].width
+                print(f"== {name} ({len(t)} cambios) ==")
+                for ti, vi, xi in zip(t.tolist(), v.tolist(), xz.tolist()):
+                    text = "x" * ((width + 3) // 4) if xi else f"{vi:0{(width + 3) // 4}X}"
+                    print(f"{ti:>12}  {text}")
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)